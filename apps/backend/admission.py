@@ -0,0 +1,161 @@
+# backend/admission.py
+"""
+Admission control for the expensive endpoints.
+
+Two kinds of limiter, both used as route dependencies:
+
+  - ConcurrencyLimiter: at most `limit` requests of a route class ("ml",
+    "auth") run at once. One more is refused immediately with 503 and
+    Retry-After instead of queueing behind the others.
+  - RateLimiter: a token bucket per caller (the user id, or the client IP
+    before sign-in) refilling at `rate` requests per second, up to `burst`.
+    An empty bucket gets 429 with Retry-After (time until the next token).
+
+Both run before the endpoint does any work, and before any database
+connection is checked out (the caller comes from the token claims), so a
+spike on one route class cannot take the event loop, the DB pool or the
+executors away from the cheap routes; scripts/check_admission.py checks it.
+A limit or rate of 0 disables that limiter. Like the response cache, limits
+are per process. /health/limits shows the current state.
+"""
+import math
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Tuple
+
+from fastapi import Depends, HTTPException, Request, status
+
+import security
+
+RETRY_AFTER_SECONDS = int(os.getenv("ADMISSION_RETRY_AFTER_SECONDS", "1"))
+
+# Every limiter, for /health/limits
+LIMITERS: List[Any] = []
+
+
+class ConcurrencyLimiter:
+    """Dependency that holds one of `limit` slots for the rest of the request"""
+
+    def __init__(self, name: str, limit: int):
+        self.name = name
+        self.limit = limit
+        self.in_flight = 0
+        self.peak = 0
+        self.admitted = 0
+        self.rejected = 0
+        LIMITERS.append(self)
+
+    # Runs on the event loop only, so the counters need no lock
+    async def __call__(self):
+        if self.limit <= 0:
+            yield
+            return
+        if self.in_flight >= self.limit:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"Too many {self.name} requests in progress, please retry shortly",
+                headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+            )
+
+        self.in_flight += 1
+        self.admitted += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "type": "concurrency",
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "peak": self.peak,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+        }
+
+
+class RateLimiter:
+    """Token bucket per key; the least recently seen keys are dropped past `max_keys`"""
+
+    def __init__(self, name: str, rate: float, burst: int, max_keys: int = 10000):
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        # key -> (tokens left, monotonic time of the last update)
+        self._buckets: "OrderedDict[Hashable, Tuple[float, float]]" = OrderedDict()
+        self.admitted = 0
+        self.limited = 0
+        LIMITERS.append(self)
+
+    def acquire(self, key: Hashable) -> float:
+        """Take a token for `key`: 0 if admitted, else seconds until the next one"""
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.pop(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated_at) * self.rate)
+        if tokens >= 1:
+            tokens -= 1
+            wait = 0.0
+        else:
+            wait = (1 - tokens) / self.rate
+
+        self._buckets[key] = (tokens, now)
+        # A dropped key just starts again with a full bucket
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return wait
+
+    def _check(self, key: Hashable):
+        if self.rate <= 0:
+            return
+        wait = self.acquire(key)
+        if wait:
+            self.limited += 1
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=f"Too many {self.name} requests, please slow down",
+                headers={"Retry-After": str(max(1, math.ceil(wait)))},
+            )
+        self.admitted += 1
+
+    def per_user(self):
+        """Dependency: one bucket per signed-in user"""
+        async def dependency(current_user: security.Principal = Depends(security.get_current_user)):
+            self._check(current_user.id)
+        return dependency
+
+    def per_client(self):
+        """Dependency: one bucket per client address, for routes used before sign-in"""
+        async def dependency(request: Request):
+            self._check(request.client.host if request.client else None)
+        return dependency
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "type": "token_bucket",
+            "rate_per_second": self.rate,
+            "burst": self.burst,
+            "tracked_keys": len(self._buckets),
+            "admitted": self.admitted,
+            "limited": self.limited,
+        }
+
+
+def stats() -> Dict[str, Dict[str, Any]]:
+    return {f"{limiter.name}_{limiter.stats()['type']}": limiter.stats() for limiter in LIMITERS}
+
+
+# --- Route classes ---
+# Model inference / schedule scoring: per user, then a global cap
+ml_rate = RateLimiter("ml", rate=float(os.getenv("ML_RATE_PER_SECOND", "2")), burst=int(os.getenv("ML_RATE_BURST", "10")))
+ml_concurrency = ConcurrencyLimiter("ml", limit=int(os.getenv("ML_MAX_CONCURRENT", "8")))
+ML_ADMISSION = [Depends(ml_rate.per_user()), Depends(ml_concurrency)]
+
+# Password checks (pbkdf2): per client address, then a global cap
+auth_rate = RateLimiter("auth", rate=float(os.getenv("AUTH_RATE_PER_SECOND", "5")), burst=int(os.getenv("AUTH_RATE_BURST", "20")))
+auth_concurrency = ConcurrencyLimiter("auth", limit=int(os.getenv("AUTH_MAX_CONCURRENT", "16")))
+AUTH_ADMISSION = [Depends(auth_rate.per_client()), Depends(auth_concurrency)]
@@ -0,0 +1,37 @@
+"""Add task_predictions table
+
+Revision ID: 3c1f9a7d2b64
+Revises: ee6506d4659a
+Create Date: 2026-10-17 09:12:40.118203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c1f9a7d2b64'
+down_revision: Union[str, Sequence[str], None] = 'ee6506d4659a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('task_predictions',
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('predicted_time', sa.Integer(), nullable=False),
+    sa.Column('model_version', sa.String(), nullable=False),
+    sa.Column('computed_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('task_id')
+    )
+    op.create_index(op.f('ix_task_predictions_model_version'), 'task_predictions', ['model_version'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_task_predictions_model_version'), table_name='task_predictions')
+    op.drop_table('task_predictions')
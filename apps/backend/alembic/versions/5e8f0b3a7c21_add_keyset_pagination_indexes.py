@@ -0,0 +1,49 @@
+"""Add keyset pagination indexes
+
+Revision ID: 5e8f0b3a7c21
+Revises: d41a6e2f9c07
+Create Date: 2026-10-17 14:05:31.774120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e8f0b3a7c21'
+down_revision: Union[str, Sequence[str], None] = 'd41a6e2f9c07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (name, table, columns): one per (filter, sort key, id tiebreaker) listing
+INDEXES = [
+    ('ix_tasks_user_created_at_id', 'tasks', ['user_id', 'created_at', 'id']),
+    ('ix_tasks_subject_created_at_id', 'tasks', ['subject_id', 'created_at', 'id']),
+    ('ix_study_sessions_user_completed_at_id', 'study_sessions', ['user_id', 'completed_at', 'id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keyset comparisons skip NULL keys; the ORM always sets these, but make sure
+    op.execute("UPDATE tasks SET created_at = NOW() AT TIME ZONE 'utc' WHERE created_at IS NULL")
+    op.execute("UPDATE study_sessions SET completed_at = NOW() AT TIME ZONE 'utc' WHERE completed_at IS NULL")
+
+    # autocommit_block() commits the backfill above before building concurrently
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True, if_not_exists=True)
+        # Superseded by ix_study_sessions_user_completed_at_id (same leading columns)
+        op.drop_index('ix_study_sessions_user_completed_at', table_name='study_sessions',
+                      postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index('ix_study_sessions_user_completed_at', 'study_sessions', ['user_id', 'completed_at'],
+                        unique=False, postgresql_concurrently=True, if_not_exists=True)
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
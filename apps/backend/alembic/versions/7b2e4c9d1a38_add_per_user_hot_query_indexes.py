@@ -0,0 +1,52 @@
+"""Add per-user hot query indexes
+
+Revision ID: 7b2e4c9d1a38
+Revises: 3c1f9a7d2b64
+Create Date: 2026-10-17 11:02:15.402981
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b2e4c9d1a38'
+down_revision: Union[str, Sequence[str], None] = '3c1f9a7d2b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (name, table, columns, partial index predicate)
+INDEXES = [
+    ('ix_tasks_user_pending_deadline', 'tasks', ['user_id', 'deadline'], "status = 'pending'"),
+    ('ix_tasks_user_id_status', 'tasks', ['user_id', 'status'], None),
+    ('ix_tasks_subject_id_status', 'tasks', ['subject_id', 'status'], None),
+    ('ix_study_sessions_user_completed_at', 'study_sessions', ['user_id', 'completed_at'], None),
+    ('ix_study_sessions_task_id', 'study_sessions', ['task_id'], None),
+    ('ix_pomodoro_sessions_user_end_time', 'pomodoro_sessions', ['user_id', 'end_time'], None),
+    ('ix_pomodoro_sessions_user_start_time', 'pomodoro_sessions', ['user_id', 'start_time'], None),
+    ('ix_subjects_user_id', 'subjects', ['user_id'], None),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block, and it
+    # keeps the tables writable while the index builds.
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name, table, columns, unique=False,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text(where) if where else None,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
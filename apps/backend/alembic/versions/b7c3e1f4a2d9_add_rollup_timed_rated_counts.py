@@ -0,0 +1,60 @@
+"""Add timed_count / rated_count to the rollup tables
+
+Revision ID: b7c3e1f4a2d9
+Revises: 9a4d2c6e8b13
+Create Date: 2026-10-17 18:42:07.361154
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7c3e1f4a2d9'
+down_revision: Union[str, Sequence[str], None] = '9a4d2c6e8b13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('user_daily_stats', sa.Column('timed_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('user_daily_stats', sa.Column('rated_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('user_daily_subject_stats', sa.Column('timed_count', sa.Integer(), server_default='0', nullable=False))
+    # Count the existing sessions that have a duration / a rating, per rollup
+    # row (same day and subject keys as rollups.backfill_daily_stats)
+    op.execute("""
+        UPDATE user_daily_stats r
+        SET timed_count = s.timed_count, rated_count = s.rated_count
+        FROM (
+            SELECT user_id, CAST(completed_at AS DATE) AS day,
+                   COUNT(actual_duration) AS timed_count,
+                   COUNT(user_difficulty_rating) AS rated_count
+            FROM study_sessions
+            WHERE completed_at IS NOT NULL
+            GROUP BY user_id, CAST(completed_at AS DATE)
+        ) s
+        WHERE r.user_id = s.user_id AND r.day = s.day
+    """)
+    op.execute("""
+        UPDATE user_daily_subject_stats r
+        SET timed_count = s.timed_count
+        FROM (
+            SELECT ss.user_id, CAST(ss.completed_at AS DATE) AS day, t.subject_id,
+                   COUNT(ss.actual_duration) AS timed_count
+            FROM study_sessions ss
+            JOIN tasks t ON t.id = ss.task_id
+            WHERE ss.completed_at IS NOT NULL
+            GROUP BY ss.user_id, CAST(ss.completed_at AS DATE), t.subject_id
+        ) s
+        WHERE r.user_id = s.user_id AND r.day = s.day AND r.subject_id = s.subject_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('user_daily_subject_stats', 'timed_count')
+    op.drop_column('user_daily_stats', 'rated_count')
+    op.drop_column('user_daily_stats', 'timed_count')
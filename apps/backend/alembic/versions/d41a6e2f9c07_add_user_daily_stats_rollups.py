@@ -0,0 +1,91 @@
+"""Add user_daily_stats rollup tables
+
+Revision ID: d41a6e2f9c07
+Revises: 7b2e4c9d1a38
+Create Date: 2026-10-17 12:20:44.190532
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41a6e2f9c07'
+down_revision: Union[str, Sequence[str], None] = '7b2e4c9d1a38'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('user_daily_stats',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('study_minutes', sa.Integer(), nullable=False),
+    sa.Column('session_count', sa.Integer(), nullable=False),
+    sa.Column('difficulty_sum', sa.Integer(), nullable=False),
+    sa.Column('pomodoro_minutes', sa.Integer(), nullable=False),
+    sa.Column('pomodoro_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'day')
+    )
+    op.create_table('user_daily_subject_stats',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('subject_id', sa.Integer(), nullable=False),
+    sa.Column('study_minutes', sa.Integer(), nullable=False),
+    sa.Column('session_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['subject_id'], ['subjects.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'day', 'subject_id')
+    )
+    # Existing history; from here on the write endpoints keep the rollups current.
+    # Frozen copy of rollups.backfill_daily_stats at this schema (the tables
+    # are new, so nothing to delete first): study sessions by completed_at,
+    # pomodoros by start_time.
+    op.execute("""
+        INSERT INTO user_daily_stats
+            (user_id, day, study_minutes, session_count, difficulty_sum, pomodoro_minutes, pomodoro_count)
+        SELECT
+            COALESCE(s.user_id, p.user_id),
+            COALESCE(s.day, p.day),
+            COALESCE(s.study_minutes, 0),
+            COALESCE(s.session_count, 0),
+            COALESCE(s.difficulty_sum, 0),
+            COALESCE(p.pomodoro_minutes, 0),
+            COALESCE(p.pomodoro_count, 0)
+        FROM (
+            SELECT user_id, CAST(completed_at AS DATE) AS day,
+                   COALESCE(SUM(actual_duration), 0) AS study_minutes,
+                   COUNT(*) AS session_count,
+                   COALESCE(SUM(user_difficulty_rating), 0) AS difficulty_sum
+            FROM study_sessions
+            WHERE completed_at IS NOT NULL
+            GROUP BY user_id, CAST(completed_at AS DATE)
+        ) s
+        FULL OUTER JOIN (
+            SELECT user_id, CAST(start_time AS DATE) AS day,
+                   COALESCE(SUM(duration), 0) AS pomodoro_minutes,
+                   COUNT(*) AS pomodoro_count
+            FROM pomodoro_sessions
+            WHERE start_time IS NOT NULL
+            GROUP BY user_id, CAST(start_time AS DATE)
+        ) p ON p.user_id = s.user_id AND p.day = s.day
+    """)
+    op.execute("""
+        INSERT INTO user_daily_subject_stats (user_id, day, subject_id, study_minutes, session_count)
+        SELECT ss.user_id, CAST(ss.completed_at AS DATE), t.subject_id,
+               COALESCE(SUM(ss.actual_duration), 0), COUNT(*)
+        FROM study_sessions ss
+        JOIN tasks t ON t.id = ss.task_id
+        WHERE ss.completed_at IS NOT NULL
+        GROUP BY ss.user_id, CAST(ss.completed_at AS DATE), t.subject_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('user_daily_subject_stats')
+    op.drop_table('user_daily_stats')
@@ -1,35 +1,62 @@
 # backend/app.py (Final Version with ML Integration)
 from fastapi import FastAPI
+from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
+import asyncio
 import os
 
 # Load environment variables from .env file at the very start
 load_dotenv()
 
 import models
-from database import engine
+import password_hasher
+import query_counter
+from database import engine, async_engine, create_asyncpg_pool, close_asyncpg_pool, get_asyncpg_pool
 
 # Import all routers from the 'routers' directory
-from routes import subjects, tasks, sessions, auth,analytics, pomodoro, history,notifications
+from routes import subjects, tasks, sessions, auth,analytics, pomodoro, history,notifications, health
 import routes.ml_endpoint as ml_endpoints
+from ml.executor import shutdown_ml_executor
 
 # This line ensures all database tables are created based on your models
 models.Base.metadata.create_all(bind=engine)
 
+# Lifespan hook: the API starts serving immediately while the ML stack is
+# imported and the model loaded by a background task. ML endpoints use their
+# fallback paths until ml_endpoints.ml_state is "ready".
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One asyncpg pool for every raw-SQL component, injected into the ML stack
+    app.state.asyncpg_pool = await create_asyncpg_pool()
+    print("Server is starting up, warming up ML components in the background...")
+    app.state.ml_warm_up = asyncio.create_task(ml_endpoints.warm_up_ml_components(app.state.asyncpg_pool))
+    app.state.hasher_warm_up = asyncio.create_task(password_hasher.warm_up())
+    # Optionally follow the model registry's CURRENT pointer (hot reload on publish)
+    poll_seconds = float(os.getenv("ML_REGISTRY_POLL_SECONDS", "0"))
+    app.state.registry_watch = (
+        asyncio.create_task(ml_endpoints.watch_model_registry(poll_seconds)) if poll_seconds > 0 else None
+    )
+
+    yield
+
+    for task in (app.state.ml_warm_up, app.state.hasher_warm_up, app.state.registry_watch):
+        if task is not None:
+            task.cancel()
+    ml_endpoints.cancel_background_tasks()
+    await ml_endpoints.prediction_batcher.stop()
+    shutdown_ml_executor()
+    password_hasher.shutdown_hasher_executor()
+    await close_asyncpg_pool()
+    await async_engine.dispose()
+
 app = FastAPI(
     title="Smart Study Scheduler API",
     description="An AI-powered API to manage study schedules and get smart recommendations.",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
-# This is a startup event handler. It runs this code once when the server
-# starts, loading the ML models into memory for fast predictions.
-@app.on_event("startup")
-async def startup_event():
-    print("Server is starting up, initializing ML components...")
-    ml_endpoints.initialize_ml_components()
-
 # CORS Middleware allows your frontend (localhost:3000) to talk to this backend
 origins = ["http://localhost:3000"]
 
@@ -39,8 +66,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Keyset pagination cursor (see pagination.py), readable by the frontend
+    expose_headers=["X-Next-Cursor"],
 )
 
+# Per-request SQL statement count in X-Query-Count (N+1 checks), off by default
+if query_counter.QUERY_COUNT_ENABLED:
+    query_counter.install(app)
+
 # Include all the API routers to make their endpoints available
 app.include_router(auth.router)
 app.include_router(subjects.router)
@@ -51,6 +84,7 @@ app.include_router(analytics.router)
 app.include_router(pomodoro.router)
 app.include_router(history.router) 
 app.include_router(notifications.router)
+app.include_router(health.router)
 
 @app.get("/", tags=["Root"])
 async def read_root():
@@ -59,11 +93,8 @@ async def read_root():
 @app.get("/test/db")
 async def test_database():
     try:
-        import asyncpg
-        DATABASE_URL = os.getenv("DATABASE_URL")
-        conn = await asyncpg.connect(DATABASE_URL)
-        result = await conn.fetchval("SELECT 1")
-        await conn.close()
+        async with get_asyncpg_pool().acquire() as conn:
+            result = await conn.fetchval("SELECT 1")
         return {"status": "Database connection successful", "result": result}
     except Exception as e:
         return {"status": "Database connection failed", "error": str(e)}
@@ -1,17 +1,38 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from dotenv import load_dotenv
+from collections import deque
+from typing import Any, Dict, Optional
+import asyncpg
 import os
+import threading
+import time
 # SQLAlchemy → A Python library to work with databases using Python objects instead of raw SQL.
 # Load environment variables from .env file
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
+# Connection pool settings, shared by the sync and async engines.
+# pool_size → connections kept open; max_overflow → extra ones under bursts.
+# pool_timeout → seconds a request waits for a free connection before failing.
+# pool_recycle → reconnect connections older than this (idle server timeouts).
+# pool_pre_ping → test a connection before handing it out (drops dead ones).
+POOL_OPTIONS = {
+    "pool_size": int(os.getenv("DB_POOL_SIZE", "10")),
+    "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "20")),
+    "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+    "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+    "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes"),
+}
+
 # Create the SQLAlchemy engine
 # Create the database engine
-engine = create_engine(DATABASE_URL)
+engine = create_engine(DATABASE_URL, **POOL_OPTIONS)
 
 # Each instance of the SessionLocal class will be a database session.
 # A session is like a “workspace” for talking to the database.
@@ -20,6 +41,76 @@ engine = create_engine(DATABASE_URL)
 # autoflush=False → It won’t push changes to the DB until you explicitly commit.
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# --- Async engine (asyncpg driver) ---
+# The routers use AsyncSession so a request waiting on Postgres does not hold
+# one of Starlette's threadpool slots. DATABASE_URL stays a plain
+# postgresql:// URL; only the driver is swapped here.
+def _async_database_url(url: str):
+    async_url = make_url(url).set(drivername="postgresql+asyncpg")
+    query = dict(async_url.query)
+    # libpq options asyncpg does not understand
+    if "sslmode" in query:
+        query["ssl"] = query.pop("sslmode")
+    query.pop("channel_binding", None)
+    return async_url.set(query=query)
+
+# --- Pool wait metrics ---
+# How long checkouts from the async engine's pool wait for a connection.
+class PoolWaitStats:
+    def __init__(self, window: int = 1000):
+        self._lock = threading.Lock()
+        self._waits_ms = deque(maxlen=window)
+        self.checkouts = 0
+        self.timeouts = 0
+
+    def record(self, seconds: float):
+        with self._lock:
+            self.checkouts += 1
+            self._waits_ms.append(seconds * 1000)
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            waits = sorted(self._waits_ms)
+            checkouts, timeouts = self.checkouts, self.timeouts
+
+        def percentile(p):
+            return round(waits[min(len(waits) - 1, int(p * len(waits)))], 3) if waits else 0.0
+
+        return {
+            "checkouts": checkouts,
+            "timeouts": timeouts,
+            "wait_ms": {
+                "p50": percentile(0.50),
+                "p99": percentile(0.99),
+                "max": round(waits[-1], 3) if waits else 0.0,
+            },
+        }
+
+pool_wait_stats = PoolWaitStats()
+
+class TimedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """The async engine's pool, recording how long every checkout waits"""
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            pool_wait_stats.record_timeout()
+            raise
+        pool_wait_stats.record(time.perf_counter() - started)
+        return connection
+
+async_engine = create_async_engine(_async_database_url(DATABASE_URL), poolclass=TimedAsyncAdaptedQueuePool, **POOL_OPTIONS)
+
+# expire_on_commit=False → objects stay readable after commit (no implicit
+# lazy reload, which AsyncSession cannot do).
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+
 # This Base class will be inherited by our ORM models (our database tables)
 # This is the base class for all your database models (tables).
 Base = declarative_base()
@@ -30,8 +121,72 @@ def get_db():
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    # Lazy: the session checks a connection out on its first statement, so
+    # requests answered without a query (cache hits) never wait on the pool
+    async with AsyncSessionLocal() as db:
+        yield db
         
+# --- Shared asyncpg pool ---
+# The ML components run raw SQL through asyncpg. They all borrow from this one
+# pool, created and closed by the FastAPI lifespan in app.py.
+asyncpg_pool: Optional[asyncpg.Pool] = None
+
+async def create_asyncpg_pool() -> asyncpg.Pool:
+    global asyncpg_pool
+    if asyncpg_pool is None:
+        asyncpg_pool = await asyncpg.create_pool(
+            DATABASE_URL,
+            min_size=int(os.getenv("ASYNCPG_POOL_MIN_SIZE", "1")),
+            max_size=int(os.getenv("ASYNCPG_POOL_MAX_SIZE", "10")),
+            # Set to 0 behind PgBouncer in transaction mode
+            statement_cache_size=int(os.getenv("ASYNCPG_STATEMENT_CACHE_SIZE", "100")),
+            command_timeout=float(os.getenv("ASYNCPG_COMMAND_TIMEOUT", "30")),
+        )
+    return asyncpg_pool
+
+async def close_asyncpg_pool():
+    global asyncpg_pool
+    if asyncpg_pool is not None:
+        await asyncpg_pool.close()
+        asyncpg_pool = None
+
+def get_asyncpg_pool() -> asyncpg.Pool:
+    if asyncpg_pool is None:
+        raise RuntimeError("asyncpg pool has not been created (is the app lifespan running?)")
+    return asyncpg_pool
+
+def pool_status() -> Dict[str, Any]:
+    """Checked-out / idle / overflow counts for every pool, plus wait times"""
+    async_pool = async_engine.sync_engine.pool
+    return {
+        "settings": POOL_OPTIONS,
+        "sqlalchemy_async": {
+            "size": async_pool.size(),
+            "checked_out": async_pool.checkedout(),
+            "idle": async_pool.checkedin(),
+            "overflow": max(0, async_pool.overflow()),
+            **pool_wait_stats.snapshot(),
+        },
+        "sqlalchemy_sync": {
+            "size": engine.pool.size(),
+            "checked_out": engine.pool.checkedout(),
+            "idle": engine.pool.checkedin(),
+            "overflow": max(0, engine.pool.overflow()),
+        },
+        "asyncpg": {
+            "size": asyncpg_pool.get_size(),
+            "idle": asyncpg_pool.get_idle_size(),
+            "checked_out": asyncpg_pool.get_size() - asyncpg_pool.get_idle_size(),
+            "min_size": asyncpg_pool.get_min_size(),
+            "max_size": asyncpg_pool.get_max_size(),
+        } if asyncpg_pool is not None else None,
+    }
+
 # engine → Connects to the database.
 # SessionLocal → Creates sessions for talking to the DB.
 # Base → Base class for defining tables.
-# get_db() → Makes sure every request gets its own safe DB session.
\ No newline at end of file
+# get_db() → Makes sure every request gets its own safe DB session.
+# get_async_db() → Same, as an AsyncSession for the async routers.
+# asyncpg_pool → Shared raw-SQL connection pool for the ML components.
\ No newline at end of file
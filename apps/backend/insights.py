@@ -0,0 +1,162 @@
+# backend/insights.py
+"""
+Insights engine behind /analytics/recommendations.
+
+One parameterized query scans the user's study sessions once and returns
+partial aggregates grouped by (subject, time-of-day period). Every insight
+rule is a plain function over those groups, so adding a rule never adds a
+query: decorate it with @insight_rule and return a message (or None).
+"""
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Constant query text with bound parameters: asyncpg prepares it once per
+# connection and reuses the plan for every user.
+SESSION_GROUPS_SQL = text("""
+    SELECT
+        s.name AS subject_name,
+        CASE
+            WHEN EXTRACT(hour FROM ss.completed_at) BETWEEN 7 AND 12 THEN 'Morning'
+            WHEN EXTRACT(hour FROM ss.completed_at) BETWEEN 13 AND 17 THEN 'Afternoon'
+            ELSE 'Evening'
+        END AS period,
+        COUNT(*) AS sessions,
+        SUM(t.estimated_time::float / ss.actual_duration) FILTER (WHERE ss.actual_duration > 0) AS efficiency_sum,
+        COUNT(t.estimated_time) FILTER (WHERE ss.actual_duration > 0) AS efficiency_count,
+        SUM(ss.actual_duration::float - t.estimated_time::float) AS difference_sum,
+        COUNT(ss.actual_duration - t.estimated_time) AS difference_count,
+        MAX(ss.completed_at) AS last_studied
+    FROM study_sessions ss
+    JOIN tasks t ON ss.task_id = t.id
+    JOIN subjects s ON t.subject_id = s.id
+    WHERE ss.user_id = :user_id
+    GROUP BY s.name, period
+""")
+
+
+@dataclass
+class SessionGroup:
+    """Partial aggregates for one (subject, period) bucket of a user's sessions"""
+    subject_name: str
+    period: str
+    sessions: int
+    efficiency_sum: Optional[float]   # Σ estimated / actual over sessions with actual > 0
+    efficiency_count: int
+    difference_sum: Optional[float]   # Σ (actual - estimated) minutes
+    difference_count: int
+    last_studied: Optional[datetime]
+
+
+class SessionStats:
+    """The scanned groups plus the roll-ups rules commonly need"""
+
+    def __init__(self, groups: List[SessionGroup], now: Optional[datetime] = None):
+        self.groups = groups
+        self.now = now or datetime.utcnow()
+
+    def by_period(self) -> Dict[str, List[SessionGroup]]:
+        periods = defaultdict(list)
+        for group in self.groups:
+            periods[group.period].append(group)
+        return periods
+
+    def by_subject(self) -> Dict[str, List[SessionGroup]]:
+        subjects = defaultdict(list)
+        for group in self.groups:
+            subjects[group.subject_name].append(group)
+        return subjects
+
+
+InsightRule = Callable[[SessionStats], Optional[str]]
+INSIGHT_RULES: List[InsightRule] = []
+
+def insight_rule(rule: InsightRule) -> InsightRule:
+    """Register a rule; rules run in registration order"""
+    INSIGHT_RULES.append(rule)
+    return rule
+
+
+def _mean(groups: List[SessionGroup], total: str, count: str) -> Optional[float]:
+    n = sum(getattr(group, count) for group in groups)
+    return sum(getattr(group, total) or 0 for group in groups) / n if n else None
+
+
+# --- Rules ---
+
+@insight_rule
+def time_of_day_efficiency(stats: SessionStats) -> Optional[str]:
+    """Period where estimated/actual time is highest, if clearly above 1"""
+    efficiency = {
+        period: _mean(groups, "efficiency_sum", "efficiency_count")
+        for period, groups in stats.by_period().items()
+    }
+    efficiency = {period: value for period, value in efficiency.items() if value is not None}
+    if not efficiency:
+        return None
+    period = max(efficiency, key=efficiency.get)
+    if efficiency[period] > 1.1:
+        return f"You're most efficient in the {period.lower()}. Try scheduling your hardest tasks then!"
+    return None
+
+
+@insight_rule
+def estimation_accuracy(stats: SessionStats) -> Optional[str]:
+    """Subject whose average (actual - estimated) is furthest from zero"""
+    differences = {
+        subject: _mean(groups, "difference_sum", "difference_count")
+        for subject, groups in stats.by_subject().items()
+    }
+    differences = {subject: value for subject, value in differences.items() if value is not None}
+    if not differences:
+        return None
+    subject = max(differences, key=lambda name: abs(differences[name]))
+    if differences[subject] > 15:
+        return f"You tend to underestimate your time for '{subject}'. Try adding a 15-minute buffer."
+    if differences[subject] < -15:
+        return f"You are faster than you think at '{subject}'! You might be overestimating."
+    return None
+
+
+@insight_rule
+def spaced_repetition(stats: SessionStats) -> Optional[str]:
+    """Least recently studied subject, once it has gone 5+ days without review"""
+    last_studied = {
+        subject: max(group.last_studied for group in groups if group.last_studied is not None)
+        for subject, groups in stats.by_subject().items()
+        if any(group.last_studied is not None for group in groups)
+    }
+    stale = {subject: when for subject, when in last_studied.items() if stats.now - when > timedelta(days=5)}
+    if not stale:
+        return None
+    subject = min(stale, key=stale.get)
+    return f"You haven't reviewed '{subject}' in a while. Consider studying it soon."
+
+
+# --- Engine ---
+
+async def load_session_stats(db: AsyncSession, user_id: int) -> SessionStats:
+    rows = (await db.execute(SESSION_GROUPS_SQL, {"user_id": user_id})).mappings().all()
+    return SessionStats([SessionGroup(**row) for row in rows])
+
+
+def evaluate_rules(stats: SessionStats, rules: Optional[List[InsightRule]] = None) -> List[str]:
+    """Run every rule; a failing rule is logged and skipped, not fatal"""
+    messages = []
+    for rule in INSIGHT_RULES if rules is None else rules:
+        try:
+            message = rule(stats)
+        except Exception as e:
+            print(f"Could not generate {rule.__name__} insight: {e}")
+            continue
+        if message:
+            messages.append(message)
+    return messages
+
+
+async def generate_recommendations(db: AsyncSession, user_id: int) -> List[str]:
+    return evaluate_rules(await load_session_stats(db, user_id))
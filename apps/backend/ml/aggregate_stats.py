@@ -0,0 +1,133 @@
+# ml/aggregate_stats.py
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import asyncpg
+
+from caching import LRUCache
+
+from .connections import acquire_connection
+
+# Defaults used when a subject or user has no completed study sessions yet.
+# These match the values the prediction features have always fallen back to.
+DEFAULT_SUBJECT_AVG_DIFFICULTY = 3.0
+DEFAULT_SUBJECT_AVG_TIME_RATIO = 1.0
+DEFAULT_USER_AVG_TIME_RATIO = 1.0
+
+
+class AggregateStatsService:
+    """
+    Serves the per-subject and per-user aggregates used as prediction
+    features (subject_avg_difficulty, subject_avg_time_ratio and
+    user_avg_time_ratio).
+
+    Results are kept in a bounded LRU/TTL cache. On a miss only the
+    requested subject_ids / user_ids are aggregated in SQL, so the cost of a
+    lookup does not depend on the total size of study_sessions.
+    """
+
+    SUBJECT_STATS_QUERY = """
+        SELECT
+            t.subject_id,
+            AVG(ss.user_difficulty_rating)::float AS subject_avg_difficulty,
+            AVG(ss.actual_duration::float / NULLIF(t.estimated_time, 0)) AS subject_avg_time_ratio
+        FROM study_sessions ss
+        JOIN tasks t ON ss.task_id = t.id
+        WHERE t.subject_id = ANY($1::int[])
+        GROUP BY t.subject_id
+    """
+
+    USER_STATS_QUERY = """
+        SELECT
+            ss.user_id,
+            AVG(ss.actual_duration::float / NULLIF(t.estimated_time, 0)) AS user_avg_time_ratio
+        FROM study_sessions ss
+        JOIN tasks t ON ss.task_id = t.id
+        WHERE ss.user_id = ANY($1::int[])
+        GROUP BY ss.user_id
+    """
+
+    def __init__(self, database_url: str, maxsize: Optional[int] = None, ttl: Optional[float] = None,
+                 pool: Optional[asyncpg.Pool] = None):
+        self.database_url = database_url
+        self.pool = pool
+        maxsize = maxsize or int(os.getenv("ML_STATS_CACHE_SIZE", "4096"))
+        ttl = ttl or float(os.getenv("ML_STATS_CACHE_TTL_SECONDS", "300"))
+        self.subject_cache = LRUCache(maxsize=maxsize, ttl=ttl)
+        self.user_cache = LRUCache(maxsize=maxsize, ttl=ttl)
+
+    async def get_stats(
+        self, subject_ids: Iterable[int], user_ids: Iterable[int]
+    ) -> Tuple[Dict[int, Dict[str, float]], Dict[int, Dict[str, float]]]:
+        """Return ({subject_id: stats}, {user_id: stats}) for the given ids."""
+        subject_ids = {int(s) for s in subject_ids if s is not None}
+        user_ids = {int(u) for u in user_ids if u is not None}
+
+        subject_stats, missing_subjects = self._from_cache(self.subject_cache, subject_ids)
+        user_stats, missing_users = self._from_cache(self.user_cache, user_ids)
+
+        if missing_subjects or missing_users:
+            async with acquire_connection(self.pool, self.database_url) as conn:
+                if missing_subjects:
+                    rows = await conn.fetch(self.SUBJECT_STATS_QUERY, missing_subjects)
+                    fetched = {
+                        row['subject_id']: {
+                            'subject_avg_difficulty': row['subject_avg_difficulty'],
+                            'subject_avg_time_ratio': row['subject_avg_time_ratio'],
+                        }
+                        for row in rows
+                    }
+                    subject_stats.update(self._store(self.subject_cache, missing_subjects, fetched, {
+                        'subject_avg_difficulty': DEFAULT_SUBJECT_AVG_DIFFICULTY,
+                        'subject_avg_time_ratio': DEFAULT_SUBJECT_AVG_TIME_RATIO,
+                    }))
+
+                if missing_users:
+                    rows = await conn.fetch(self.USER_STATS_QUERY, missing_users)
+                    fetched = {
+                        row['user_id']: {'user_avg_time_ratio': row['user_avg_time_ratio']}
+                        for row in rows
+                    }
+                    user_stats.update(self._store(self.user_cache, missing_users, fetched, {
+                        'user_avg_time_ratio': DEFAULT_USER_AVG_TIME_RATIO,
+                    }))
+
+        return subject_stats, user_stats
+
+    def invalidate(self, subject_ids: Iterable[int] = (), user_ids: Iterable[int] = ()):
+        """Drop cached aggregates, e.g. after new study sessions are logged."""
+        for subject_id in subject_ids:
+            self.subject_cache.invalidate(int(subject_id))
+        for user_id in user_ids:
+            self.user_cache.invalidate(int(user_id))
+
+    def cache_stats(self) -> Dict[str, Dict]:
+        return {
+            "subjects": self.subject_cache.stats(),
+            "users": self.user_cache.stats(),
+        }
+
+    @staticmethod
+    def _from_cache(cache: LRUCache, ids: set) -> Tuple[Dict[int, Dict], List[int]]:
+        found, missing = {}, []
+        for key in ids:
+            value = cache.get(key)
+            if value is None:
+                missing.append(key)
+            else:
+                found[key] = value
+        return found, missing
+
+    @staticmethod
+    def _store(cache: LRUCache, requested: List[int], fetched: Dict[int, Dict], defaults: Dict) -> Dict[int, Dict]:
+        # Ids without any sessions are cached with defaults too, so unknown
+        # subjects don't trigger a query on every prediction.
+        result = {}
+        for key in requested:
+            stats = dict(defaults)
+            for name, value in fetched.get(key, {}).items():
+                if value is not None:
+                    stats[name] = float(value)
+            cache.set(key, stats)
+            result[key] = stats
+        return result
@@ -0,0 +1,24 @@
+# ml/connections.py
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+import asyncpg
+
+
+@asynccontextmanager
+async def acquire_connection(pool: Optional[asyncpg.Pool], database_url: str) -> AsyncIterator[asyncpg.Connection]:
+    """
+    Borrow a connection from the shared application pool. Components used
+    outside the API (training scripts, CLIs) have no pool and fall back to a
+    one-off connection.
+    """
+    if pool is not None:
+        async with pool.acquire() as conn:
+            yield conn
+        return
+
+    conn = await asyncpg.connect(database_url)
+    try:
+        yield conn
+    finally:
+        await conn.close()
@@ -0,0 +1,32 @@
+# ml/executor.py
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+# CPU-bound ML work (pandas feature assembly, model forward passes, priority
+# scoring) runs here instead of on the event loop. NumPy and most pandas
+# kernels release the GIL, so a thread pool shares one copy of the model
+# across workers while keeping the loop free for other requests.
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_ml_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        workers = int(os.getenv("ML_EXECUTOR_WORKERS", str(min(4, os.cpu_count() or 1))))
+        _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ml-worker")
+    return _executor
+
+
+async def run_in_ml_executor(fn, *args):
+    """Await fn(*args) on the dedicated ML executor"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_ml_executor(), fn, *args)
+
+
+def shutdown_ml_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
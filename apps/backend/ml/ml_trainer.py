@@ -2,7 +2,7 @@
 import asyncio
 import os
 import sys
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -12,6 +12,7 @@ sys.path.append(str(Path(__file__).parent.parent))
 from scripts.data_generator import SyntheticDataGenerator
 from ml.feature_engineering import FeatureEngineer
 from ml.time_prediction import TimePredictionModel
+from ml.model_registry import ModelRegistry
 from ml.priority_scorer import PriorityScorer
 
 class MLTrainer:
@@ -65,6 +66,10 @@ class MLTrainer:
             self.time_predictor.save_model()
             self.feature_engineer.save_encoders()
             
+            # Publish as a new registry version; running servers pick it up on reload
+            version = ModelRegistry(self.time_predictor.models_dir).publish()
+            print(f"   Model version: {version}")
+            
             print(f"✅ Time prediction model trained successfully!")
             print(f"   Validation MAE: {results['val_metrics']['mae']:.2f} minutes")
             print(f"   Validation R²: {results['val_metrics']['r2']:.3f}")
@@ -154,13 +159,14 @@ class MLTrainer:
                 return
             
             # Prepare tasks for prediction
+            sample_tasks = pending_tasks.records(range(min(num_tasks, len(pending_tasks))))
             tasks_for_prediction = []
-            for task in pending_tasks[:num_tasks]:
+            for task in sample_tasks:
                 tasks_for_prediction.append({
-                    'task_id': task['id'],
+                    'task_id': task['task_id'],
                     'estimated_time': task['estimated_time'],
                     'subject_id': task['subject_id'],
-                    'due_date': task['due_date'],
+                    'due_date': datetime.now() + timedelta(days=task['days_until_due']),
                     'user_id': user_id
                 })
             
@@ -179,12 +185,12 @@ class MLTrainer:
             total_estimated = 0
             total_predicted = 0
             
-            for i, (task, predicted_time) in enumerate(zip(pending_tasks[:num_tasks], predictions)):
+            for i, (task, predicted_time) in enumerate(zip(sample_tasks, predictions)):
                 estimated = task['estimated_time']
                 predicted = max(5, int(predicted_time))  # Minimum 5 minutes
                 difference = predicted - estimated
                 
-                print(f"{i+1}. {task['name'][:40]}...")
+                print(f"{i+1}. {task['task_name'][:40]}...")
                 print(f"   Subject: {task['subject_name']}")
                 print(f"   Estimated: {estimated} min | Predicted: {predicted} min")
                 print(f"   Difference: {difference:+d} min "
@@ -0,0 +1,184 @@
+# ml/model_registry.py
+import hashlib
+import os
+import pickle
+import shutil
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from .numpy_predictor import NUMPY_ARTIFACT_NAME, NumpyTimePredictor
+
+# Files that make up one model version. Only the first two are needed to
+# serve; the rest are kept so a version can be retrained or inspected.
+SERVING_ARTIFACTS = [NUMPY_ARTIFACT_NAME, "label_encoders.pkl"]
+REGISTRY_ARTIFACTS = SERVING_ARTIFACTS + [
+    "time_predictor_metadata.json",
+    "time_predictor.keras",
+    "time_predictor_scaler.pkl",
+    "scaler.pkl",
+]
+
+CURRENT_POINTER = "CURRENT"
+
+
+class LoadedModel:
+    """Everything a request needs from one model version, swapped as a unit"""
+
+    def __init__(self, version: str, predictor: NumpyTimePredictor, label_encoders: Dict,
+                 artifact_dir: str, artifact_sizes: Dict[str, int], load_seconds: float):
+        self.version = version
+        self.predictor = predictor
+        self.label_encoders = label_encoders
+        self.artifact_dir = artifact_dir
+        self.artifact_sizes = artifact_sizes
+        self.load_seconds = load_seconds
+        self.loaded_at = datetime.utcnow()
+
+    def describe(self) -> Dict:
+        return {
+            "version": self.version,
+            "artifact_dir": self.artifact_dir,
+            "loaded_at": self.loaded_at.isoformat(),
+            "load_time_ms": round(self.load_seconds * 1000, 2),
+            "artifact_sizes": self.artifact_sizes,
+        }
+
+
+class ModelRegistry:
+    """
+    Versioned model artifacts under ml/models/versions/<content hash>/ with an
+    atomically replaced CURRENT pointer file naming the active version.
+
+    Layout:
+        ml/models/CURRENT                 -> "3f2a9c1b7d4e"
+        ml/models/versions/3f2a9c1b7d4e/  -> time_predictor.npz, label_encoders.pkl, ...
+
+    Trees without a CURRENT pointer (the old loose-file layout) are still
+    served straight from ml/models/.
+    """
+
+    def __init__(self, root: str = "ml/models"):
+        self.root = root
+        self.versions_dir = os.path.join(root, "versions")
+        self.pointer_path = os.path.join(root, CURRENT_POINTER)
+
+    def publish(self, source_dir: Optional[str] = None, activate: bool = True) -> str:
+        """Copy the artifacts in source_dir into a content-hashed version directory"""
+        source_dir = source_dir or self.root
+        names = [name for name in REGISTRY_ARTIFACTS if os.path.exists(os.path.join(source_dir, name))]
+        missing = [name for name in SERVING_ARTIFACTS if name not in names]
+        if missing:
+            raise FileNotFoundError(f"Cannot publish model, missing artifacts: {missing}")
+
+        version = self._content_hash(source_dir, names)
+        target = self.version_dir(version)
+
+        if not os.path.isdir(target):
+            os.makedirs(self.versions_dir, exist_ok=True)
+            staging = os.path.join(self.versions_dir, f".staging-{version}-{os.getpid()}")
+            shutil.rmtree(staging, ignore_errors=True)
+            os.makedirs(staging)
+            for name in names:
+                shutil.copy2(os.path.join(source_dir, name), os.path.join(staging, name))
+            # Directory rename is atomic, so readers never see a half-copied version
+            os.rename(staging, target)
+
+        print(f"Published model version {version}")
+        if activate:
+            self.activate(version)
+        return version
+
+    def activate(self, version: str):
+        """Point CURRENT at an existing version (atomic file replace)"""
+        if not os.path.isdir(self.version_dir(version)):
+            raise FileNotFoundError(f"Unknown model version: {version}")
+
+        tmp_path = f"{self.pointer_path}.tmp-{os.getpid()}"
+        with open(tmp_path, 'w') as f:
+            f.write(version)
+        os.replace(tmp_path, self.pointer_path)
+        print(f"Activated model version {version}")
+
+    def current_version(self) -> Optional[str]:
+        try:
+            with open(self.pointer_path) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def version_dir(self, version: str) -> str:
+        return os.path.join(self.versions_dir, version)
+
+    def list_versions(self) -> List[str]:
+        if not os.path.isdir(self.versions_dir):
+            return []
+        return sorted(name for name in os.listdir(self.versions_dir) if not name.startswith("."))
+
+    def load(self, version: Optional[str] = None) -> Optional[LoadedModel]:
+        """
+        Load a version (default: CURRENT, else the loose files in the root).
+        Blocking file I/O - run it on an executor from async code.
+        """
+        started = time.perf_counter()
+        version = version or self.current_version()
+        if version and version not in self.list_versions():
+            print(f"Unknown model version: {version}")
+            return None
+        artifact_dir = self.version_dir(version) if version else self.root
+
+        predictor = NumpyTimePredictor(artifact_dir)
+        if not predictor.load_model():
+            return None
+
+        try:
+            with open(os.path.join(artifact_dir, "label_encoders.pkl"), 'rb') as f:
+                label_encoders = pickle.load(f)
+        except FileNotFoundError:
+            print(f"No label encoders in {artifact_dir}; subject ids will not be encoded.")
+            label_encoders = {}
+
+        # Loose files have no registry version, fall back to the artifact hash
+        version = version or predictor.version
+        predictor.version = version
+
+        artifact_sizes = {
+            name: os.path.getsize(os.path.join(artifact_dir, name))
+            for name in REGISTRY_ARTIFACTS
+            if os.path.exists(os.path.join(artifact_dir, name))
+        }
+
+        return LoadedModel(
+            version=version,
+            predictor=predictor,
+            label_encoders=label_encoders,
+            artifact_dir=artifact_dir,
+            artifact_sizes=artifact_sizes,
+            load_seconds=time.perf_counter() - started,
+        )
+
+    @staticmethod
+    def _content_hash(source_dir: str, names: List[str]) -> str:
+        digest = hashlib.sha256()
+        for name in sorted(names):
+            digest.update(name.encode())
+            with open(os.path.join(source_dir, name), 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(chunk)
+        return digest.hexdigest()[:12]
+
+
+if __name__ == "__main__":
+    # python -m ml.model_registry [list | publish | activate <version>]
+    import sys
+
+    registry = ModelRegistry()
+    command = sys.argv[1] if len(sys.argv) > 1 else "list"
+    if command == "publish":
+        registry.publish()
+    elif command == "activate" and len(sys.argv) > 2:
+        registry.activate(sys.argv[2])
+    else:
+        current = registry.current_version()
+        for version in registry.list_versions():
+            print(f"{'*' if version == current else ' '} {version}")
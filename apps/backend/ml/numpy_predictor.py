@@ -0,0 +1,89 @@
+# ml/numpy_predictor.py
+import hashlib
+import os
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+NUMPY_ARTIFACT_NAME = "time_predictor.npz"
+
+ACTIVATIONS = {
+    'relu': lambda x: np.maximum(x, 0, out=x),
+    'linear': lambda x: x,
+}
+
+
+class NumpyTimePredictor:
+    """
+    Serve-time replacement for TimePredictionModel.
+
+    Runs the exported Dense stack (weights, biases, activations) and the
+    StandardScaler parameters with plain NumPy, so API workers never need to
+    import TensorFlow. The artifact is written by TimePredictionModel.save_model.
+    """
+
+    def __init__(self, models_dir: str = "ml/models"):
+        self.models_dir = models_dir
+        self.layers: List[tuple] = []
+        self.scaler_mean: Optional[np.ndarray] = None
+        self.scaler_scale: Optional[np.ndarray] = None
+        self.feature_names: Optional[List[str]] = None
+        self.version: Optional[str] = None
+        self.is_trained = False
+
+    @property
+    def artifact_path(self) -> str:
+        return os.path.join(self.models_dir, NUMPY_ARTIFACT_NAME)
+
+    def load_model(self, path: Optional[str] = None) -> bool:
+        """Load the exported .npz artifact"""
+        path = path or self.artifact_path
+        try:
+            with np.load(path, allow_pickle=False) as artifact:
+                activations = [str(name) for name in artifact['activations']]
+                self.layers = [
+                    (
+                        artifact[f'kernel_{i}'].astype(np.float32),
+                        artifact[f'bias_{i}'].astype(np.float32),
+                        ACTIVATIONS[name],
+                    )
+                    for i, name in enumerate(activations)
+                ]
+                self.scaler_mean = artifact['scaler_mean'].astype(np.float64)
+                self.scaler_scale = artifact['scaler_scale'].astype(np.float64)
+                self.feature_names = [str(name) for name in artifact['feature_names']] or None
+
+            # Content hash of the artifact identifies the model version
+            with open(path, 'rb') as f:
+                self.version = hashlib.sha256(f.read()).hexdigest()[:12]
+
+            self.is_trained = True
+            print(f"NumPy time prediction model {self.version} loaded successfully")
+            return True
+
+        except Exception as e:
+            print(f"Failed to load NumPy model from {path}: {e}")
+            self.is_trained = False
+            return False
+
+    def predict(self, X: pd.DataFrame) -> np.ndarray:
+        """Make time predictions"""
+        if not self.is_trained:
+            raise ValueError("Model must be loaded before making predictions")
+
+        # Ensure correct feature order
+        if self.feature_names:
+            X = X[self.feature_names]
+
+        # Scale features (same arithmetic as StandardScaler.transform)
+        outputs = ((np.asarray(X, dtype=np.float64) - self.scaler_mean) / self.scaler_scale).astype(np.float32)
+
+        # Forward pass; Dropout layers are a no-op at inference time
+        for kernel, bias, activation in self.layers:
+            outputs = activation(outputs @ kernel + bias)
+
+        # Ensure predictions are positive
+        predictions = np.maximum(outputs, 5)  # Minimum 5 minutes
+
+        return predictions.flatten()
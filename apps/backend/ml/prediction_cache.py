@@ -0,0 +1,45 @@
+# ml/prediction_cache.py
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from caching import LRUCache
+
+# Features are rounded before keying so tiny float differences in the
+# aggregate statistics don't defeat the cache.
+QUANTIZE_DECIMALS = 3
+
+
+class PredictionCache:
+    """
+    Memoizes model outputs per feature row. Keys are the quantized row from
+    FeatureEngineer.prepare_prediction_features plus the model version, so a
+    new model never serves predictions made by the old one.
+    """
+
+    def __init__(self, maxsize: Optional[int] = None, ttl: Optional[float] = None):
+        maxsize = maxsize or int(os.getenv("ML_PREDICTION_CACHE_SIZE", "50000"))
+        ttl = ttl or float(os.getenv("ML_PREDICTION_CACHE_TTL_SECONDS", "900"))
+        self.cache = LRUCache(maxsize=maxsize, ttl=ttl)
+
+    def make_keys(self, features: pd.DataFrame, model_version: str) -> List[Tuple]:
+        rows = np.round(features.to_numpy(dtype=np.float64), QUANTIZE_DECIMALS).tolist()
+        return [(model_version, *row) for row in rows]
+
+    def lookup(self, keys: List[Tuple]) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (predictions with NaN for misses, boolean mask of misses)"""
+        predictions = np.array([self.cache.get(key, np.nan) for key in keys], dtype=np.float64)
+        return predictions, np.isnan(predictions)
+
+    def store(self, keys: List[Tuple], predictions: np.ndarray):
+        for key, value in zip(keys, predictions):
+            self.cache.set(key, float(value))
+
+    def clear(self):
+        """Drop everything, e.g. when a different model is loaded"""
+        self.cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return self.cache.stats()
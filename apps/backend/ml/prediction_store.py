@@ -0,0 +1,70 @@
+# ml/prediction_store.py
+from typing import Dict, Iterable, List, Optional
+
+import asyncpg
+
+from .connections import acquire_connection
+
+
+class PredictionStore:
+    """
+    Reads and writes the task_predictions table. Predictions are computed in
+    batches off the request path (task create/edit, model version change);
+    endpoints only ever read the stored values.
+    """
+
+    TASKS_QUERY = """
+        SELECT
+            t.id AS task_id,
+            t.estimated_time,
+            t.subject_id,
+            t.deadline AS due_date,
+            t.user_id
+        FROM tasks t
+        WHERE t.id = ANY($1::int[])
+        AND t.status <> 'complete'
+    """
+
+    STALE_TASKS_QUERY = """
+        SELECT t.id
+        FROM tasks t
+        LEFT JOIN task_predictions p ON p.task_id = t.id
+        WHERE t.status <> 'complete'
+        AND (p.task_id IS NULL OR p.model_version <> $1)
+        ORDER BY t.id
+        LIMIT $2
+    """
+
+    UPSERT_QUERY = """
+        INSERT INTO task_predictions (task_id, predicted_time, model_version, computed_at)
+        VALUES ($1, $2, $3, NOW() AT TIME ZONE 'utc')
+        ON CONFLICT (task_id) DO UPDATE SET
+            predicted_time = EXCLUDED.predicted_time,
+            model_version = EXCLUDED.model_version,
+            computed_at = EXCLUDED.computed_at
+    """
+
+    def __init__(self, database_url: str, pool: Optional[asyncpg.Pool] = None):
+        self.database_url = database_url
+        self.pool = pool
+
+    async def fetch_tasks(self, task_ids: Iterable[int]) -> List[Dict]:
+        """Rows in the shape FeatureEngineer.prepare_prediction_features expects"""
+        async with acquire_connection(self.pool, self.database_url) as conn:
+            rows = await conn.fetch(self.TASKS_QUERY, list(task_ids))
+        return [dict(row) for row in rows]
+
+    async def stale_task_ids(self, model_version: str, limit: int = 500) -> List[int]:
+        """Open tasks with no prediction, or one made by a different model version"""
+        async with acquire_connection(self.pool, self.database_url) as conn:
+            rows = await conn.fetch(self.STALE_TASKS_QUERY, model_version, limit)
+        return [row['id'] for row in rows]
+
+    async def save(self, predictions: Dict[int, int], model_version: str):
+        if not predictions:
+            return
+        async with acquire_connection(self.pool, self.database_url) as conn:
+            await conn.executemany(
+                self.UPSERT_QUERY,
+                [(task_id, int(minutes), model_version) for task_id, minutes in predictions.items()]
+            )
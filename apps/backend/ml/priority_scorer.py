@@ -1,186 +1,265 @@
 # priority_scorer.py
+import asyncio
 import asyncpg
-from datetime import datetime, timedelta
+from dataclasses import dataclass
 from typing import List, Dict, Optional
 import numpy as np
 
+# Task type importance; anything else counts as general
+TASK_TYPE_WEIGHTS = {
+    'exam': 1.0,
+    'assignment': 0.9,
+    'project': 0.85,
+    'practice': 0.6,
+    'reading': 0.5,
+    'review': 0.4,
+    'general': 0.3
+}
+DEFAULT_TASK_TYPE_WEIGHT = 0.3
+
+# Banded factors: SCORES[i] applies up to and including EDGES[i], the last
+# score beyond the last edge (np.searchsorted picks the band)
+URGENCY_DAY_EDGES = np.array([1, 3, 7, 14])
+URGENCY_SCORES = np.array([1.0, 0.9, 0.7, 0.5, 0.3])
+# Quick tasks are good for momentum, very long ones might need to be broken down
+TIME_MINUTE_EDGES = np.array([30, 60, 120])
+TIME_SCORES = np.array([0.8, 0.6, 0.4, 0.3])
+# Subjects the user struggles with (high average difficulty) come first:
+# below 3, from 3, from 4 (side='right')
+DIFFICULTY_EDGES = np.array([3.0, 4.0])
+DIFFICULTY_SCORES = np.array([0.5, 0.7, 0.9])
+NEW_SUBJECT_PERFORMANCE_SCORE = 0.7
+
+
+@dataclass
+class PendingTasks:
+    """A user's pending tasks as parallel arrays (one entry per task, deadline order)"""
+    task_id: np.ndarray          # int64
+    subject_id: np.ndarray       # int64
+    estimated_time: np.ndarray   # int64 minutes, 60 when unset
+    days_until_due: np.ndarray   # int64, >= 0, 30 when there is no deadline
+    task_type: np.ndarray        # str
+    predicted_time: np.ndarray   # int64 minutes, 0 when there is no stored prediction
+    # Only read for the tasks that make the schedule
+    task_name: List[str]
+    subject_name: List[str]
+
+    @classmethod
+    def empty(cls) -> "PendingTasks":
+        no_ints = np.array([], dtype=np.int64)
+        return cls(no_ints, no_ints, no_ints, no_ints, np.array([], dtype=str), no_ints, [], [])
+
+    def __len__(self) -> int:
+        return len(self.task_id)
+
+    def records(self, indices) -> List[Dict]:
+        """The tasks at `indices` as plain dicts"""
+        return [
+            {
+                'task_id': int(self.task_id[i]),
+                'task_name': self.task_name[i],
+                'subject_name': self.subject_name[i],
+                'subject_id': int(self.subject_id[i]),
+                'estimated_time': int(self.estimated_time[i]),
+                'days_until_due': int(self.days_until_due[i]),
+                'task_type': str(self.task_type[i]),
+                'predicted_time': int(self.predicted_time[i]) or None,
+            }
+            for i in indices
+        ]
+
+
+@dataclass
+class SubjectStats:
+    """Per-subject history as parallel arrays, sorted by subject_id"""
+    subject_id: np.ndarray           # int64
+    avg_actual_duration: np.ndarray  # float64 minutes, 60 without sessions
+    avg_difficulty: np.ndarray       # float64 rating, 3 without sessions
+    study_days: np.ndarray           # int64
+
+    @classmethod
+    def empty(cls) -> "SubjectStats":
+        return cls(np.array([], dtype=np.int64), np.array([]), np.array([]), np.array([], dtype=np.int64))
+
+    def __len__(self) -> int:
+        return len(self.subject_id)
+
+    def gather(self, values: np.ndarray, subject_ids: np.ndarray, default: float) -> np.ndarray:
+        """values[subject] for each of `subject_ids`, `default` for subjects without stats"""
+        if len(self) == 0:
+            return np.full(len(subject_ids), default, dtype=np.float64)
+        index = np.minimum(np.searchsorted(self.subject_id, subject_ids), len(self) - 1)
+        return np.where(self.subject_id[index] == subject_ids, values[index], default)
+
+    def performance_scores(self) -> np.ndarray:
+        score = DIFFICULTY_SCORES[np.searchsorted(DIFFICULTY_EDGES, self.avg_difficulty, side='right')]
+        # Boost if subject hasn't been studied recently
+        score = np.where(self.study_days < 3, np.minimum(1.0, score + 0.2), score)
+        return np.where(self.study_days == 0, 1.0, score)
+
+
 class PriorityScorer:
-    def __init__(self, database_url: str):
+    def __init__(self, database_url: str, pool: Optional[asyncpg.Pool] = None):
         self.database_url = database_url
-        self.pool = None
+        # The API injects its shared pool; standalone use creates a private one
+        self.pool = pool
+        self._owns_pool = False
+        self._init_lock = asyncio.Lock()
 
     async def init(self):
-        if self.pool is None:
-            self.pool = await asyncpg.create_pool(self.database_url)
+        if self.pool is not None:
+            return
+        # Concurrent first callers must not each create a pool
+        async with self._init_lock:
+            if self.pool is None:
+                self.pool = await asyncpg.create_pool(self.database_url)
+                self._owns_pool = True
+
+    async def close(self):
+        if self._owns_pool and self.pool is not None:
+            await self.pool.close()
+            self.pool = None
+            self._owns_pool = False
         
-    async def get_pending_tasks(self, user_id: int):
-        """Get pending tasks for user matching the actual database schema."""
+    async def get_pending_tasks(self, user_id: int) -> "PendingTasks":
+        """
+        Get all of the user's pending tasks as columns, in deadline order.
+        array_agg hands each column back as one list, so loading thousands of
+        tasks does no per-row Python work.
+        """
         try:
             query = """
-                SELECT 
-                    t.id AS task_id,
-                    t.title AS task_name,
-                    s.name AS subject_name,
-                    t.estimated_time,
-                    t.deadline,
-                    t.status,
-                    t.task_type,
-                    s.id AS subject_id,
-                    s.color_tag
-                FROM tasks t
-                JOIN subjects s ON t.subject_id = s.id
-                WHERE t.user_id = $1 
-                AND t.status = 'pending'
-                AND (t.deadline IS NULL OR t.deadline >= CURRENT_DATE)
-                ORDER BY t.deadline ASC NULLS LAST
-                LIMIT 50
+                WITH pending AS (
+                    SELECT
+                        t.id AS task_id,
+                        t.title AS task_name,
+                        s.name AS subject_name,
+                        s.id AS subject_id,
+                        COALESCE(NULLIF(t.estimated_time, 0), 60) AS estimated_time,
+                        GREATEST(COALESCE(t.deadline::date - CURRENT_DATE, 30), 0) AS days_until_due,
+                        COALESCE(NULLIF(t.task_type, ''), 'general') AS task_type,
+                        COALESCE(p.predicted_time, 0) AS predicted_time,
+                        row_number() OVER (ORDER BY t.deadline ASC NULLS LAST, t.id) AS position
+                    FROM tasks t
+                    JOIN subjects s ON t.subject_id = s.id
+                    LEFT JOIN task_predictions p ON p.task_id = t.id
+                    WHERE t.user_id = $1
+                    AND t.status = 'pending'
+                    AND (t.deadline IS NULL OR t.deadline >= CURRENT_DATE)
+                )
+                SELECT
+                    array_agg(task_id ORDER BY position) AS task_id,
+                    array_agg(task_name ORDER BY position) AS task_name,
+                    array_agg(subject_name ORDER BY position) AS subject_name,
+                    array_agg(subject_id ORDER BY position) AS subject_id,
+                    array_agg(estimated_time ORDER BY position) AS estimated_time,
+                    array_agg(days_until_due ORDER BY position) AS days_until_due,
+                    array_agg(task_type ORDER BY position) AS task_type,
+                    array_agg(predicted_time ORDER BY position) AS predicted_time
+                FROM pending
             """
-            
+
             await self.init()
             async with self.pool.acquire() as conn:
 
-                rows = await conn.fetch(query, user_id)
-                
-                tasks = []
-                for row in rows:
-                    # Calculate days until due
-                    if row['deadline']:
-                        # Convert deadline to date if it's datetime
-                        deadline_date = row['deadline'].date() if hasattr(row['deadline'], 'date') else row['deadline']
-                        days_until_due = (deadline_date - datetime.now().date()).days
-                    else:
-                        days_until_due = 30  # Default if no deadline
-                    
-                    tasks.append({
-                        'task_id': row['task_id'],
-                        'task_name': row['task_name'],
-                        'subject_name': row['subject_name'],
-                        'subject_id': row['subject_id'],
-                        'estimated_time': row['estimated_time'] or 60,  # Default to 60 minutes
-                        'days_until_due': max(0, days_until_due),
-                        'task_type': row['task_type'] or 'general',
-                        'status': row['status']
-                    })
-                
-                return tasks
-                
+                row = await conn.fetchrow(query, user_id)
+
+                # No pending tasks: every aggregate is NULL
+                if row['task_id'] is None:
+                    return PendingTasks.empty()
+
+                return PendingTasks(
+                    task_id=np.array(row['task_id'], dtype=np.int64),
+                    subject_id=np.array(row['subject_id'], dtype=np.int64),
+                    estimated_time=np.array(row['estimated_time'], dtype=np.int64),
+                    days_until_due=np.array(row['days_until_due'], dtype=np.int64),
+                    task_type=np.array(row['task_type'], dtype=str),
+                    predicted_time=np.array(row['predicted_time'], dtype=np.int64),
+                    task_name=row['task_name'],
+                    subject_name=row['subject_name'],
+                )
+
         except Exception as e:
             print(f"Error in get_pending_tasks: {e}")
             import traceback
             traceback.print_exc()
-            return []
-    
-    async def get_user_stats(self, user_id: int):
-        """Get user performance statistics by subject."""
+            return PendingTasks.empty()
+
+    async def get_user_stats(self, user_id: int) -> "SubjectStats":
+        """Get user performance statistics by subject, as columns sorted by subject id."""
         try:
             query = """
-                SELECT 
-                    s.id AS subject_id,
-                    s.name AS subject_name,
-                    COUNT(DISTINCT ss.task_id) AS completed_tasks,
-                    AVG(ss.actual_duration) AS avg_actual_duration,
-                    AVG(ss.user_difficulty_rating) AS avg_difficulty,
-                    COUNT(DISTINCT DATE(ss.completed_at)) AS study_days
-                FROM subjects s
-                LEFT JOIN tasks t ON s.id = t.subject_id
-                LEFT JOIN study_sessions ss ON t.id = ss.task_id
-                WHERE s.user_id = $1
-                GROUP BY s.id, s.name
+                WITH subject_stats AS (
+                    SELECT
+                        s.id AS subject_id,
+                        AVG(ss.actual_duration) AS avg_actual_duration,
+                        AVG(ss.user_difficulty_rating) AS avg_difficulty,
+                        COUNT(DISTINCT DATE(ss.completed_at)) AS study_days
+                    FROM subjects s
+                    LEFT JOIN tasks t ON s.id = t.subject_id
+                    LEFT JOIN study_sessions ss ON t.id = ss.task_id
+                    WHERE s.user_id = $1
+                    GROUP BY s.id
+                )
+                SELECT
+                    array_agg(subject_id ORDER BY subject_id) AS subject_id,
+                    array_agg(COALESCE(NULLIF(avg_actual_duration, 0), 60)::float8 ORDER BY subject_id) AS avg_actual_duration,
+                    array_agg(COALESCE(NULLIF(avg_difficulty, 0), 3)::float8 ORDER BY subject_id) AS avg_difficulty,
+                    array_agg(study_days ORDER BY subject_id) AS study_days
+                FROM subject_stats
             """
-            
+
             await self.init()
             async with self.pool.acquire() as conn:
 
-                rows = await conn.fetch(query, user_id)
-                
-                stats = {}
-                for row in rows:
-                    stats[row['subject_id']] = {
-                        'subject_name': row['subject_name'],
-                        'completed_tasks': row['completed_tasks'] or 0,
-                        'avg_actual_duration': float(row['avg_actual_duration'] or 60),
-                        'avg_difficulty': float(row['avg_difficulty'] or 3),
-                        'study_days': row['study_days'] or 0
-                    }
-                
-                return stats
-                
+                row = await conn.fetchrow(query, user_id)
+
+                if row['subject_id'] is None:
+                    return SubjectStats.empty()
+
+                return SubjectStats(
+                    subject_id=np.array(row['subject_id'], dtype=np.int64),
+                    avg_actual_duration=np.array(row['avg_actual_duration'], dtype=np.float64),
+                    avg_difficulty=np.array(row['avg_difficulty'], dtype=np.float64),
+                    study_days=np.array(row['study_days'], dtype=np.int64),
+                )
+
         except Exception as e:
             print(f"Error in get_user_stats: {e}")
-            return {}
-    
-    def calculate_priority_score(self, task: Dict, user_stats: Dict) -> float:
-        """Calculate priority score for a task."""
-        score = 0.0
-        
+            return SubjectStats.empty()
+
+    def calculate_priority_scores(self, tasks: "PendingTasks", user_stats: "SubjectStats") -> np.ndarray:
+        """Priority score of every task at once, in [0, 1]."""
         # 1. Urgency factor (40% weight)
-        days_until_due = task.get('days_until_due', 30)
-        if days_until_due <= 1:
-            urgency_score = 1.0
-        elif days_until_due <= 3:
-            urgency_score = 0.9
-        elif days_until_due <= 7:
-            urgency_score = 0.7
-        elif days_until_due <= 14:
-            urgency_score = 0.5
-        else:
-            urgency_score = 0.3
-        score += urgency_score * 0.4
-        
-        # 2. Task type importance (20% weight)
-        task_type_weights = {
-            'exam': 1.0,
-            'assignment': 0.9,
-            'project': 0.85,
-            'practice': 0.6,
-            'reading': 0.5,
-            'review': 0.4,
-            'general': 0.3
-        }
-        task_type = task.get('task_type', 'general')
-        type_score = task_type_weights.get(task_type, 0.3)
-        score += type_score * 0.2
-        
-        # 3. Subject performance factor (20% weight)
-        subject_id = task.get('subject_id')
-        if subject_id and subject_id in user_stats:
-            stats = user_stats[subject_id]
-            # If user struggles with this subject (high difficulty), prioritize it
-            avg_difficulty = stats.get('avg_difficulty', 3)
-            if avg_difficulty >= 4:
-                performance_score = 0.9
-            elif avg_difficulty >= 3:
-                performance_score = 0.7
-            else:
-                performance_score = 0.5
-            
-            # Boost if subject hasn't been studied recently
-            study_days = stats.get('study_days', 0)
-            if study_days == 0:
-                performance_score = 1.0
-            elif study_days < 3:
-                performance_score = min(1.0, performance_score + 0.2)
-        else:
-            performance_score = 0.7  # New subject, moderate priority
-        score += performance_score * 0.2
-        
+        urgency_score = URGENCY_SCORES[np.searchsorted(URGENCY_DAY_EDGES, tasks.days_until_due)]
+
+        # 2. Task type importance (20% weight): look up each distinct type once
+        task_types, type_index = np.unique(tasks.task_type, return_inverse=True)
+        type_score = np.array(
+            [TASK_TYPE_WEIGHTS.get(task_type, DEFAULT_TASK_TYPE_WEIGHT) for task_type in task_types],
+            dtype=np.float64,
+        )[type_index]
+
+        # 3. Subject performance factor (20% weight): per subject, then gathered per task
+        performance_score = user_stats.gather(
+            user_stats.performance_scores(), tasks.subject_id, NEW_SUBJECT_PERFORMANCE_SCORE
+        )
+
         # 4. Estimated time factor (10% weight)
-        estimated_time = task.get('estimated_time', 60)
-        if estimated_time <= 30:
-            time_score = 0.8  # Quick tasks are good for momentum
-        elif estimated_time <= 60:
-            time_score = 0.6
-        elif estimated_time <= 120:
-            time_score = 0.4
-        else:
-            time_score = 0.3  # Very long tasks might need to be broken down
-        score += time_score * 0.1
-        
+        time_score = TIME_SCORES[np.searchsorted(TIME_MINUTE_EDGES, tasks.estimated_time)]
+
         # 5. Random small factor to break ties (10% weight)
-        score += np.random.uniform(0, 0.3) * 0.1
-        
-        return min(1.0, score)  # Cap at 1.0
-    
+        tie_break = np.random.uniform(0, 0.3, size=len(tasks))
+
+        score = (
+            urgency_score * 0.4
+            + type_score * 0.2
+            + performance_score * 0.2
+            + time_score * 0.1
+            + tie_break * 0.1
+        )
+        return np.minimum(1.0, score)  # Cap at 1.0
+
     def generate_recommendation_reason(self, task: Dict, score: float) -> str:
         """Generate a human-readable reason for task recommendation."""
         reasons = []
@@ -221,8 +300,46 @@ class PriorityScorer:
         
         return " • ".join(reasons)
     
-    async def generate_daily_schedule(self, user_id: int, max_tasks: int = 5):
-        """Generate optimized daily schedule."""
+    def score_tasks(self, pending_tasks: "PendingTasks", user_stats: "SubjectStats", max_tasks: int) -> List[Dict]:
+        """Score pending tasks and return the top ones. Pure CPU work, no I/O."""
+        k = min(max_tasks, len(pending_tasks))
+        if k <= 0:
+            return []
+
+        scores = np.round(self.calculate_priority_scores(pending_tasks, user_stats), 3)
+
+        # Top k without sorting the rest, then highest first; equal scores
+        # keep their deadline order
+        top = np.argpartition(-scores, k - 1)[:k] if k < len(pending_tasks) else np.arange(k)
+        top = top[np.lexsort((top, -scores[top]))]
+
+        # Use the persisted model prediction when there is one, otherwise
+        # adjust based on user's historical performance: 70% estimated, 30% historical
+        estimated_time = pending_tasks.estimated_time[top]
+        subject_id = pending_tasks.subject_id[top]
+        avg_actual = user_stats.gather(user_stats.avg_actual_duration, subject_id, np.nan)
+        historical = np.where(np.isnan(avg_actual), estimated_time, np.trunc(0.7 * estimated_time + 0.3 * avg_actual))
+        stored = pending_tasks.predicted_time[top]
+        predicted_time = np.where(stored > 0, stored, historical).astype(np.int64)
+
+        schedule = []
+        for task, score, predicted in zip(pending_tasks.records(top), scores[top].tolist(), predicted_time.tolist()):
+            schedule.append({
+                'task_id': task['task_id'],
+                'task_name': task['task_name'],
+                'subject_name': task['subject_name'],
+                'estimated_time': task['estimated_time'],
+                'predicted_time': predicted,
+                'priority_score': score,
+                'recommendation_reason': self.generate_recommendation_reason(task, score)
+            })
+        return schedule
+    
+    async def generate_daily_schedule(self, user_id: int, max_tasks: int = 5, executor=None):
+        """
+        Generate optimized daily schedule. Pass an executor to run the scoring
+        step off the event loop.
+        """
         print(f"Generating schedule for user {user_id}")
         
         try:
@@ -238,36 +355,13 @@ class PriorityScorer:
             print(f"Found stats for {len(user_stats)} subjects")
             
             # Calculate priority scores
-            scored_tasks = []
-            for task in pending_tasks:
-                score = self.calculate_priority_score(task, user_stats)
-                reason = self.generate_recommendation_reason(task, score)
-                
-                # Calculate predicted time (for now, use estimated time with small adjustment)
-                estimated_time = task.get('estimated_time', 60)
-                subject_id = task.get('subject_id')
-                
-                # Adjust based on user's historical performance
-                if subject_id and subject_id in user_stats:
-                    avg_actual = user_stats[subject_id].get('avg_actual_duration', estimated_time)
-                    # Weighted average: 70% estimated, 30% historical
-                    predicted_time = int(0.7 * estimated_time + 0.3 * avg_actual)
-                else:
-                    predicted_time = estimated_time
-                
-                scored_tasks.append({
-                    'task_id': task['task_id'],
-                    'task_name': task['task_name'],
-                    'subject_name': task['subject_name'],
-                    'estimated_time': estimated_time,
-                    'predicted_time': predicted_time,
-                    'priority_score': round(score, 3),
-                    'recommendation_reason': reason
-                })
-            
-            # Sort by priority score and select top tasks
-            scored_tasks.sort(key=lambda x: x['priority_score'], reverse=True)
-            schedule = scored_tasks[:max_tasks]
+            if executor is None:
+                schedule = self.score_tasks(pending_tasks, user_stats, max_tasks)
+            else:
+                loop = asyncio.get_running_loop()
+                schedule = await loop.run_in_executor(
+                    executor, self.score_tasks, pending_tasks, user_stats, max_tasks
+                )
             
             # Log generated schedule
             print(f"Generated schedule with {len(schedule)} tasks")
@@ -11,6 +11,9 @@ import os
 import json
 from typing import List, Dict, Any
 import asyncio
+import sys
+
+from .numpy_predictor import NUMPY_ARTIFACT_NAME
 
 class TimePredictionModel:
     def __init__(self, models_dir: str = "ml/models"):
@@ -157,8 +160,41 @@ class TimePredictionModel:
         with open(f"{self.models_dir}/time_predictor_metadata.json", 'w') as f:
             json.dump(metadata, f, indent=2)
         
+        # Save a TensorFlow-free copy for serving
+        self.export_numpy_weights()
+        
         print(f"Model saved to {self.models_dir}/")
     
+    def export_numpy_weights(self) -> str:
+        """
+        Write the Dense weights/biases and the scaler parameters to a single
+        .npz file that ml.numpy_predictor.NumpyTimePredictor can serve.
+        """
+        if self.model is None:
+            raise ValueError("Cannot export a model that has not been built or loaded")
+        
+        artifact = {}
+        activations = []
+        for layer in self.model.layers:
+            # Dropout (and any other weightless layer) is skipped at inference
+            if not isinstance(layer, keras.layers.Dense):
+                continue
+            kernel, bias = layer.get_weights()
+            index = len(activations)
+            artifact[f'kernel_{index}'] = kernel.astype(np.float32)
+            artifact[f'bias_{index}'] = bias.astype(np.float32)
+            activations.append(keras.activations.serialize(layer.activation))
+        
+        artifact['activations'] = np.array(activations, dtype=str)
+        artifact['scaler_mean'] = np.asarray(self.scaler.mean_, dtype=np.float64)
+        artifact['scaler_scale'] = np.asarray(self.scaler.scale_, dtype=np.float64)
+        artifact['feature_names'] = np.array(self.feature_names or [], dtype=str)
+        
+        path = os.path.join(self.models_dir, NUMPY_ARTIFACT_NAME)
+        np.savez(path, **artifact)
+        print(f"NumPy inference weights exported to {path}")
+        return path
+    
     def load_model(self):
         """Load a previously trained model"""
         try:
@@ -213,6 +249,7 @@ class TimePredictionModel:
 async def train_time_predictor():
     """Train the time prediction model"""
     from .feature_engineering import FeatureEngineer
+    from .model_registry import ModelRegistry
     import os
     from dotenv import load_dotenv
     
@@ -237,6 +274,9 @@ async def train_time_predictor():
         time_predictor.save_model()
         feature_engineer.save_encoders()
         
+        # Publish as a new registry version; running servers pick it up on reload
+        ModelRegistry(time_predictor.models_dir).publish()
+        
         print("Training completed successfully!")
         
         # Show feature importance
@@ -251,5 +291,16 @@ async def train_time_predictor():
         print(f"Training failed: {e}")
         raise
 
+def export_numpy_artifact(models_dir: str = "ml/models") -> str:
+    """Export an already trained Keras model for TensorFlow-free serving"""
+    time_predictor = TimePredictionModel(models_dir)
+    if not time_predictor.load_model():
+        raise ValueError(f"No trained model found in {models_dir}")
+    return time_predictor.export_numpy_weights()
+
 if __name__ == "__main__":
-    asyncio.run(train_time_predictor())
\ No newline at end of file
+    # python -m ml.time_prediction --export-numpy
+    if "--export-numpy" in sys.argv:
+        export_numpy_artifact()
+    else:
+        asyncio.run(train_time_predictor())
\ No newline at end of file
@@ -1,7 +1,7 @@
 # apps/backend/models.py
 
 from sqlalchemy import (
-    Column, Integer, String, DateTime, Text, ForeignKey, Float, Boolean
+    Column, Integer, String, Date, DateTime, Text, ForeignKey, Float, Boolean, Index, text
 )
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -34,6 +34,11 @@ class Subject(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     date = Column(DateTime, nullable=False,server_default=func.now())
     color_tag = Column(String, default="#3B82F6")
+
+    # Per-user hot query indexes (created concurrently by Alembic revision 7b2e4c9d1a38)
+    __table_args__ = (
+        Index("ix_subjects_user_id", "user_id"),
+    )
     
     # THE FIX: Changed 'owner' to 'user' for consistency and added back_populates
     user = relationship("User", back_populates="subjects")
@@ -51,12 +56,43 @@ class Task(Base):
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     task_type = Column(String, default="general")
+
+    __table_args__ = (
+        # Pending tasks by deadline: scheduler, notifications, pending counts
+        Index("ix_tasks_user_pending_deadline", "user_id", "deadline",
+              postgresql_where=text("status = 'pending'")),
+        Index("ix_tasks_user_id_status", "user_id", "status"),
+        Index("ix_tasks_subject_id_status", "subject_id", "status"),
+        # Keyset pagination (see pagination.py)
+        Index("ix_tasks_user_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_tasks_subject_created_at_id", "subject_id", "created_at", "id"),
+    )
     
     # THE FIX: Added back_populates to all relationships
-    subject = relationship("Subject", back_populates="tasks")
+    # subject and prediction are serialized with every schema.Task; raise_on_sql
+    # turns a query that forgot to eager-load them into an error instead of one
+    # lazy SELECT per row (objects already in the session still resolve).
+    subject = relationship("Subject", back_populates="tasks", lazy="raise_on_sql")
     user = relationship("User", back_populates="tasks")
     study_sessions = relationship("StudySession", back_populates="task")
     pomodoro_sessions = relationship("PomodoroSession", back_populates="task")
+    prediction = relationship("TaskPrediction", back_populates="task", uselist=False, lazy="raise_on_sql")
+
+    @property
+    def predicted_time(self):
+        # Read from the persisted prediction; queries must eager-load Task.prediction
+        return self.prediction.predicted_time if self.prediction else None
+
+class TaskPrediction(Base):
+    __tablename__ = "task_predictions"
+
+    # One row per task, written by the ML prediction store (never on the request path)
+    task_id = Column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True)
+    predicted_time = Column(Integer, nullable=False)
+    model_version = Column(String, nullable=False, index=True)
+    computed_at = Column(DateTime, default=datetime.utcnow)
+
+    task = relationship("Task", back_populates="prediction")
 
 class StudySession(Base):
     __tablename__ = "study_sessions"
@@ -67,9 +103,16 @@ class StudySession(Base):
     actual_duration = Column(Integer)
     user_difficulty_rating = Column(Integer)
     completed_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        # Date ranges and keyset pagination of the session history
+        Index("ix_study_sessions_user_completed_at_id", "user_id", "completed_at", "id"),
+        Index("ix_study_sessions_task_id", "task_id"),
+    )
     
     # THE FIX: Changed 'owner' to 'user' and added back_populates
-    task = relationship("Task", back_populates="study_sessions")
+    # Serialized with every schema.StudySession, see Task.subject
+    task = relationship("Task", back_populates="study_sessions", lazy="raise_on_sql")
     user = relationship("User", back_populates="study_sessions")
 
 class PomodoroSession(Base):
@@ -82,10 +125,43 @@ class PomodoroSession(Base):
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     task_id = Column(Integer, ForeignKey("tasks.id"), nullable=True)
 
+    __table_args__ = (
+        Index("ix_pomodoro_sessions_user_end_time", "user_id", "end_time"),
+        Index("ix_pomodoro_sessions_user_start_time", "user_id", "start_time"),
+    )
+
     # THE FIX: Changed 'owner' to 'user' and added back_populates
     user = relationship("User", back_populates="pomodoro_sessions")
     task = relationship("Task", back_populates="pomodoro_sessions")
-    
+
+class UserDailyStats(Base):
+    __tablename__ = "user_daily_stats"
+
+    # Rollup of study_sessions (by completed_at day) and pomodoro_sessions
+    # (by start_time day), kept current by the write endpoints (see rollups.py)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    study_minutes = Column(Integer, nullable=False, default=0)
+    session_count = Column(Integer, nullable=False, default=0)
+    difficulty_sum = Column(Integer, nullable=False, default=0)
+    # Sessions with an actual_duration / a user_difficulty_rating: the
+    # denominators of the averages, which skip NULLs like AVG() does
+    timed_count = Column(Integer, nullable=False, default=0, server_default="0")
+    rated_count = Column(Integer, nullable=False, default=0, server_default="0")
+    pomodoro_minutes = Column(Integer, nullable=False, default=0)
+    pomodoro_count = Column(Integer, nullable=False, default=0)
+
+class UserDailySubjectStats(Base):
+    __tablename__ = "user_daily_subject_stats"
+
+    # Per-subject split of user_daily_stats.study_minutes / session_count / timed_count
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    subject_id = Column(Integer, ForeignKey("subjects.id", ondelete="CASCADE"), primary_key=True)
+    study_minutes = Column(Integer, nullable=False, default=0)
+    session_count = Column(Integer, nullable=False, default=0)
+    timed_count = Column(Integer, nullable=False, default=0, server_default="0")
+
 class UserPreferences(Base):
     __tablename__ = "user_preferences"
     
@@ -98,3 +174,15 @@ class UserPreferences(Base):
     
     # THE FIX: Changed 'owner' to 'user' for consistency
     user = relationship("User", back_populates="preferences")
+
+class RefreshToken(Base):
+    __tablename__ = "refresh_tokens"
+
+    # Opaque, long-lived refresh tokens (see security.py). Only a SHA-256 of
+    # the token is stored; using one revokes it and issues a new one.
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    token_hash = Column(String(64), unique=True, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False)
+    revoked_at = Column(DateTime)
@@ -0,0 +1,60 @@
+# backend/pagination.py
+"""
+Keyset (cursor) pagination for the list endpoints.
+
+Pages are ordered by (timestamp, id) and the next page starts strictly after
+the last row of the previous one, so every page is an index range scan no
+matter how deep the client has paged (unlike OFFSET, which reads and throws
+away every skipped row). Endpoints keep returning a plain JSON list; when
+there are more rows the cursor for the next page is sent in the
+X-Next-Cursor response header.
+"""
+import base64
+import binascii
+import os
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import Select, tuple_
+
+DEFAULT_PAGE_SIZE = int(os.getenv("DEFAULT_PAGE_SIZE", "200"))
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "500"))
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(timestamp: datetime, row_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{timestamp.isoformat()}|{row_id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        timestamp, row_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def keyset_page(stmt: Select, timestamp_column, id_column, cursor: Optional[str], limit: int,
+                descending: bool = False) -> Select:
+    """Order by (timestamp, id), start after `cursor` and fetch one extra row to detect a next page"""
+    if cursor:
+        key = tuple_(timestamp_column, id_column)
+        after = tuple_(*decode_cursor(cursor))
+        stmt = stmt.where(key < after if descending else key > after)
+    if descending:
+        stmt = stmt.order_by(timestamp_column.desc(), id_column.desc())
+    else:
+        stmt = stmt.order_by(timestamp_column.asc(), id_column.asc())
+    return stmt.limit(limit + 1)
+
+
+def finish_page(rows: List, limit: int, response: Response, timestamp_attr: str) -> List:
+    """Drop the look-ahead row and, if it existed, send the next cursor"""
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(getattr(last, timestamp_attr), last.id)
+    return rows
@@ -0,0 +1,121 @@
+# backend/password_hasher.py
+"""
+Password hashing and verification on a dedicated process pool.
+
+pbkdf2_sha256 is slow on purpose (tens of thousands of HMAC rounds per call).
+Inside the API process a burst of logins competes with every other route for
+the GIL and the threadpool; here the work runs in PASSWORD_HASH_WORKERS
+separate processes and the auth routes just await the result.
+
+Admission is bounded: at most PASSWORD_HASH_MAX_PENDING hashes are queued or
+running at once. Past that, hash_password / verify_password raise
+HasherSaturated immediately and the auth routes answer 503 with Retry-After,
+instead of letting logins pile up until clients time out.
+
+PASSWORD_HASH_WORKERS=0 hashes on a thread in the API process instead (no
+extra processes, the previous behaviour), behind the same admission limit.
+"""
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional
+
+from passlib.context import CryptContext
+
+# The one hashing policy, shared by security.py and the worker processes
+pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+
+WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(2, os.cpu_count() or 1))))
+MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", str(8 * max(1, WORKERS))))
+RETRY_AFTER_SECONDS = int(os.getenv("PASSWORD_HASH_RETRY_AFTER_SECONDS", "1"))
+
+
+class HasherSaturated(Exception):
+    """PASSWORD_HASH_MAX_PENDING hashes are already in flight"""
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+# Only touched from the event loop thread, so no lock is needed
+_pending = 0
+_completed = 0
+_rejected = 0
+
+
+# Run in the worker processes: keep this module's imports light
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+def _verify(password: str, password_hash: str) -> bool:
+    return pwd_context.verify(password, password_hash)
+
+
+def get_hasher_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        # spawn, not fork: a forked child would inherit the API process's
+        # event loop, threads and open database connections
+        _executor = ProcessPoolExecutor(max_workers=WORKERS, mp_context=multiprocessing.get_context("spawn"))
+    return _executor
+
+
+async def _run(fn, *args):
+    global _pending, _completed, _rejected
+    if _pending >= MAX_PENDING:
+        _rejected += 1
+        raise HasherSaturated()
+
+    _pending += 1
+    try:
+        if WORKERS == 0:
+            result = await asyncio.to_thread(fn, *args)
+        else:
+            loop = asyncio.get_running_loop()
+            try:
+                result = await loop.run_in_executor(get_hasher_executor(), fn, *args)
+            except BrokenProcessPool:
+                # A worker died (e.g. OOM killed); the next call starts a fresh pool
+                shutdown_hasher_executor()
+                raise
+        _completed += 1
+        return result
+    finally:
+        _pending -= 1
+
+
+async def warm_up():
+    """Start every worker process now (spawning one takes seconds) instead of on the first logins"""
+    if WORKERS == 0:
+        return
+    loop = asyncio.get_running_loop()
+    executor = get_hasher_executor()
+    try:
+        await asyncio.gather(*(loop.run_in_executor(executor, _hash, "warm-up") for _ in range(WORKERS)))
+    except Exception as e:
+        print(f"⚠️ Password hashing warm-up failed: {e}")
+
+
+async def hash_password(password: str) -> str:
+    return await _run(_hash, password)
+
+
+async def verify_password(password: str, password_hash: str) -> bool:
+    return await _run(_verify, password, password_hash)
+
+
+def stats() -> Dict[str, Any]:
+    return {
+        "workers": WORKERS,
+        "max_pending": MAX_PENDING,
+        "pending": _pending,
+        "completed": _completed,
+        "rejected": _rejected,
+    }
+
+
+def shutdown_hasher_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
@@ -0,0 +1,76 @@
+# backend/query_counter.py
+"""
+Request-scoped SQL statement counter.
+
+Every statement sent through the SQLAlchemy engines (sync and async) is
+counted against the request that issued it, and the total goes out in the
+X-Query-Count response header. scripts/check_query_counts.py uses it to catch
+N+1 regressions: an endpoint's count must not grow with the number of rows it
+returns.
+
+Off by default (QUERY_COUNT_HEADER=true to enable). The ML stack's raw
+asyncpg pool bypasses SQLAlchemy and is not counted.
+"""
+import os
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+
+from database import async_engine, engine
+
+QUERY_COUNT_ENABLED = os.getenv("QUERY_COUNT_HEADER", "false").lower() in ("1", "true", "yes")
+QUERY_COUNT_HEADER = "X-Query-Count"
+
+
+class QueryCount:
+    """Mutable, so increments made in copied contexts (threadpool, greenlets) still land here"""
+    __slots__ = ("statements",)
+
+    def __init__(self):
+        self.statements = 0
+
+
+_current: ContextVar[Optional[QueryCount]] = ContextVar("query_count", default=None)
+
+
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    counter = _current.get()
+    if counter is not None:
+        counter.statements += 1
+
+
+class QueryCountMiddleware:
+    """Plain ASGI middleware: one counter per HTTP request, reported in the response headers"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        counter = QueryCount()
+        token = _current.set(counter)
+
+        async def send_with_count(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (QUERY_COUNT_HEADER.lower().encode(), str(counter.statements).encode()),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_count)
+        finally:
+            _current.reset(token)
+
+
+def install(app):
+    """Count statements on both engines and report them on every response"""
+    for target in (engine, async_engine.sync_engine):
+        if not event.contains(target, "before_cursor_execute", _count_statement):
+            event.listen(target, "before_cursor_execute", _count_statement)
+    app.add_middleware(QueryCountMiddleware)
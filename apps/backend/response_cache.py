@@ -0,0 +1,155 @@
+# backend/response_cache.py
+"""
+Per-user data versions, the dashboard response cache and conditional GETs.
+
+Every write path calls data_versions.bump(user_id, <tables it wrote>) after
+its commit. Readers derive cache keys and ETags from those counters instead
+of from the data itself:
+
+  - @cached_per_user keys dashboard responses on all of the user's table
+    versions, so any write makes the old entries unreachable (they age out of
+    the LRU).
+  - conditional_get(...) turns the versions of the tables an endpoint reads
+    into a weak ETag and answers a matching If-None-Match with 304 before the
+    endpoint's query runs.
+
+A read always captures the versions *before* querying, so a write that lands
+mid-request can only orphan that entry / ETag, never make it stale.
+
+Everything is in-process: with several worker processes a write on one would
+not bump the others, so set RESPONSE_CACHE_SIZE=0 and CONDITIONAL_GET=false
+there.
+"""
+import functools
+import os
+import secrets
+import threading
+from datetime import datetime
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from fastapi import Depends, HTTPException, Request, Response, status
+
+import security
+from caching import LRUCache
+
+_MISSING = object()
+
+# What a write can touch, per user
+TABLES = ("subjects", "tasks", "predictions", "sessions", "pomodoro")
+
+
+class UserDataVersions:
+    """Per-user, per-table change counters"""
+
+    def __init__(self):
+        # Counters restart at zero with the process; the epoch keeps ETags
+        # handed out by a previous process from matching.
+        self.epoch = secrets.token_hex(4)
+        self._versions: Dict[Tuple[int, str], int] = {}
+        self._lock = threading.Lock()
+        self.bumps = 0
+
+    def bump(self, user_id: int, *tables: str):
+        """Record a committed write to `tables` (all of them if none given)"""
+        with self._lock:
+            for table in tables or TABLES:
+                self._versions[(user_id, table)] = self._versions.get((user_id, table), 0) + 1
+            self.bumps += 1
+
+    def version(self, user_id: int, *tables: str) -> Tuple[int, ...]:
+        return tuple(self._versions.get((user_id, table), 0) for table in tables or TABLES)
+
+
+data_versions = UserDataVersions()
+
+
+class UserResponseCache:
+    def __init__(self, maxsize: int = 2048, ttl: float = 300):
+        # The TTL only bounds time-dependent drift ("today", "5 days ago");
+        # data changes are handled by the version bump.
+        self.enabled = maxsize > 0
+        self.cache = LRUCache(maxsize=max(1, maxsize), ttl=ttl)
+
+    def get(self, key: Hashable) -> Any:
+        return self.cache.get(key, _MISSING) if self.enabled else _MISSING
+
+    def set(self, key: Hashable, value: Any):
+        if self.enabled:
+            self.cache.set(key, value)
+
+    def clear(self):
+        self.cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            **self.cache.stats(),
+            "version_bumps": data_versions.bumps,
+        }
+
+
+response_cache = UserResponseCache(
+    maxsize=int(os.getenv("RESPONSE_CACHE_SIZE", "2048")),
+    ttl=float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "300")),
+)
+
+# Endpoint parameters that are not part of the cache key
+_UNKEYED_PARAMS = ("db", "current_user")
+
+def cached_per_user(name: str):
+    """
+    Cache an endpoint's return value per user and data version. Goes below
+    the @router decorator; the endpoint must take `current_user`.
+    """
+    def decorator(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            user_id = kwargs["current_user"].id
+            arguments = tuple(sorted((k, v) for k, v in kwargs.items() if k not in _UNKEYED_PARAMS))
+            key = (name, user_id, data_versions.version(user_id), arguments)
+
+            cached = response_cache.get(key)
+            if cached is not _MISSING:
+                return cached
+
+            result = await endpoint(*args, **kwargs)
+            response_cache.set(key, result)
+            return result
+        return wrapper
+    return decorator
+
+
+# --- Conditional GET (ETag / If-None-Match) ---
+CONDITIONAL_GET_ENABLED = os.getenv("CONDITIONAL_GET", "true").lower() in ("1", "true", "yes")
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison (RFC 9110 §13.1.2): W/ prefixes are ignored"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(","))
+
+def conditional_get(*tables: str, daily: bool = False):
+    """
+    Dependency for list endpoints: sets a weak ETag built from the user's
+    versions of `tables` (plus today's date when the result depends on it)
+    and short-circuits with 304 Not Modified when the client already has it.
+    """
+    async def dependency(
+        request: Request,
+        response: Response,
+        current_user: security.Principal = Depends(security.get_current_user)
+    ):
+        if not CONDITIONAL_GET_ENABLED:
+            return
+        versions = ".".join(str(v) for v in data_versions.version(current_user.id, *tables))
+        day = f"-{datetime.utcnow().date():%Y%m%d}" if daily else ""
+        etag = f'W/"{data_versions.epoch}-{current_user.id}-{versions}{day}"'
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache", "Vary": "Authorization"}
+
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        response.headers.update(headers)
+    return dependency
@@ -0,0 +1,161 @@
+# backend/rollups.py
+"""
+Per-user daily rollups (user_daily_stats / user_daily_subject_stats).
+
+The write endpoints call record_study_session / record_pomodoro_session in the
+same transaction as the row they insert, so the dashboards can sum a few dozen
+rollup rows instead of scanning the raw session history. backfill_daily_stats
+rebuilds the rollups from the raw tables (see scripts/backfill_daily_stats.py).
+"""
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import models
+
+
+async def _increment(db: AsyncSession, model, key: Dict, counters: Dict[str, int]):
+    """INSERT the row or add the counters to the existing one (one statement, no race)"""
+    stmt = insert(model).values(**key, **counters)
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=list(key),
+        set_={name: getattr(model, name) + stmt.excluded[name] for name in counters},
+    ))
+
+
+async def record_study_session(db: AsyncSession, session: models.StudySession, subject_id: int):
+    """Add a new study session to its day's rollups. Does not commit."""
+    if session.completed_at is None:
+        session.completed_at = datetime.utcnow()
+    key = {"user_id": session.user_id, "day": session.completed_at.date()}
+    timed = int(session.actual_duration is not None)
+    await _increment(db, models.UserDailyStats, key, {
+        "study_minutes": session.actual_duration or 0,
+        "session_count": 1,
+        "difficulty_sum": session.user_difficulty_rating or 0,
+        "timed_count": timed,
+        "rated_count": int(session.user_difficulty_rating is not None),
+    })
+    await _increment(db, models.UserDailySubjectStats, {**key, "subject_id": subject_id}, {
+        "study_minutes": session.actual_duration or 0,
+        "session_count": 1,
+        "timed_count": timed,
+    })
+
+
+async def record_pomodoro_session(db: AsyncSession, session: models.PomodoroSession):
+    """Add a new pomodoro session to its day's rollup. Does not commit."""
+    if session.start_time is None:
+        session.start_time = datetime.utcnow()
+    await _increment(db, models.UserDailyStats, {"user_id": session.user_id, "day": session.start_time.date()}, {
+        "pomodoro_minutes": session.duration or 0,
+        "pomodoro_count": 1,
+    })
+
+
+# --- Reads ---
+async def user_totals(db: AsyncSession, user_id: int) -> Tuple[int, int, int, int, int, int, int]:
+    """
+    All-time (study_minutes, session_count, difficulty_sum, pomodoro_minutes,
+    pomodoro_count, timed_count, rated_count). Average durations over
+    timed_count and difficulties over rated_count, as AVG() would.
+    """
+    row = (await db.execute(
+        select(
+            func.coalesce(func.sum(models.UserDailyStats.study_minutes), 0),
+            func.coalesce(func.sum(models.UserDailyStats.session_count), 0),
+            func.coalesce(func.sum(models.UserDailyStats.difficulty_sum), 0),
+            func.coalesce(func.sum(models.UserDailyStats.pomodoro_minutes), 0),
+            func.coalesce(func.sum(models.UserDailyStats.pomodoro_count), 0),
+            func.coalesce(func.sum(models.UserDailyStats.timed_count), 0),
+            func.coalesce(func.sum(models.UserDailyStats.rated_count), 0),
+        ).where(models.UserDailyStats.user_id == user_id)
+    )).one()
+    return tuple(int(value) for value in row)
+
+
+async def subject_totals(db: AsyncSession, user_id: int) -> List[Tuple[str, int, int]]:
+    """All-time (subject name, study_minutes, session_count), grouped by subject name"""
+    return [(name, int(minutes), int(count)) for name, minutes, count in (await db.execute(
+        select(
+            models.Subject.name,
+            func.sum(models.UserDailySubjectStats.study_minutes),
+            func.sum(models.UserDailySubjectStats.session_count),
+        ).join(models.Subject, models.Subject.id == models.UserDailySubjectStats.subject_id).where(
+            models.UserDailySubjectStats.user_id == user_id,
+            models.Subject.user_id == user_id
+        ).group_by(models.Subject.name)
+    )).all()]
+
+
+# --- Backfill ---
+# Same day bucketing as above: study sessions by completed_at, pomodoros by start_time.
+_USER_FILTER = "(CAST(:user_id AS INTEGER) IS NULL OR {column} = :user_id)"
+
+_DELETE_ROLLUPS = [
+    f"DELETE FROM user_daily_subject_stats WHERE {_USER_FILTER.format(column='user_id')}",
+    f"DELETE FROM user_daily_stats WHERE {_USER_FILTER.format(column='user_id')}",
+]
+
+_INSERT_DAILY_STATS = f"""
+    INSERT INTO user_daily_stats
+        (user_id, day, study_minutes, session_count, difficulty_sum, timed_count, rated_count,
+         pomodoro_minutes, pomodoro_count)
+    SELECT
+        COALESCE(s.user_id, p.user_id),
+        COALESCE(s.day, p.day),
+        COALESCE(s.study_minutes, 0),
+        COALESCE(s.session_count, 0),
+        COALESCE(s.difficulty_sum, 0),
+        COALESCE(s.timed_count, 0),
+        COALESCE(s.rated_count, 0),
+        COALESCE(p.pomodoro_minutes, 0),
+        COALESCE(p.pomodoro_count, 0)
+    FROM (
+        SELECT user_id, CAST(completed_at AS DATE) AS day,
+               COALESCE(SUM(actual_duration), 0) AS study_minutes,
+               COUNT(*) AS session_count,
+               COALESCE(SUM(user_difficulty_rating), 0) AS difficulty_sum,
+               COUNT(actual_duration) AS timed_count,
+               COUNT(user_difficulty_rating) AS rated_count
+        FROM study_sessions
+        WHERE completed_at IS NOT NULL AND {_USER_FILTER.format(column='user_id')}
+        GROUP BY user_id, CAST(completed_at AS DATE)
+    ) s
+    FULL OUTER JOIN (
+        SELECT user_id, CAST(start_time AS DATE) AS day,
+               COALESCE(SUM(duration), 0) AS pomodoro_minutes,
+               COUNT(*) AS pomodoro_count
+        FROM pomodoro_sessions
+        WHERE start_time IS NOT NULL AND {_USER_FILTER.format(column='user_id')}
+        GROUP BY user_id, CAST(start_time AS DATE)
+    ) p ON p.user_id = s.user_id AND p.day = s.day
+"""
+
+_INSERT_DAILY_SUBJECT_STATS = f"""
+    INSERT INTO user_daily_subject_stats (user_id, day, subject_id, study_minutes, session_count, timed_count)
+    SELECT ss.user_id, CAST(ss.completed_at AS DATE), t.subject_id,
+           COALESCE(SUM(ss.actual_duration), 0), COUNT(*), COUNT(ss.actual_duration)
+    FROM study_sessions ss
+    JOIN tasks t ON t.id = ss.task_id
+    WHERE ss.completed_at IS NOT NULL AND {_USER_FILTER.format(column='ss.user_id')}
+    GROUP BY ss.user_id, CAST(ss.completed_at AS DATE), t.subject_id
+"""
+
+
+def backfill_daily_stats(conn: Connection, user_id: Optional[int] = None) -> int:
+    """
+    Rebuild the rollups from study_sessions / pomodoro_sessions, for one user
+    or everyone. Runs on the caller's (sync) connection and transaction.
+    Returns the number of user_daily_stats rows written.
+    """
+    params = {"user_id": user_id}
+    for statement in _DELETE_ROLLUPS:
+        conn.execute(text(statement), params)
+    rows = conn.execute(text(_INSERT_DAILY_STATS), params).rowcount
+    conn.execute(text(_INSERT_DAILY_SUBJECT_STATS), params)
+    return rows
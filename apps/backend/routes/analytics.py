@@ -1,64 +1,100 @@
 # apps/backend/routers/analytics.py
 
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import func, Date, text
-from typing import List, Dict
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import JSON, text
 from datetime import datetime, timedelta
-import models, schema, security
-from database import get_db
+import schema, security, insights
+from response_cache import cached_per_user
+from database import get_async_db
 
 router = APIRouter(
     prefix="/analytics",
     tags=["Analytics"]
 )
 
+# Every /analytics/summary section in one round trip. Sums and counts come
+# from the daily rollups (rollups.py); each section is aggregated into a JSON
+# array so the whole dashboard is a single row.
+SUMMARY_SQL = text("""
+    WITH subject_totals AS (
+        SELECT s.name, SUM(r.study_minutes) AS minutes, SUM(r.session_count) AS sessions,
+               SUM(r.timed_count) AS timed
+        FROM user_daily_subject_stats r
+        JOIN subjects s ON s.id = r.subject_id
+        WHERE r.user_id = :user_id AND s.user_id = :user_id
+        GROUP BY s.name
+    ),
+    recent_days AS (
+        SELECT day, study_minutes, session_count, pomodoro_minutes
+        FROM user_daily_stats
+        WHERE user_id = :user_id AND day >= :week_start
+    ),
+    task_distribution AS (
+        SELECT s.name, COUNT(t.id) AS task_count
+        FROM subjects s
+        JOIN tasks t ON t.subject_id = s.id
+        WHERE s.user_id = :user_id
+        GROUP BY s.name
+    ),
+    totals AS (
+        SELECT COALESCE(SUM(difficulty_sum), 0) AS difficulty_sum,
+               COALESCE(SUM(rated_count), 0) AS rated_count,
+               COALESCE(SUM(pomodoro_count), 0) AS pomodoro_count
+        FROM user_daily_stats
+        WHERE user_id = :user_id
+    )
+    SELECT
+        (SELECT COALESCE(json_agg(json_build_array(name, minutes, sessions, timed)), '[]'::json)
+         FROM subject_totals) AS subjects,
+        (SELECT COALESCE(json_agg(json_build_array(day, study_minutes, session_count, pomodoro_minutes) ORDER BY day), '[]'::json)
+         FROM recent_days) AS recent_days,
+        (SELECT COUNT(*) FROM tasks WHERE user_id = :user_id AND status = 'pending') AS tasks_pending,
+        (SELECT COALESCE(json_agg(json_build_array(name, task_count) ORDER BY task_count DESC), '[]'::json)
+         FROM task_distribution) AS task_distribution,
+        totals.difficulty_sum,
+        totals.rated_count,
+        totals.pomodoro_count
+    FROM totals
+""").columns(subjects=JSON, recent_days=JSON, task_distribution=JSON)
+
 @router.get("/summary", response_model=schema.AnalyticsSummary)
-def get_analytics_summary(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(security.get_current_user)
+@cached_per_user("analytics.summary")
+async def get_analytics_summary(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: security.Principal = Depends(security.get_current_user)
 ):
     """
     Calculates a comprehensive summary of all user analytics for the main dashboard.
     """
-    user_id = current_user.id
     today = datetime.utcnow().date()
     seven_days_ago = today - timedelta(days=6)
 
+    summary = (await db.execute(
+        SUMMARY_SQL, {"user_id": current_user.id, "week_start": seven_days_ago}
+    )).one()
+
     # --- 1. Subject Analytics ---
-    subject_query = db.query(
-        models.Subject.name,
-        func.sum(models.StudySession.actual_duration).label("total_minutes"),
-        func.count(models.StudySession.id).label("session_count"),
-        func.avg(models.StudySession.actual_duration).label("avg_duration")
-    ).select_from(models.StudySession).join(models.Task).join(models.Subject).filter(
-        models.Subject.user_id == user_id
-    ).group_by(models.Subject.name).all()
-    
+    # Averages skip sessions without a duration, as AVG(actual_duration) did
     subject_data = [schema.SubjectAnalytics(
         subject_name=name,
-        total_minutes_studied=minutes or 0,
-        sessions_count=count or 0,
-        avg_session_duration=round(avg_dur or 0, 1)
-    ) for name, minutes, count, avg_dur in subject_query]
+        total_minutes_studied=minutes,
+        sessions_count=count,
+        avg_session_duration=round(minutes / timed, 1) if timed else 0
+    ) for name, minutes, count, timed in summary.subjects]
+
+    # Last seven days of rollup rows (today included): [day, study_minutes, session_count, pomodoro_minutes]
+    recent_days = summary.recent_days
+    today_stats = next((row for row in recent_days if row[0] == today.isoformat()), None)
 
     # --- 2. Daily Analytics ---
-    tasks_completed_today = db.query(func.count(models.Task.id)).join(models.StudySession).filter(
-        models.Task.user_id == user_id,
-        func.cast(models.StudySession.completed_at, Date) == today
-    ).scalar() or 0
-    
-    tasks_pending = db.query(func.count(models.Task.id)).filter(
-        models.Task.user_id == user_id, models.Task.status == 'pending'
-    ).scalar() or 0
+    tasks_completed_today = today_stats[2] if today_stats else 0
+    tasks_pending = summary.tasks_pending or 0
     
     total_planned_today = tasks_completed_today + tasks_pending
     completion_rate = (tasks_completed_today / total_planned_today * 100) if total_planned_today > 0 else 0
     
-    focus_time_today = db.query(func.sum(models.PomodoroSession.duration)).filter(
-        models.PomodoroSession.user_id == user_id,
-        func.cast(models.PomodoroSession.start_time, Date) == today
-    ).scalar() or 0
+    focus_time_today = today_stats[3] if today_stats else 0
 
     daily_data = schema.DailyAnalytics(
         tasks_planned=total_planned_today,
@@ -68,15 +104,9 @@ def get_analytics_summary(
     )
 
     # --- 3. Weekly Streak & Goal ---
-    daily_summary_query = db.query(
-        func.cast(models.StudySession.completed_at, Date).label("study_day"),
-        func.sum(models.StudySession.actual_duration).label("total_minutes")
-    ).filter(
-        models.StudySession.user_id == user_id,
-        func.cast(models.StudySession.completed_at, Date) >= seven_days_ago
-    ).group_by("study_day").all()
-
-    daily_summary_map = {day.isoformat(): minutes for day, minutes in daily_summary_query}
+    daily_summary_map = {
+        day: study_minutes for day, study_minutes, session_count, _ in recent_days if session_count > 0
+    }
     
     streak_days = 0
     for i in range(7):
@@ -93,26 +123,16 @@ def get_analytics_summary(
         weekly_goal=350,  # NOTE: Hardcoded goal, can be made a user setting later
         total_weekly_minutes=total_weekly_minutes
     )
-    # --- YEH NAYA BLOCK PASTE KAREIN ---
-# --- 3.5. Task Distribution by Subject ---
-    task_dist_query = db.query(
-        models.Subject.name,
-        func.count(models.Task.id).label("task_count")
-    ).join(models.Task, models.Subject.id == models.Task.subject_id).filter(
-        models.Subject.user_id == user_id
-    ).group_by(models.Subject.name).order_by(func.count(models.Task.id).desc()).all()
-    
+
+    # --- 3.5. Task Distribution by Subject ---
     task_distribution_data = [
         schema.TaskDistribution(subject_name=name, task_count=count or 0)
-        for name, count in task_dist_query
+        for name, count in summary.task_distribution
     ]
-# --- YAHAN TAK PASTE KAREIN ---
+
     # --- 4. Performance Metrics (Calculated) ---
-    total_focus_sessions = db.query(func.count(models.PomodoroSession.id)).filter(models.PomodoroSession.user_id == user_id).scalar() or 0
-    
-    avg_quality = db.query(func.avg(models.StudySession.user_difficulty_rating)).filter(
-        models.StudySession.user_id == user_id
-    ).scalar() or 0
+    total_focus_sessions = summary.pomodoro_count
+    avg_quality = summary.difficulty_sum / summary.rated_count if summary.rated_count else 0
     
     # Simple productivity score based on completion and consistency
     productivity_score = int((completion_rate * 0.7) + (min(streak_days, 7) / 7 * 100 * 0.3))
@@ -133,91 +153,19 @@ def get_analytics_summary(
     )
 
 @router.get("/recommendations", response_model=schema.InsightsResponse)
-def get_recommendations(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(security.get_current_user)
+@cached_per_user("analytics.recommendations")
+async def get_recommendations(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: security.Principal = Depends(security.get_current_user)
 ):
     """
     Analyzes the user's study history to generate personalized AI insights
-    and recommendations.
+    and recommendations. The rules live in insights.py and share one scan
+    of the user's sessions.
     """
-    recommendations = []
-    
-    # --- Insight 1: Productivity by Time of Day ---
-    try:
-        time_of_day_query = db.execute(text(f"""
-            SELECT
-                CASE
-                    WHEN EXTRACT(hour FROM ss.completed_at) BETWEEN 7 AND 12 THEN 'Morning'
-                    WHEN EXTRACT(hour FROM ss.completed_at) BETWEEN 13 AND 17 THEN 'Afternoon'
-                    ELSE 'Evening'
-                END as period,
-                AVG(t.estimated_time::float / NULLIF(ss.actual_duration, 0)::float) as efficiency
-            FROM study_sessions ss
-            JOIN tasks t ON ss.task_id = t.id
-            WHERE ss.user_id = {current_user.id} AND ss.actual_duration > 0
-            GROUP BY period
-            ORDER BY efficiency DESC
-            LIMIT 1;
-        """)).first()
-
-        if time_of_day_query and time_of_day_query.efficiency > 1.1:
-            recommendations.append(
-                f"You're most efficient in the {time_of_day_query.period.lower()}. Try scheduling your hardest tasks then!"
-            )
-    except Exception as e:
-        print(f"Could not generate time-of-day insight: {e}")
-
-    # --- Insight 2: Estimation Accuracy by Subject ---
-    try:
-        # THE FIX: Replaced the alias 'avg_difference' in ORDER BY with the full calculation.
-        estimation_accuracy_query = db.execute(text(f"""
-            SELECT
-                s.name as subject_name,
-                AVG(ss.actual_duration::float - t.estimated_time::float) as avg_difference
-            FROM study_sessions ss
-            JOIN tasks t ON ss.task_id = t.id
-            JOIN subjects s ON t.subject_id = s.id
-            WHERE ss.user_id = {current_user.id}
-            GROUP BY s.name
-            ORDER BY ABS(AVG(ss.actual_duration::float - t.estimated_time::float)) DESC
-            LIMIT 1;
-        """)).first()
-
-        if estimation_accuracy_query:
-            if estimation_accuracy_query.avg_difference > 15:
-                recommendations.append(
-                    f"You tend to underestimate your time for '{estimation_accuracy_query.subject_name}'. Try adding a 15-minute buffer."
-                )
-            elif estimation_accuracy_query.avg_difference < -15:
-                recommendations.append(
-                    f"You are faster than you think at '{estimation_accuracy_query.subject_name}'! You might be overestimating."
-                )
-    except Exception as e:
-        print(f"Could not generate estimation accuracy insight: {e}")
-            
-    # --- Insight 3: Spaced Repetition (Forgetting Curve) ---
-    try:
-        spaced_repetition_query = db.execute(text(f"""
-            SELECT s.name as subject_name, MAX(ss.completed_at) as last_studied
-            FROM subjects s
-            JOIN tasks t ON s.id = t.subject_id
-            JOIN study_sessions ss ON t.id = ss.task_id
-            WHERE s.user_id = {current_user.id}
-            GROUP BY s.name
-            HAVING (NOW() - MAX(ss.completed_at)) > INTERVAL '5 days'
-            ORDER BY last_studied ASC
-            LIMIT 1;
-        """)).first()
-
-        if spaced_repetition_query:
-            recommendations.append(
-                f"You haven't reviewed '{spaced_repetition_query.subject_name}' in a while. Consider studying it soon."
-            )
-    except Exception as e:
-        print(f"Could not generate spaced repetition insight: {e}")
+    recommendations = await insights.generate_recommendations(db, current_user.id)
 
     if not recommendations:
         recommendations.append("Keep completing tasks to unlock more personalized insights!")
 
-    return schema.InsightsResponse(recommendations=recommendations)
\ No newline at end of file
+    return schema.InsightsResponse(recommendations=recommendations)
@@ -1,23 +1,39 @@
 # backend/routers/auth.py
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 # Note the relative imports for a clean structure
-import models, schema, security
-from database import get_db
+import models, schema, security, password_hasher
+from admission import AUTH_ADMISSION
+from database import get_async_db
 
 router = APIRouter(
     prefix="/auth",
     tags=["Authentication"]
 )
 
-@router.post("/register", status_code=status.HTTP_201_CREATED)
-def register_user(user: schema.UserCreate, db: Session = Depends(get_db)):
-    db_user = db.query(models.User).filter(models.User.email == user.email).first()
+def hasher_busy():
+    # The password hashing pool is saturated: fail fast, the client retries
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many sign-ins in progress, please retry shortly",
+        headers={"Retry-After": str(password_hasher.RETRY_AFTER_SECONDS)},
+    )
+
+@router.post("/register", status_code=status.HTTP_201_CREATED, dependencies=AUTH_ADMISSION)
+async def register_user(user: schema.UserCreate, db: AsyncSession = Depends(get_async_db)):
+    db_user = (await db.execute(
+        select(models.User).where(models.User.email == user.email)
+    )).scalars().first()
     if db_user:
         raise HTTPException(status_code=400, detail="Email or username already registered")
     
-    hashed_password = security.get_password_hash(user.password)
+    # Password hashing is CPU-bound; it runs on the password hashing processes
+    try:
+        hashed_password = await password_hasher.hash_password(user.password)
+    except password_hasher.HasherSaturated:
+        raise hasher_busy()
     new_user = models.User(
         email=user.email, 
         username=user.username, 
@@ -25,17 +41,23 @@ def register_user(user: schema.UserCreate, db: Session = Depends(get_db)):
     )
     
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
     
     return {"message": f"User {new_user.username} created successfully."}
 
 
-@router.post("/login", response_model=schema.Token)
-def login_for_access_token(form_data: schema.UserLogin, db: Session = Depends(get_db)):
-    user = db.query(models.User).filter(models.User.username == form_data.username).first()
+@router.post("/login", response_model=schema.Token, dependencies=AUTH_ADMISSION)
+async def login_for_access_token(form_data: schema.UserLogin, db: AsyncSession = Depends(get_async_db)):
+    user = (await db.execute(
+        select(models.User).where(models.User.username == form_data.username)
+    )).scalars().first()
     
-    if not user or not security.verify_password(form_data.password, user.password_hash):
+    try:
+        password_ok = user is not None and await password_hasher.verify_password(form_data.password, user.password_hash)
+    except password_hasher.HasherSaturated:
+        raise hasher_busy()
+
+    if not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -45,5 +67,36 @@ def login_for_access_token(form_data: schema.UserLogin, db: Session = Depends(ge
     # THE FIX: Add the user's ID to the data that goes into the token
     token_data = {"sub": user.username, "user_id": user.id}
     access_token = security.create_access_token(data=token_data)
-    
-    return {"access_token": access_token, "token_type": "bearer"}
\ No newline at end of file
+    refresh_token = security.issue_refresh_token(db, user.id)
+    await db.commit()
+
+    return {"access_token": access_token, "token_type": "bearer", "refresh_token": refresh_token}
+
+
+# Renew an expired access token without the password: the refresh token is
+# checked and rotated in one indexed UPDATE, no pbkdf2 involved.
+@router.post("/refresh", response_model=schema.Token)
+async def refresh_access_token(body: schema.RefreshRequest, db: AsyncSession = Depends(get_async_db)):
+    owner = await security.use_refresh_token(db, body.refresh_token)
+    if owner is None:
+        # Keep a reuse-triggered revocation
+        await db.commit()
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    user_id, username = owner
+    access_token = security.create_access_token(data={"sub": username, "user_id": user_id})
+    refresh_token = security.issue_refresh_token(db, user_id)
+    await db.commit()
+
+    return {"access_token": access_token, "token_type": "bearer", "refresh_token": refresh_token}
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(body: schema.RefreshRequest, db: AsyncSession = Depends(get_async_db)):
+    """Revoke a refresh token. The access token stays valid until it expires."""
+    await security.revoke_refresh_token(db, body.refresh_token)
+    await db.commit()
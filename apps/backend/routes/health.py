@@ -0,0 +1,71 @@
+# apps/backend/routers/health.py
+
+import asyncio
+import os
+
+import asyncpg
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+import admission
+import database
+import password_hasher
+import security
+from response_cache import response_cache
+import routes.ml_endpoint as ml_endpoints
+
+router = APIRouter(
+    prefix="/health",
+    tags=["Health"]
+)
+
+READINESS_TIMEOUT_SECONDS = float(os.getenv("HEALTH_DB_TIMEOUT_SECONDS", "2"))
+
+@router.get("/live")
+async def liveness():
+    """The process is up and the event loop is responsive. No I/O."""
+    return {"status": "ok"}
+
+@router.get("/ready")
+async def readiness():
+    """
+    Ready to take traffic: a pooled connection answers SELECT 1 within the
+    timeout. Reuses the shared asyncpg pool, so a probe never opens a new
+    connection. ML warm-up is reported but does not gate readiness (the ML
+    endpoints have fallbacks).
+    """
+    try:
+        pool = database.get_asyncpg_pool()
+        async with pool.acquire(timeout=READINESS_TIMEOUT_SECONDS) as conn:
+            await conn.fetchval("SELECT 1", timeout=READINESS_TIMEOUT_SECONDS)
+    except (asyncio.TimeoutError, RuntimeError, OSError, asyncpg.PostgresError) as e:
+        return JSONResponse(
+            status_code=503,
+            content={"status": "unavailable", "database": str(e) or type(e).__name__, "ml_state": ml_endpoints.ml_state}
+        )
+
+    return {"status": "ready", "database": "ok", "ml_state": ml_endpoints.ml_state}
+
+@router.get("/pool")
+async def pool_metrics():
+    """Checked-out, idle and overflow connections and pool wait times"""
+    return database.pool_status()
+
+@router.get("/cache")
+async def response_cache_metrics():
+    """Hit/miss/eviction counters of the per-user dashboard response cache"""
+    return response_cache.stats()
+
+@router.get("/auth")
+async def auth_cache_metrics():
+    """Verified-token and user-record caches and the password hashing pool"""
+    return {
+        "tokens": security.token_cache.stats(),
+        "users": security.user_cache.stats(),
+        "password_hashing": password_hasher.stats(),
+    }
+
+@router.get("/limits")
+async def admission_metrics():
+    """In-flight requests, token buckets and rejections of the admission limiters"""
+    return admission.stats()
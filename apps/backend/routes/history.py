@@ -1,13 +1,14 @@
 # apps/backend/routers/history.py
 
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func
-from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select
 from datetime import datetime, timedelta
 
-import models, schema, security
-from database import get_db
+import models, schema, security, rollups
+from response_cache import cached_per_user
+from database import get_async_db
+from routes.tasks import SESSION_RESPONSE_OPTIONS
 
 router = APIRouter(
     prefix="/history",
@@ -15,9 +16,10 @@ router = APIRouter(
 )
 
 @router.get("/summary", response_model=schema.HistorySummary)
-def get_history_summary(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(security.get_current_user)
+@cached_per_user("history.summary")
+async def get_history_summary(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: security.Principal = Depends(security.get_current_user)
 ):
     """
     Fetches a complete, pre-calculated summary of the user's study history
@@ -25,27 +27,24 @@ def get_history_summary(
     """
     user_id = current_user.id
     
-    # Query 1: Calculate core statistics
-    stats_query = db.query(
-        func.count(models.StudySession.id),
-        func.sum(models.StudySession.actual_duration),
-        func.avg(models.StudySession.user_difficulty_rating),
-        func.avg(models.StudySession.actual_duration)
-    ).filter(models.StudySession.user_id == user_id).first()
+    # Query 1: Core statistics, summed from the daily rollup (rollups.py)
+    total_minutes, total_sessions, difficulty_sum, _, _, timed_count, rated_count = await rollups.user_totals(db, user_id)
 
     stats = schema.HistoryStats(
-        total_sessions=stats_query[0] or 0,
-        total_hours=round((stats_query[1] or 0) / 60, 1),
-        avg_difficulty=round(stats_query[2] or 0, 1),
-        avg_duration=round(stats_query[3] or 0)
+        total_sessions=total_sessions,
+        total_hours=round(total_minutes / 60, 1),
+        avg_difficulty=round(difficulty_sum / rated_count, 1) if rated_count else 0,
+        avg_duration=round(total_minutes / timed_count) if timed_count else 0
     )
 
     # Query 2: Get data for the timeline chart (last 7 days)
     seven_days_ago = datetime.utcnow() - timedelta(days=7)
-    timeline_query = db.query(models.StudySession).filter(
-        models.StudySession.user_id == user_id,
-        models.StudySession.completed_at >= seven_days_ago
-    ).order_by(models.StudySession.completed_at.asc()).all()
+    timeline_query = (await db.execute(
+        select(models.StudySession).where(
+            models.StudySession.user_id == user_id,
+            models.StudySession.completed_at >= seven_days_ago
+        ).order_by(models.StudySession.completed_at.asc())
+    )).scalars().all()
     
     timeline_data = [
         schema.TimelinePoint(
@@ -55,24 +54,19 @@ def get_history_summary(
         ) for s in timeline_query
     ]
 
-    # Query 3: Get data for subject distribution chart
-    # Replace the old query with this one
-    subject_dist_query = db.query(
-    models.Subject.name,
-    func.sum(models.StudySession.actual_duration),
-    func.count(models.StudySession.id)
-).select_from(models.StudySession).join(models.Task).join(models.Subject).filter(models.Subject.user_id == user_id).group_by(models.Subject.name).all()
-
+    # Query 3: Get data for subject distribution chart (per-subject rollup)
     subject_chart_data = [
-        schema.SubjectDistribution(subject=name, duration=duration or 0, sessions=count or 0)
-        for name, duration, count in subject_dist_query
+        schema.SubjectDistribution(subject=name, duration=duration, sessions=count)
+        for name, duration, count in await rollups.subject_totals(db, user_id)
     ]
 
     # Query 4: Get data for difficulty distribution chart
-    difficulty_dist_query = db.query(
-        models.StudySession.user_difficulty_rating,
-        func.count(models.StudySession.id)
-    ).filter(models.StudySession.user_id == user_id).group_by(models.StudySession.user_difficulty_rating).all()
+    difficulty_dist_query = (await db.execute(
+        select(
+            models.StudySession.user_difficulty_rating,
+            func.count(models.StudySession.id)
+        ).where(models.StudySession.user_id == user_id).group_by(models.StudySession.user_difficulty_rating)
+    )).all()
     
     difficulty_chart_data = [
         schema.DifficultyDistribution(difficulty=f"Level {rating}", count=count)
@@ -87,9 +81,10 @@ def get_history_summary(
 
 
     # Query 5: Get the 5 most recent sessions
-    recent_sessions = db.query(models.StudySession).options(
-        joinedload(models.StudySession.task).joinedload(models.Task.subject)
-    ).filter(models.StudySession.user_id == user_id).order_by(models.StudySession.completed_at.desc()).limit(5).all()
+    recent_sessions = (await db.execute(
+        select(models.StudySession).options(*SESSION_RESPONSE_OPTIONS)
+        .where(models.StudySession.user_id == user_id).order_by(models.StudySession.completed_at.desc()).limit(5)
+    )).scalars().all()
 
     return schema.HistorySummary(
         stats=stats,
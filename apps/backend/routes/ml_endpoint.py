@@ -1,56 +1,98 @@
 # backend/routers/ml_endpoints.py
-from fastapi import APIRouter, Depends, HTTPException, Query, Body
-from sqlalchemy.orm import Session
-from typing import List, Optional, Dict, Any
+from fastapi import APIRouter, Depends, HTTPException, Query, Body, Header
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import TYPE_CHECKING, List, Optional, Dict, Any, Set
 from datetime import datetime
+from collections import deque
+import asyncio
+import hmac
 import os
 import sys
+import time
 from pathlib import Path
 
 # Fix the import - it should be 'schemas' not 'schema'
-from database import get_db
-from security import get_current_user
+from database import get_async_db
+from security import Principal, get_current_user
 import models
 import schema  # Changed from 'schema' to 'schemas'
 
 # Add parent directory to path for ML imports
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
-# Import ML components with error handling
-try:
-    from ml.time_prediction import TimePredictionModel
-    from ml.feature_engineering import FeatureEngineer
-    ML_AVAILABLE = True
-except ImportError as e:
-    print(f"ML components not available: {e}")
-    ML_AVAILABLE = False
+# Only the executor helpers are imported eagerly. pandas, scikit-learn and the
+# model code are imported by the background warm-up, so importing this module
+# (and starting the API) stays cheap.
+from ml.executor import get_ml_executor, run_in_ml_executor
+from response_cache import data_versions
+from admission import ML_ADMISSION
 
-# Try to import PriorityScorer, create fallback if not available
-try:
+# For the annotations only; never imported at runtime
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+    from ml.feature_engineering import FeatureEngineer
+    from ml.model_registry import LoadedModel, ModelRegistry
+    from ml.numpy_predictor import NumpyTimePredictor
+    from ml.prediction_cache import PredictionCache
+    from ml.prediction_store import PredictionStore
     from ml.priority_scorer import PriorityScorer
-    PRIORITY_SCORER_AVAILABLE = True
-except ImportError:
-    print("PriorityScorer not available, using fallback")
-    PRIORITY_SCORER_AVAILABLE = False
 
 router = APIRouter(
     prefix="/ml",
     tags=["Machine Learning"]
 )
 
-# Global ML components (will be initialized on server startup)
-time_predictor: Optional[TimePredictionModel] = None
-feature_engineer: Optional[FeatureEngineer] = None
+# Set by initialize_ml_components once the imports have been attempted
+ML_AVAILABLE = False
+PRIORITY_SCORER_AVAILABLE = False
+
+# Readiness: "starting" -> "loading" -> "ready" | "degraded" (running on the
+# fallback paths, e.g. no trained model) | "unavailable". Endpoints serve the
+# fallbacks until the state is "ready".
+ml_state = "starting"
+ml_warm_up_seconds: Optional[float] = None
+
+# Global ML components (will be initialized by the warm-up task)
+model_registry: Optional['ModelRegistry'] = None
+# The serving model (predictor + encoders + version) is swapped as one object,
+# so a request that read it keeps a consistent version even across a reload
+active_model: Optional['LoadedModel'] = None
+feature_engineer: Optional['FeatureEngineer'] = None
 priority_scorer: Optional['PriorityScorer'] = None
+prediction_cache: Optional['PredictionCache'] = None
+prediction_store: Optional['PredictionStore'] = None
+# Shared asyncpg pool from database.py, injected by the lifespan hook
+db_pool = None
+
+def ml_ready() -> bool:
+    return ml_state == "ready"
 
-def initialize_ml_components():
-    """Initialize ML components and load models. Called on server startup."""
-    global time_predictor, feature_engineer, priority_scorer
+def initialize_ml_components(pool=None):
+    """Import ML components and load models. Blocking - run it off the event loop."""
+    global ML_AVAILABLE, PRIORITY_SCORER_AVAILABLE
+    global model_registry, active_model, feature_engineer, priority_scorer, prediction_cache, prediction_store
     
-    if not ML_AVAILABLE:
-        print("❌ ML components not available due to import errors")
+    # Import ML components with error handling
+    try:
+        # Serving uses the NumPy forward pass; TensorFlow is only needed to train
+        from ml.model_registry import ModelRegistry
+        from ml.feature_engineering import FeatureEngineer
+        from ml.prediction_cache import PredictionCache
+        from ml.prediction_store import PredictionStore
+        ML_AVAILABLE = True
+    except ImportError as e:
+        print(f"❌ ML components not available due to import errors: {e}")
         return False
     
+    # Try to import PriorityScorer, use the fallback if not available
+    try:
+        from ml.priority_scorer import PriorityScorer
+        PRIORITY_SCORER_AVAILABLE = True
+    except ImportError:
+        print("PriorityScorer not available, using fallback")
+    
     DATABASE_URL = os.getenv("DATABASE_URL")
     if not DATABASE_URL:
         print("❌ FATAL: DATABASE_URL not found. ML components cannot be initialized.")
@@ -58,18 +100,23 @@ def initialize_ml_components():
     
     try:
         print("Initializing ML components...")
-        time_predictor = TimePredictionModel()
-        feature_engineer = FeatureEngineer(DATABASE_URL)
+        model_registry = ModelRegistry()
+        feature_engineer = FeatureEngineer(DATABASE_URL, pool=pool)
+        prediction_store = PredictionStore(DATABASE_URL, pool=pool)
+        prediction_cache = PredictionCache()
         
         if PRIORITY_SCORER_AVAILABLE:
-            priority_scorer = PriorityScorer(DATABASE_URL)
+            priority_scorer = PriorityScorer(DATABASE_URL, pool=pool)
         
         print("Loading trained models and encoders...")
-        models_loaded = time_predictor.load_model()
-        feature_engineer.load_encoders()
+        active_model = model_registry.load()
         
-        if not models_loaded:
+        if active_model is None:
             print("⚠️  Warning: Pre-trained models not found. Will use fallback predictions.")
+            print("   Export an existing Keras model with: python -m ml.time_prediction --export-numpy")
+            
+        else:
+            print(f"Serving model version {active_model.version}")
             
         print("✅ ML components initialized successfully.")
         return True
@@ -77,24 +124,337 @@ def initialize_ml_components():
         print(f"❌ Failed to initialize ML components: {e}")
         return False
 
+async def warm_up_ml_components(pool=None):
+    """
+    Background start-up task: import and load the ML stack on the ML executor
+    while the API is already serving, then refresh stale stored predictions.
+    """
+    global ml_state, ml_warm_up_seconds, db_pool
+    
+    db_pool = pool
+    ml_state = "loading"
+    started = time.perf_counter()
+    try:
+        initialized = await run_in_ml_executor(initialize_ml_components, pool)
+    except Exception as e:
+        print(f"❌ ML warm-up failed: {e}")
+        initialized = False
+    ml_warm_up_seconds = time.perf_counter() - started
+    
+    if not initialized:
+        ml_state = "unavailable"
+        return
+    
+    ml_state = "ready" if active_model is not None else "degraded"
+    print(f"ML warm-up finished in {ml_warm_up_seconds:.2f}s (state: {ml_state})")
+    
+    # Persisted predictions made by another model version are refreshed in the background
+    await recompute_stale_predictions()
+
+# --- Hot reload ---
+_model_reload_lock = asyncio.Lock()
+
+# Post-reload sweeps run in the background. The event loop only keeps weak
+# references to tasks, so they are held here until done; the lifespan
+# cancels any still running at shutdown.
+_background_tasks: Set[asyncio.Task] = set()
+
+def cancel_background_tasks():
+    for task in list(_background_tasks):
+        task.cancel()
+
+async def reload_model(version: Optional[str] = None) -> 'LoadedModel':
+    """
+    Load a registry version (default: the CURRENT pointer) on the ML executor
+    and swap it in. Requests keep using the old model until the swap, and
+    in-flight requests finish on the model they started with.
+    """
+    global active_model, ml_state
+
+    async with _model_reload_lock:
+        loaded = await run_in_ml_executor(model_registry.load, version)
+        if loaded is None:
+            raise ValueError(f"Model version {version or 'CURRENT'} could not be loaded")
+
+        if active_model is not None and active_model.version == loaded.version:
+            return active_model
+
+        previous = active_model.version if active_model else None
+        active_model = loaded
+        prediction_cache.clear()
+        ml_state = "ready"
+        print(f"🔁 Swapped model {previous} -> {loaded.version} (loaded in {loaded.load_seconds * 1000:.1f} ms)")
+
+    # Stored task predictions now belong to the old version
+    sweep = asyncio.create_task(recompute_stale_predictions())
+    _background_tasks.add(sweep)
+    sweep.add_done_callback(_background_tasks.discard)
+    return loaded
+
+async def watch_model_registry(interval_seconds: float):
+    """Poll the CURRENT pointer and reload when it names a different version"""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            version = model_registry.current_version() if model_registry else None
+            if version and (active_model is None or active_model.version != version):
+                await reload_model(version)
+        except Exception as e:
+            print(f"Model registry watch failed: {e}")
+
+# Micro-batching for /ml/predict-time: rows from concurrent requests are
+# collected for a short window and run through the model in one call.
+class PredictionBatcher:
+    def __init__(self, max_batch_rows: int = 256, max_wait_ms: float = 3.0):
+        self.max_batch_rows = max_batch_rows
+        self.max_wait = max_wait_ms / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.batches = 0
+        self.requests = 0
+        self.rows = 0
+        self.max_rows_seen = 0
+        self.batch_size_histogram = {"1": 0, "2-4": 0, "5-16": 0, "17-64": 0, "65+": 0}
+        self._queue_waits_ms = deque(maxlen=1000)
+
+    async def predict(self, features: "pd.DataFrame", predictor: "NumpyTimePredictor") -> "np.ndarray":
+        """Queue feature rows and wait for their share of a batched prediction"""
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        # Restart a dead worker on the same queue, so nothing already queued is lost
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((features, predictor, future, time.perf_counter()))
+        return await future
+
+    async def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        # Nobody will serve what is still queued; the queue is bound to this loop
+        if self._queue is not None:
+            while not self._queue.empty():
+                self._fail([self._queue.get_nowait()], RuntimeError("Prediction batcher stopped"))
+            self._queue = None
+
+    @staticmethod
+    def _fail(batch, error: BaseException):
+        for _, _, future, _ in batch:
+            if not future.done():
+                future.set_exception(error)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            try:
+                rows = len(batch[0][0])
+                deadline = loop.time() + self.max_wait
+
+                # Keep collecting until the window closes or the batch is full
+                while rows < self.max_batch_rows:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self._queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                    batch.append(item)
+                    rows += len(item[0])
+
+                # Rows queued around a model swap are scored by the model their
+                # request started with
+                by_predictor: Dict[int, list] = {}
+                for item in batch:
+                    by_predictor.setdefault(id(item[1]), []).append(item)
+                for group in by_predictor.values():
+                    try:
+                        await self._run_batch(group)
+                    except Exception as e:
+                        # One bad batch must not kill the worker and strand its callers
+                        print(f"Prediction batch failed: {e}")
+                        self._fail(group, e)
+            except asyncio.CancelledError:
+                self._fail(batch, RuntimeError("Prediction batcher stopped"))
+                raise
+            except Exception as e:
+                print(f"Prediction batch failed: {e}")
+                self._fail(batch, e)
+
+    async def _run_batch(self, batch):
+        import pandas as pd  # loaded by the warm-up before any model can be queued
+
+        started = time.perf_counter()
+        frames = [features for features, _, _, _ in batch]
+        predictor = batch[0][1]
+        try:
+            combined = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+            # The forward pass runs on the ML executor; new requests keep
+            # queueing up for the next batch meanwhile
+            predictions = await run_in_ml_executor(predictor.predict, combined)
+        except Exception as e:
+            self._fail(batch, e)
+            return
+
+        offset = 0
+        for features, _, future, queued_at in batch:
+            count = len(features)
+            if not future.done():
+                future.set_result(predictions[offset:offset + count])
+            offset += count
+            self._queue_waits_ms.append((started - queued_at) * 1000)
+
+        self._record_batch(len(batch), offset)
+
+    def _record_batch(self, request_count: int, row_count: int):
+        self.batches += 1
+        self.requests += request_count
+        self.rows += row_count
+        self.max_rows_seen = max(self.max_rows_seen, row_count)
+        if row_count <= 1:
+            bucket = "1"
+        elif row_count <= 4:
+            bucket = "2-4"
+        elif row_count <= 16:
+            bucket = "5-16"
+        elif row_count <= 64:
+            bucket = "17-64"
+        else:
+            bucket = "65+"
+        self.batch_size_histogram[bucket] += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        waits = sorted(self._queue_waits_ms)
+
+        def percentile(p):
+            return round(waits[min(len(waits) - 1, int(p * len(waits)))], 3) if waits else 0.0
+
+        return {
+            "max_batch_rows": self.max_batch_rows,
+            "max_wait_ms": self.max_wait * 1000,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "batches": self.batches,
+            "requests": self.requests,
+            "rows": self.rows,
+            "avg_rows_per_batch": round(self.rows / self.batches, 2) if self.batches else 0.0,
+            "avg_requests_per_batch": round(self.requests / self.batches, 2) if self.batches else 0.0,
+            "max_rows_per_batch": self.max_rows_seen,
+            "batch_size_histogram": dict(self.batch_size_histogram),
+            "queue_wait_ms": {
+                "p50": percentile(0.50),
+                "p99": percentile(0.99),
+                "max": round(waits[-1], 3) if waits else 0.0,
+            },
+        }
+
+prediction_batcher = PredictionBatcher(
+    max_batch_rows=int(os.getenv("ML_BATCH_MAX_ROWS", "256")),
+    max_wait_ms=float(os.getenv("ML_BATCH_WINDOW_MS", "3")),
+)
+
+async def predict_with_cache(features: "pd.DataFrame", model: "LoadedModel") -> "np.ndarray":
+    """Serve repeated feature rows from the prediction cache, batch the rest"""
+    keys = prediction_cache.make_keys(features, model.version)
+    predictions, missing = prediction_cache.lookup(keys)
+
+    if missing.any():
+        fresh = await prediction_batcher.predict(features[missing].reset_index(drop=True), model.predictor)
+        predictions[missing] = fresh
+        prediction_cache.store([key for key, miss in zip(keys, missing) if miss], fresh)
+
+    return predictions
+
+def invalidate_feature_stats(subject_ids: List[int] = (), user_ids: List[int] = ()):
+    """
+    Drop the cached subject / user aggregates behind the prediction features.
+    Called after a study session is logged, so the next predictions use it
+    instead of waiting out ML_STATS_CACHE_TTL_SECONDS.
+    """
+    if feature_engineer is not None:
+        feature_engineer.stats_service.invalidate(subject_ids, user_ids)
+
+async def refresh_task_predictions(task_ids: List[int]) -> int:
+    """
+    Compute and persist predictions for the given tasks. Called as a
+    background task after tasks are created or edited, never inline.
+    """
+    model = active_model
+    if not ml_ready() or not model or not feature_engineer or not prediction_store:
+        return 0
+
+    try:
+        tasks = await prediction_store.fetch_tasks(task_ids)
+        if not tasks:
+            return 0
+
+        features = await feature_engineer.prepare_prediction_features(
+            tasks, executor=get_ml_executor(), label_encoders=model.label_encoders
+        )
+        predictions = await predict_with_cache(features, model)
+        await prediction_store.save(
+            {task['task_id']: max(5, int(pred)) for task, pred in zip(tasks, predictions)},
+            model.version
+        )
+        # Task lists and summaries show predicted times
+        for user_id in {task['user_id'] for task in tasks}:
+            data_versions.bump(user_id, "predictions")
+        return len(tasks)
+    except Exception as e:
+        print(f"Failed to refresh task predictions: {e}")
+        return 0
+
+async def recompute_stale_predictions(batch_size: int = 500) -> int:
+    """Bring every open task's stored prediction up to the active model version"""
+    model = active_model
+    if not prediction_store or not model:
+        return 0
+
+    total = 0
+    try:
+        while True:
+            # Stop early if another reload swapped the model in the meantime
+            if active_model is not model:
+                break
+            task_ids = await prediction_store.stale_task_ids(model.version, batch_size)
+            if not task_ids:
+                break
+            refreshed = await refresh_task_predictions(task_ids)
+            if refreshed == 0:
+                break
+            total += refreshed
+    except Exception as e:
+        print(f"Failed to recompute stale predictions: {e}")
+
+    print(f"Recomputed {total} task predictions for model {model.version}")
+    return total
+
 # Fallback Priority Scorer for when the actual one isn't available
 class FallbackPriorityScorer:
-    def __init__(self, database_url: str):
+    def __init__(self, database_url: str, pool=None):
         self.database_url = database_url
+        self.pool = pool
     
-    async def generate_daily_schedule(self, user_id: int, max_tasks: int = 10):
-        """Generate a simple schedule using database queries"""
-        import asyncpg
+    async def generate_daily_schedule(self, user_id: int, max_tasks: int = 10, executor=None):
+        """Generate a simple schedule using database queries (no CPU-heavy step to offload)"""
+        from ml.connections import acquire_connection
         
         try:
-            conn = await asyncpg.connect(self.database_url)
-            
             # Simple query to get user's pending tasks
             query = """
             SELECT 
                 t.id as task_id,
                 t.title as task_name,
                 t.estimated_time,
+                COALESCE(p.predicted_time, t.estimated_time) as predicted_time,
                 t.deadline,
                 s.name as subject_name,
                 CASE 
@@ -105,14 +465,15 @@ class FallbackPriorityScorer:
                 END as priority_score
             FROM tasks t
             JOIN subjects s ON t.subject_id = s.id
+            LEFT JOIN task_predictions p ON p.task_id = t.id
             WHERE s.user_id = $1 
             AND t.status = 'pending'
             ORDER BY priority_score DESC, t.deadline ASC
             LIMIT $2
             """
             
-            rows = await conn.fetch(query, user_id, max_tasks)
-            await conn.close()
+            async with acquire_connection(self.pool, self.database_url) as conn:
+                rows = await conn.fetch(query, user_id, max_tasks)
             
             return [dict(row) for row in rows]
             
@@ -150,10 +511,10 @@ def get_recommendation_reason(task: dict) -> str:
     else:
         return "Low priority - can be scheduled flexibly"
 
-@router.get("/schedule/generate", response_model=schema.DailySchedule)
+@router.get("/schedule/generate", response_model=schema.DailySchedule, dependencies=ML_ADMISSION)
 async def generate_schedule(
     max_tasks: int = Query(default=7, ge=1, le=20),
-    current_user: models.User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """Generate an AI-powered daily study schedule for the current user."""
     
@@ -164,13 +525,14 @@ async def generate_schedule(
     if not active_scorer:
         print("Using fallback priority scorer...")
         DATABASE_URL = os.getenv("DATABASE_URL")
-        active_scorer = FallbackPriorityScorer(DATABASE_URL)
+        active_scorer = FallbackPriorityScorer(DATABASE_URL, pool=db_pool)
     
     try:
         print("📊 Calling generate_daily_schedule...")
         schedule_data = await active_scorer.generate_daily_schedule(
             user_id=current_user.id,
-            max_tasks=max_tasks
+            max_tasks=max_tasks,
+            executor=get_ml_executor() if ML_AVAILABLE else None
         )
         
         print(f"📋 Got {len(schedule_data)} tasks from scheduler")
@@ -208,27 +570,28 @@ async def generate_schedule(
         print(f"❌ Traceback: {traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=f"Failed to generate schedule: {str(e)}")
 
-@router.post("/predict-time", response_model=schema.TimePredictionResponse)
+@router.post("/predict-time", response_model=schema.TimePredictionResponse, dependencies=ML_ADMISSION)
 async def predict_task_time(
     tasks_to_predict: schema.TaskBatchUpdate,
-    current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Predict actual completion time for a list of specific tasks."""
     
-    print(f"Predicting time for tasks: {tasks_to_predict.task_ids}")
-    
     # Fetch tasks from database
-    tasks = db.query(models.Task).filter(
-        models.Task.id.in_(tasks_to_predict.task_ids),
-        models.Task.user_id == current_user.id
-    ).all()
+    tasks = (await db.execute(
+        select(models.Task).where(
+            models.Task.id.in_(tasks_to_predict.task_ids),
+            models.Task.user_id == current_user.id
+        )
+    )).scalars().all()
 
     if not tasks:
         raise HTTPException(status_code=404, detail="No valid tasks found for prediction.")
 
     # Check if ML components are available
-    if not time_predictor or not feature_engineer or not time_predictor.model:
+    model = active_model
+    if not ml_ready() or not model or not feature_engineer:
         print("Using fallback prediction (ML model not available)")
         # Simple fallback: use estimated time with some variation
         results = [
@@ -256,18 +619,14 @@ async def predict_task_time(
                 'user_id': current_user.id
             }
             tasks_for_prediction.append(task_data)
-            print(f"Task data prepared: {task_data}")
 
         # Use the fixed prepare_prediction_features method
-        print("Preparing prediction features...")
-        prediction_features = await feature_engineer.prepare_prediction_features(tasks_for_prediction)
-        
-        print(f"Features prepared: {prediction_features.shape}")
-        print(f"Feature columns: {list(prediction_features.columns)}")
+        prediction_features = await feature_engineer.prepare_prediction_features(
+            tasks_for_prediction, executor=get_ml_executor(), label_encoders=model.label_encoders
+        )
         
         # Make predictions
-        predictions = time_predictor.predict(prediction_features)
-        print(f"Predictions made: {predictions}")
+        predictions = await predict_with_cache(prediction_features, model)
 
         results = [
             schema.TimePrediction(
@@ -279,7 +638,7 @@ async def predict_task_time(
         
         return schema.TimePredictionResponse(
             predictions=results,
-            model_version="1.0.0"
+            model_version=model.version
         )
     except Exception as e:
         print(f"Error in time prediction: {e}")
@@ -305,9 +664,45 @@ async def get_ml_status():
     """Get the status of ML components"""
     return {
         "ml_available": ML_AVAILABLE,
-        "time_predictor_loaded": time_predictor is not None and time_predictor.model is not None,
+        "ml_state": ml_state,
+        "ml_warm_up_seconds": round(ml_warm_up_seconds, 3) if ml_warm_up_seconds is not None else None,
+        "time_predictor_loaded": active_model is not None,
+        "active_model": active_model.describe() if active_model else None,
+        "registry_versions": model_registry.list_versions() if model_registry else [],
         "feature_engineer_loaded": feature_engineer is not None,
         "priority_scorer_available": PRIORITY_SCORER_AVAILABLE,
         "priority_scorer_loaded": priority_scorer is not None,
-        "models_directory": os.path.exists("ml/models") if ML_AVAILABLE else False
-    }
\ No newline at end of file
+        "models_directory": os.path.exists("ml/models") if ML_AVAILABLE else False,
+        "prediction_batcher": prediction_batcher.metrics(),
+        "prediction_cache": prediction_cache.stats() if prediction_cache else None
+    }
+
+@router.get("/batcher/metrics")
+async def get_batcher_metrics():
+    """Batch size and queue wait metrics for tuning ML_BATCH_MAX_ROWS / ML_BATCH_WINDOW_MS"""
+    return prediction_batcher.metrics()
+
+@router.post("/admin/reload")
+async def reload_active_model(
+    version: Optional[str] = Body(default=None, embed=True),
+    x_admin_token: Optional[str] = Header(default=None)
+):
+    """
+    Load a model version from the registry (default: the CURRENT pointer) and
+    swap it in without a restart. Requires the ML_ADMIN_TOKEN header value.
+    """
+    admin_token = os.getenv("ML_ADMIN_TOKEN")
+    if not admin_token:
+        raise HTTPException(status_code=404, detail="Model reload is disabled")
+    # Constant-time comparison: the response time does not leak how much of the token matched
+    if not hmac.compare_digest((x_admin_token or "").encode(), admin_token.encode()):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+    if not ML_AVAILABLE or not model_registry:
+        raise HTTPException(status_code=503, detail="ML components are not available")
+
+    try:
+        loaded = await reload_model(version)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return loaded.describe()
\ No newline at end of file
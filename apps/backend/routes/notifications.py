@@ -1,39 +1,49 @@
 # apps/backend/routers/notifications.py
 
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import func, Date
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import contains_eager
+from sqlalchemy import select
 from typing import List
 from datetime import datetime, timedelta
 import models, schema, security
-from database import get_db
+from database import get_async_db
+from response_cache import conditional_get
 
 router = APIRouter(
     prefix="/notifications",
     tags=["Notifications"]
 )
 
-@router.get("/", response_model=List[schema.Notification])
-def get_upcoming_task_notifications(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(security.get_current_user)
+# "Due tomorrow" changes at midnight too, so the ETag includes the date
+@router.get("/", response_model=List[schema.Notification],
+            dependencies=[Depends(conditional_get("tasks", "subjects", daily=True))])
+async def get_upcoming_task_notifications(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: security.Principal = Depends(security.get_current_user)
 ):
     """
     Finds all pending tasks that are due tomorrow for the logged-in user
     to be displayed in the notification center.
     """
     tomorrow_date = datetime.utcnow().date() + timedelta(days=1)
+    # A range on the raw column (not CAST(deadline AS DATE)) so the
+    # ix_tasks_user_pending_deadline index can serve it
+    tomorrow_start = datetime.combine(tomorrow_date, datetime.min.time())
 
-    tasks_due_tomorrow = (
-        db.query(models.Task)
+    tasks_due_tomorrow = (await db.execute(
+        select(models.Task)
         .join(models.Subject)
-        .filter(
+        # task.subject comes from the join above, no extra query per task
+        .options(contains_eager(models.Task.subject))
+        .where(
             models.Task.user_id == current_user.id,
             models.Task.status == 'pending',
-            func.cast(models.Task.deadline, Date) == tomorrow_date
+            models.Task.deadline >= tomorrow_start,
+            models.Task.deadline < tomorrow_start + timedelta(days=1)
         )
-        .all()
-    )
+        .order_by(models.Task.deadline.asc())
+    )).scalars().all()
 
     # Format the data into our Notification schema
     notifications = [
@@ -1,9 +1,11 @@
 # apps/backend/routers/pomodoro.py
 
 from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
-import models, schema, security
-from database import get_db
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+import models, schema, security, rollups
+from database import get_async_db
+from response_cache import data_versions
 from datetime import datetime, timedelta
 
 router = APIRouter(
@@ -12,10 +14,10 @@ router = APIRouter(
 )
 
 @router.post("/log", status_code=status.HTTP_201_CREATED)
-def log_pomodoro_session(
+async def log_pomodoro_session(
     session_data: schema.PomodoroSessionCreate,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(security.get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: security.Principal = Depends(security.get_current_user)
 ):
     """
     Logs a completed Pomodoro session to the database.
@@ -25,25 +27,30 @@ def log_pomodoro_session(
         user_id=current_user.id
     )
     db.add(new_session)
-    db.commit()
+    # Same transaction: the dashboards read the daily rollup, not raw history
+    await rollups.record_pomodoro_session(db, new_session)
+    await db.commit()
+    data_versions.bump(current_user.id, "pomodoro")
     
     return {"message": "Pomodoro session logged successfully."}
 
 # --- YEH NAYA FUNCTION ADD KAREIN ---
 @router.get("/recent-count", response_model=dict)
-def get_recent_pomodoro_count(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(security.get_current_user)
+async def get_recent_pomodoro_count(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: security.Principal = Depends(security.get_current_user)
 ):
     """
     Counts the number of Pomodoro sessions completed in the last hour.
     """
     one_hour_ago = datetime.utcnow() - timedelta(hours=1)
 
-    count = db.query(models.PomodoroSession).filter(
-        models.PomodoroSession.user_id == current_user.id,
-        models.PomodoroSession.end_time >= one_hour_ago
-    ).count()
+    count = (await db.execute(
+        select(func.count(models.PomodoroSession.id)).where(
+            models.PomodoroSession.user_id == current_user.id,
+            models.PomodoroSession.end_time >= one_hour_ago
+        )
+    )).scalar_one()
 
     return {"active_sessions": count}
 # --- END FUNCTION ---
\ No newline at end of file
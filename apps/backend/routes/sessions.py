@@ -1,9 +1,16 @@
 # backend/routers/sessions.py
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session,joinedload
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from typing import Optional
 # Note the relative imports to work with our organized structure
-import schema, models, security
-from database import get_db
+import schema, models, security, rollups
+from database import get_async_db
+from response_cache import conditional_get, data_versions
+from pagination import MAX_PAGE_SIZE, finish_page, keyset_page
+from routes.tasks import SESSION_RESPONSE_OPTIONS, load_task_for_response
+import routes.ml_endpoint as ml_endpoints
 
 router = APIRouter(
     prefix="/sessions",
@@ -11,11 +18,11 @@ router = APIRouter(
 )
 
 @router.post("/{task_id}/complete", response_model=schema.Task)
-def complete_task_and_log_session(
+async def complete_task_and_log_session(
     task_id: int,
     session_data: schema.StudySessionCreate,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(security.get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: security.Principal = Depends(security.get_current_user)
 ):
     """
     Mark a task as complete and log the study session data.
@@ -23,10 +30,12 @@ def complete_task_and_log_session(
     """
     # 1. Find the task and verify it belongs to the logged-in user.
     # This is a critical security check.
-    task = db.query(models.Task).filter(
-        models.Task.id == task_id,
-        models.Task.user_id == current_user.id
-    ).first()
+    task = (await db.execute(
+        select(models.Task).where(
+            models.Task.id == task_id,
+            models.Task.user_id == current_user.id
+        )
+    )).scalars().first()
 
     if not task:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
@@ -41,38 +50,49 @@ def complete_task_and_log_session(
         user_id=current_user.id
     )
     db.add(new_session)
+    # Same transaction: the dashboards read the daily rollup, not raw history
+    await rollups.record_study_session(db, new_session, task.subject_id)
 
     # 3. Update the task's status from "pending" to "complete".
     task.status = "complete"
     
     # 4. Commit all changes to the database.
-    db.commit()
-    db.refresh(task)
+    await db.commit()
+    data_versions.bump(current_user.id, "sessions", "tasks")
+    # The session changes its subject's and user's averages in the prediction features
+    ml_endpoints.invalidate_feature_stats([task.subject_id], [current_user.id])
     
-    return task
+    return await load_task_for_response(db, task.id)
 
 
 # Add this new function to apps/backend/routers/sessions.py
 
-@router.get("/", response_model=list[schema.StudySession])
-def get_session_history(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(security.get_current_user),
-    skip: int = 0,
-    limit: int = 100
+@router.get("/", response_model=list[schema.StudySession],
+            dependencies=[Depends(conditional_get("sessions", "tasks", "subjects", "predictions"))])
+async def get_session_history(
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: security.Principal = Depends(security.get_current_user),
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    completed_after: Optional[datetime] = None,
+    completed_before: Optional[datetime] = None
 ):
     """
-    Retrieve all past study sessions for the logged-in user.
+    Retrieve the logged-in user's past study sessions, newest first, one page
+    at a time (pass the X-Next-Cursor header back as ?cursor=).
     """
-    sessions = (
-        db.query(models.StudySession)
-        .filter(models.StudySession.user_id == current_user.id)
-        .options(
-            joinedload(models.StudySession.task).joinedload(models.Task.subject)
-        )
-        .order_by(models.StudySession.completed_at.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
+    stmt = (
+        select(models.StudySession)
+        .where(models.StudySession.user_id == current_user.id)
+        .options(*SESSION_RESPONSE_OPTIONS)
     )
-    return sessions
\ No newline at end of file
+    if completed_after is not None:
+        stmt = stmt.where(models.StudySession.completed_at >= completed_after)
+    if completed_before is not None:
+        stmt = stmt.where(models.StudySession.completed_at < completed_before)
+
+    sessions = (await db.execute(
+        keyset_page(stmt, models.StudySession.completed_at, models.StudySession.id, cursor, limit, descending=True)
+    )).scalars().all()
+    return finish_page(sessions, limit, response, "completed_at")
\ No newline at end of file
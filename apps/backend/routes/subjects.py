@@ -1,10 +1,12 @@
 # backend/routers/subjects.py
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select
 from typing import List
 
 import schema, models, security
-from database import get_db
+from database import get_async_db
+from response_cache import cached_per_user, conditional_get, data_versions
 
 # All routes in this file will start with /subjects.
 # In docs (Swagger UI), these endpoints will appear under the tag Subjects.
@@ -12,54 +14,38 @@ router = APIRouter(
     prefix="/subjects",
     tags=["Subjects"]
 )
-# Depends(get_db) → gives you a database session.
-# Depends(security.get_current_user) → gives you the logged-in user.
+# Depends(get_async_db) → gives you a database session.
+# Depends(security.get_current_user) → gives you the logged-in user (id + username, from the token).
 @router.post("/", response_model=schema.Subject, status_code=status.HTTP_201_CREATED)
-def create_subject(
+async def create_subject(
     subject: schema.SubjectCreate, 
-    db: Session = Depends(get_db), 
-    current_user: models.User = Depends(security.get_current_user)
+    db: AsyncSession = Depends(get_async_db), 
+    current_user: security.Principal = Depends(security.get_current_user)
 ):
     new_subject = models.Subject(**subject.model_dump(), user_id=current_user.id)
     db.add(new_subject)
-    db.commit()
-    db.refresh(new_subject)
+    await db.commit()
+    data_versions.bump(current_user.id, "subjects")
+    await db.refresh(new_subject)
     return new_subject
 
-@router.get("/", response_model=List[schema.Subject])
-def get_all_subjects(
-    db: Session = Depends(get_db), 
-    current_user: models.User = Depends(security.get_current_user)
+@router.get("/", response_model=List[schema.Subject], dependencies=[Depends(conditional_get("subjects"))])
+async def get_all_subjects(
+    db: AsyncSession = Depends(get_async_db), 
+    current_user: security.Principal = Depends(security.get_current_user)
 ):
-    subjects = db.query(models.Subject).filter(models.Subject.user_id == current_user.id).all()
+    subjects = (await db.execute(
+        select(models.Subject).where(models.Subject.user_id == current_user.id)
+    )).scalars().all()
     return subjects
 
 
 @router.get("/{subject_id}", response_model=schema.Subject)
-def get_single_subject(
+async def get_single_subject(
     subject_id: int,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(security.get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: security.Principal = Depends(security.get_current_user)
 ):
-    # --- START OF DEBUGGING CODE ---
-    print(f"\n--- DEBUGGING: get_single_subject ---")
-    print(f"Requested subject_id: {subject_id} (Type: {type(subject_id)})")
-    print(f"Current user_id: {current_user.id} (Type: {type(current_user.id)})")
-    print(f"Current user email: {current_user.email}")
-    
-    # Check if subject exists at all (regardless of user)
-    subject_exists = db.query(models.Subject).filter(models.Subject.id == subject_id).first()
-    if subject_exists:
-        print(f"Subject {subject_id} exists, belongs to user_id: {subject_exists.user_id}")
-        if subject_exists.user_id != current_user.id:
-            print("ERROR: Subject belongs to different user!")
-        else:
-            print("SUCCESS: Subject belongs to current user")
-    else:
-        print(f"ERROR: Subject {subject_id} does not exist in database")
-    print("--- END DEBUGGING ---\n")
-    # --- END OF DEBUGGING CODE ---
-
     # Validate subject_id is positive
     if subject_id <= 0:
         raise HTTPException(
@@ -68,14 +54,18 @@ def get_single_subject(
         )
 
     # Query for the subject
-    subject = db.query(models.Subject).filter(
-        models.Subject.id == subject_id,
-        models.Subject.user_id == current_user.id
-    ).first()
+    subject = (await db.execute(
+        select(models.Subject).where(
+            models.Subject.id == subject_id,
+            models.Subject.user_id == current_user.id
+        )
+    )).scalars().first()
 
     if not subject:
         # More specific error messages
-        subject_exists = db.query(models.Subject).filter(models.Subject.id == subject_id).first()
+        subject_exists = (await db.execute(
+            select(models.Subject).where(models.Subject.id == subject_id)
+        )).scalars().first()
         if subject_exists:
             # Subject exists but belongs to different user
             raise HTTPException(
@@ -93,50 +83,61 @@ def get_single_subject(
 
 # --- YEH NAYA FUNCTION PASTE KAREIN ---
 @router.get("/{subject_id}/summary", response_model=schema.SubjectSummary)
-def get_subject_summary(
+@cached_per_user("subjects.summary")
+async def get_subject_summary(
     subject_id: int,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(security.get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: security.Principal = Depends(security.get_current_user)
 ):
     """
     Calculates and returns a summary of statistics for a specific subject.
     """
     # Security check: Make sure the subject belongs to the current user
-    subject = db.query(models.Subject).filter(
-        models.Subject.id == subject_id,
-        models.Subject.user_id == current_user.id
-    ).first()
+    subject = (await db.execute(
+        select(models.Subject).where(
+            models.Subject.id == subject_id,
+            models.Subject.user_id == current_user.id
+        )
+    )).scalars().first()
 
     if not subject:
         raise HTTPException(status_code=404, detail="Subject not found")
 
     # Calculate completed tasks
-    completed_tasks = db.query(models.Task).filter(
-        models.Task.subject_id == subject_id,
-        models.Task.status == 'complete'
-    ).count()
+    completed_tasks = (await db.execute(
+        select(func.count(models.Task.id)).where(
+            models.Task.subject_id == subject_id,
+            models.Task.status == 'complete'
+        )
+    )).scalar_one()
 
     # Calculate pending tasks
-    pending_tasks_query = db.query(models.Task).filter(
-        models.Task.subject_id == subject_id,
-        models.Task.status == 'pending'
-    )
-
-    pending_tasks_list = pending_tasks_query.all()
-    pending_tasks_count = len(pending_tasks_list)
+    pending_tasks_count = (await db.execute(
+        select(func.count(models.Task.id)).where(
+            models.Task.subject_id == subject_id,
+            models.Task.status == 'pending'
+        )
+    )).scalar_one()
 
     total_tasks = completed_tasks + pending_tasks_count
     completion_rate = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
 
-    # Calculate average times for PENDING tasks only
+    # Calculate average times for PENDING tasks only. Predicted time comes
+    # from the persisted task_predictions rows (estimate where none exists yet)
     avg_estimated_time = 0
+    avg_predicted_time = 0
     if pending_tasks_count > 0:
-        total_est_time = sum(task.estimated_time for task in pending_tasks_list)
-        avg_estimated_time = round(total_est_time / pending_tasks_count)
-
-    # NOTE: Avg predicted time requires fetching predictions. For now, we'll simulate it.
-    # A full implementation would call the prediction model here.
-    avg_predicted_time = round(avg_estimated_time * 1.1) # Simulate AI predicting 10% more time
+        avg_estimated, avg_predicted = (await db.execute(
+            select(
+                func.avg(models.Task.estimated_time),
+                func.avg(func.coalesce(models.TaskPrediction.predicted_time, models.Task.estimated_time))
+            ).select_from(models.Task).outerjoin(models.TaskPrediction).where(
+                models.Task.subject_id == subject_id,
+                models.Task.status == 'pending'
+            )
+        )).one()
+        avg_estimated_time = round(avg_estimated or 0)
+        avg_predicted_time = round(avg_predicted or 0)
 
     return schema.SubjectSummary(
         completed_tasks=completed_tasks,
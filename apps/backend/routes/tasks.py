@@ -1,10 +1,15 @@
 # backend/routers/tasks.py
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session, joinedload
-from typing import List
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from typing import List, Optional
 from datetime import timedelta, datetime
 import schema, models, security
-from database import get_db
+from database import get_async_db
+from response_cache import conditional_get, data_versions
+from pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, finish_page, keyset_page
+import routes.ml_endpoint as ml_endpoints
 
 # All endpoints here will start with /tasks.
 # In FastAPI docs (Swagger UI), these routes will show under the Tasks section.
@@ -13,63 +18,121 @@ router = APIRouter(
     tags=["Tasks"]
 )
 
+# schema.Task serializes task.subject and task.predicted_time. AsyncSession
+# cannot lazy load (and the relationships are raise_on_sql), so every query
+# that returns tasks loads both up front, in the same SELECT.
+TASK_RESPONSE_OPTIONS = (joinedload(models.Task.subject), joinedload(models.Task.prediction))
+
+# Same for schema.StudySession, which embeds the full schema.Task
+_SESSION_TASK = joinedload(models.StudySession.task)
+SESSION_RESPONSE_OPTIONS = (
+    _SESSION_TASK.joinedload(models.Task.subject),
+    _SESSION_TASK.joinedload(models.Task.prediction),
+)
+
+async def load_task_for_response(db: AsyncSession, task_id: int) -> models.Task:
+    """Re-read a task (e.g. after a commit) with the relationships schema.Task needs"""
+    return (await db.execute(
+        select(models.Task)
+        .where(models.Task.id == task_id)
+        .options(*TASK_RESPONSE_OPTIONS)
+        .execution_options(populate_existing=True)
+    )).scalar_one()
+
+def filter_tasks(stmt, task_status: Optional[schema.TaskStatus], task_type: Optional[schema.TaskType],
+                 due_after: Optional[datetime], due_before: Optional[datetime]):
+    """Optional list filters shared by the task listings"""
+    if task_status is not None:
+        stmt = stmt.where(models.Task.status == task_status.value)
+    if task_type is not None:
+        stmt = stmt.where(models.Task.task_type == task_type.value)
+    if due_after is not None:
+        stmt = stmt.where(models.Task.deadline >= due_after)
+    if due_before is not None:
+        stmt = stmt.where(models.Task.deadline < due_before)
+    return stmt
+
 @router.get("/rescheduled", response_model=List[schema.Task])
-def get_rescheduled_tasks(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(security.get_current_user)
+async def get_rescheduled_tasks(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: security.Principal = Depends(security.get_current_user)
 ):
     """
     Fetches all pending tasks that are scheduled for future review
     for the logged-in user.
     """
     # Yeh query sirf un tasks ko dhoondhegi jinka type 'review' hai
-    rescheduled_tasks = db.query(models.Task).filter(
-    models.Task.user_id == current_user.id,
-    models.Task.status == 'pending',
-    models.Task.task_type == 'review'
-).options(joinedload(models.Task.subject)).order_by(models.Task.deadline.asc()).all()
+    rescheduled_tasks = (await db.execute(
+        select(models.Task).where(
+            models.Task.user_id == current_user.id,
+            models.Task.status == 'pending',
+            models.Task.task_type == 'review'
+        ).options(*TASK_RESPONSE_OPTIONS).order_by(models.Task.deadline.asc())
+    )).scalars().all()
 
     return rescheduled_tasks
 # --- YAHAN TAK PASTE KAREIN ---
 # . Create a Task for a Subject
 
-@router.get("/", response_model=List[schema.Task])
-def get_all_user_tasks(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(security.get_current_user)
+@router.get("/", response_model=List[schema.Task],
+            dependencies=[Depends(conditional_get("tasks", "subjects", "predictions"))])
+async def get_all_user_tasks(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    task_status: Optional[schema.TaskStatus] = Query(None, alias="status"),
+    task_type: Optional[schema.TaskType] = None,
+    due_after: Optional[datetime] = None,
+    due_before: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: security.Principal = Depends(security.get_current_user)
 ):
     """
-    Fetches all tasks for the logged-in user, across all subjects.
+    Fetches the logged-in user's tasks across all subjects, oldest first,
+    one page at a time (pass the X-Next-Cursor header back as ?cursor=).
     This is used to populate the Kanban board.
     """
-    tasks = db.query(models.Task).filter(models.Task.user_id == current_user.id).all()
-    return tasks
+    stmt = filter_tasks(
+        select(models.Task).where(models.Task.user_id == current_user.id),
+        task_status, task_type, due_after, due_before
+    ).options(*TASK_RESPONSE_OPTIONS)
+    tasks = (await db.execute(
+        keyset_page(stmt, models.Task.created_at, models.Task.id, cursor, limit)
+    )).scalars().all()
+    return finish_page(tasks, limit, response, "created_at")
 
 
 @router.patch("/{task_id}/status", response_model=schema.Task)
-def update_task_status(
+async def update_task_status(
     task_id: int,
     status_update: schema.TaskStatusUpdate,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(security.get_current_user)
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: security.Principal = Depends(security.get_current_user)
 ):
     """
     Update the status of a single task (e.g., from 'pending' to 'in_progress').
     This will be used by the Kanban board drag-and-drop.
     """
-    task = db.query(models.Task).filter(
-        models.Task.id == task_id,
-        models.Task.user_id == current_user.id
-    ).first()
+    task = (await db.execute(
+        select(models.Task).where(
+            models.Task.id == task_id,
+            models.Task.user_id == current_user.id
+        ).options(*TASK_RESPONSE_OPTIONS)
+    )).scalars().first()
 
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
 
-    # Update the status, commit to the database, and refresh
+    # Update the status and commit to the database
     task.status = status_update.status
-    db.commit()
-    db.refresh(task)
-    
+    await db.commit()
+    data_versions.bump(current_user.id, "tasks")
+
+    # A task moved back to an open state may not have a prediction yet
+    if task.status != "complete" and task.prediction is None:
+        background_tasks.add_task(ml_endpoints.refresh_task_predictions, [task.id])
+
     return task
 
 # Add this new function to apps/backend/routers/tasks.py
@@ -77,19 +140,22 @@ def update_task_status(
 
 # --- REPLACE THE OLD FUNCTION WITH THIS ONE ---
 @router.post("/{task_id}/reschedule", response_model=schema.Task)
-def reschedule_task_for_revision(
+async def reschedule_task_for_revision(
     task_id: int,
     reschedule_data: schema.RescheduleRequest, # <-- THE CHANGE: Accept new data
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(security.get_current_user)
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: security.Principal = Depends(security.get_current_user)
 ):
     """
     Creates a new, pending task to revise a completed task after a specified number of days.
     """
-    original_task = db.query(models.Task).filter(
-        models.Task.id == task_id,
-        models.Task.user_id == current_user.id
-    ).first()
+    original_task = (await db.execute(
+        select(models.Task).where(
+            models.Task.id == task_id,
+            models.Task.user_id == current_user.id
+        )
+    )).scalars().first()
 
     if not original_task:
         raise HTTPException(status_code=404, detail="Original task not found")
@@ -100,7 +166,7 @@ def reschedule_task_for_revision(
     new_revision_task = models.Task(
         title=f"Revise: {original_task.title}",
         estimated_time=original_task.estimated_time,
-        deadline=new_deadline, 
+        deadline=new_deadline,
         status="pending",
         subject_id=original_task.subject_id,
         user_id=current_user.id,
@@ -108,54 +174,77 @@ def reschedule_task_for_revision(
     )
 
     db.add(new_revision_task)
-    db.commit()
-    db.refresh(new_revision_task)
+    await db.commit()
+    data_versions.bump(current_user.id, "tasks")
+
+    # Predict off the request path; readers pick it up from task_predictions
+    background_tasks.add_task(ml_endpoints.refresh_task_predictions, [new_revision_task.id])
 
-    return new_revision_task
+    return await load_task_for_response(db, new_revision_task.id)
 
 # --- PURAANA create_task... function ISSE REPLACE KAREIN ---
 @router.post("/{subject_id}", response_model=schema.Task, status_code=status.HTTP_201_CREATED)
-def create_task_for_subject(
+async def create_task_for_subject(
     subject_id: int,
-    task_data: schema.TaskCreate, 
-    db: Session = Depends(get_db), 
-    current_user: models.User = Depends(security.get_current_user)
+    task_data: schema.TaskCreate,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: security.Principal = Depends(security.get_current_user)
 ):
     # Security check
-    subject = db.query(models.Subject).filter(
-        models.Subject.id == subject_id, 
-        models.Subject.user_id == current_user.id
-    ).first()
+    subject = (await db.execute(
+        select(models.Subject).where(
+            models.Subject.id == subject_id,
+            models.Subject.user_id == current_user.id
+        )
+    )).scalars().first()
 
     if not subject:
         raise HTTPException(status_code=404, detail="Subject not found or you don't have permission.")
 
     new_task = models.Task(
-        **task_data.model_dump(), 
-        subject_id=subject_id, 
+        **task_data.model_dump(),
+        subject_id=subject_id,
         user_id=current_user.id
     )
     db.add(new_task)
-    db.commit()
-    db.refresh(new_task)
-    return new_task
+    await db.commit()
+    data_versions.bump(current_user.id, "tasks")
+
+    # Predict off the request path; readers pick it up from task_predictions
+    background_tasks.add_task(ml_endpoints.refresh_task_predictions, [new_task.id])
+    return await load_task_for_response(db, new_task.id)
 # --- YAHAN TAK REPLACE KAREIN ---
 
 @router.get("/{subject_id}", response_model=List[schema.Task])
-def get_tasks_for_subject(
+async def get_tasks_for_subject(
     subject_id: int,
-    db: Session = Depends(get_db), 
-    current_user: models.User = Depends(security.get_current_user)
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    task_status: Optional[schema.TaskStatus] = Query(None, alias="status"),
+    task_type: Optional[schema.TaskType] = None,
+    due_after: Optional[datetime] = None,
+    due_before: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: security.Principal = Depends(security.get_current_user)
 ):
     # Verify the subject belongs to the current user before showing tasks
-    subject = db.query(models.Subject).filter(
-        models.Subject.id == subject_id, 
-        models.Subject.user_id == current_user.id
-    ).first()
+    subject = (await db.execute(
+        select(models.Subject).where(
+            models.Subject.id == subject_id,
+            models.Subject.user_id == current_user.id
+        )
+    )).scalars().first()
 
     if not subject:
         raise HTTPException(status_code=404, detail="Subject not found")
 
-    tasks = db.query(models.Task).filter(models.Task.subject_id == subject_id).all()
-    return tasks
-
+    stmt = filter_tasks(
+        select(models.Task).where(models.Task.subject_id == subject_id),
+        task_status, task_type, due_after, due_before
+    ).options(*TASK_RESPONSE_OPTIONS)
+    tasks = (await db.execute(
+        keyset_page(stmt, models.Task.created_at, models.Task.id, cursor, limit)
+    )).scalars().all()
+    return finish_page(tasks, limit, response, "created_at")
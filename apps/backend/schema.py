@@ -61,6 +61,11 @@ class UserLogin(BaseModel):
 class Token(BaseModel):
     access_token: str
     token_type: str
+    # Opaque, single-use: trade it at /auth/refresh for a new access token
+    refresh_token: Optional[str] = None
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
 
 # --- Subject Schemas ---
 class SubjectBase(BaseModel):
@@ -104,6 +109,7 @@ class Task(TaskBase):
     status: TaskStatus
     created_at: datetime
     subject: Optional[Subject] = None
+    predicted_time: Optional[int] = None  # Persisted ML prediction, None until computed
     
     class Config:
         from_attributes = True
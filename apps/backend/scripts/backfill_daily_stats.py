@@ -0,0 +1,37 @@
+"""
+Rebuild the user_daily_stats / user_daily_subject_stats rollups from the raw
+study_sessions and pomodoro_sessions history.
+
+The API keeps the rollups current on every write; run this after importing
+data behind its back (e.g. scripts/data_generator.py) or to repair drift:
+
+    python scripts/backfill_daily_stats.py             # every user
+    python scripts/backfill_daily_stats.py --user-id 3
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path to allow sibling imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from database import engine
+from rollups import backfill_daily_stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--user-id", type=int, default=None, help="Only rebuild this user's rollups")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    # One transaction: readers never see a half-rebuilt rollup
+    with engine.begin() as conn:
+        rows = backfill_daily_stats(conn, args.user_id)
+    scope = f"user {args.user_id}" if args.user_id is not None else "all users"
+    print(f"✅ Rebuilt {rows} daily rollup rows for {scope} in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
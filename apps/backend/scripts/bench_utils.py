@@ -0,0 +1,63 @@
+# Small stdlib-only HTTP helpers shared by the load-test / benchmark scripts.
+# They talk to a running server (e.g. ./run.sh) so the numbers include the
+# real uvicorn event loop and connection handling.
+import json
+import time
+import urllib.error
+import urllib.request
+from typing import Dict, List, Optional, Tuple
+
+
+def request(method: str, url: str, token: Optional[str] = None, body: Optional[Dict] = None,
+            headers: Optional[Dict] = None, timeout: float = 30) -> Tuple[int, float, bytes]:
+    """Send one request and return (status, seconds, body)"""
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(url, data=data, method=method)
+    req.add_header("Content-Type", "application/json")
+    if token:
+        req.add_header("Authorization", f"Bearer {token}")
+    for name, value in (headers or {}).items():
+        req.add_header(name, value)
+
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as response:
+            payload = response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        payload = e.read()
+        status = e.code
+    except (urllib.error.URLError, TimeoutError, ConnectionError):
+        payload = b""
+        status = 0
+    return status, time.perf_counter() - started, payload
+
+
+def login(base_url: str, username: str, password: str) -> str:
+    status, _, payload = request("POST", f"{base_url}/auth/login", body={"username": username, "password": password})
+    if status != 200:
+        raise SystemExit(f"Login failed ({status}): {payload[:200]!r}")
+    return json.loads(payload)["access_token"]
+
+
+def percentile(values: List[float], p: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+
+def summarize(label: str, latencies: List[float], elapsed: Optional[float] = None) -> Dict[str, float]:
+    summary = {
+        "requests": len(latencies),
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "max_ms": max(latencies) * 1000 if latencies else 0.0,
+    }
+    line = (f"{label:<32} n={summary['requests']:<6} p50={summary['p50_ms']:8.2f} ms  "
+            f"p99={summary['p99_ms']:8.2f} ms  max={summary['max_ms']:8.2f} ms")
+    if elapsed:
+        summary["throughput_rps"] = len(latencies) / elapsed
+        line += f"  {summary['throughput_rps']:8.1f} req/s"
+    print(line)
+    return summary
@@ -0,0 +1,186 @@
+"""
+Benchmark: database time of /analytics/summary, legacy vs single round trip.
+
+Seeds one throwaway user with a realistic amount of history (default: two
+years of daily study), then times the summary's database work both ways:
+
+  legacy  → the previous eight sequential queries over raw study_sessions /
+            pomodoro_sessions history (kept below as the baseline)
+  single  → routes.analytics.SUMMARY_SQL, one CTE query over the daily rollups
+
+Everything runs in one transaction that is rolled back at the end, so the
+database is left untouched.
+
+    python scripts/benchmark_analytics_summary.py --sessions 5000 --pomodoros 10000
+"""
+import argparse
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add parent directory to path to allow sibling imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import Date, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import models
+from database import async_engine
+from rollups import backfill_daily_stats
+from routes.analytics import SUMMARY_SQL
+from scripts.bench_utils import summarize
+
+
+# --- Previous (one query per section) implementation, kept here as the baseline ---
+
+async def legacy_summary_queries(db: AsyncSession, user_id: int):
+    today = datetime.utcnow().date()
+    seven_days_ago = today - timedelta(days=6)
+    results = []
+    results.append((await db.execute(
+        select(
+            models.Subject.name,
+            func.sum(models.StudySession.actual_duration),
+            func.count(models.StudySession.id),
+            func.avg(models.StudySession.actual_duration)
+        ).select_from(models.StudySession).join(models.Task).join(models.Subject).where(
+            models.Subject.user_id == user_id
+        ).group_by(models.Subject.name)
+    )).all())
+    results.append((await db.execute(
+        select(func.count(models.Task.id)).join(models.StudySession).where(
+            models.Task.user_id == user_id,
+            func.cast(models.StudySession.completed_at, Date) == today
+        )
+    )).scalar())
+    results.append((await db.execute(
+        select(func.count(models.Task.id)).where(
+            models.Task.user_id == user_id, models.Task.status == 'pending'
+        )
+    )).scalar())
+    results.append((await db.execute(
+        select(func.sum(models.PomodoroSession.duration)).where(
+            models.PomodoroSession.user_id == user_id,
+            func.cast(models.PomodoroSession.start_time, Date) == today
+        )
+    )).scalar())
+    results.append((await db.execute(
+        select(
+            func.cast(models.StudySession.completed_at, Date).label("study_day"),
+            func.sum(models.StudySession.actual_duration)
+        ).where(
+            models.StudySession.user_id == user_id,
+            func.cast(models.StudySession.completed_at, Date) >= seven_days_ago
+        ).group_by("study_day")
+    )).all())
+    results.append((await db.execute(
+        select(models.Subject.name, func.count(models.Task.id))
+        .join(models.Task, models.Subject.id == models.Task.subject_id)
+        .where(models.Subject.user_id == user_id)
+        .group_by(models.Subject.name).order_by(func.count(models.Task.id).desc())
+    )).all())
+    results.append((await db.execute(
+        select(func.count(models.PomodoroSession.id)).where(models.PomodoroSession.user_id == user_id)
+    )).scalar())
+    results.append((await db.execute(
+        select(func.avg(models.StudySession.user_difficulty_rating)).where(
+            models.StudySession.user_id == user_id
+        )
+    )).scalar())
+    return results
+
+
+async def single_summary_query(db: AsyncSession, user_id: int):
+    today = datetime.utcnow().date()
+    return (await db.execute(SUMMARY_SQL, {"user_id": user_id, "week_start": today - timedelta(days=6)})).one()
+
+
+# --- Synthetic history ---
+
+SEED_STATEMENTS = [
+    """
+    INSERT INTO subjects (name, user_id, created_at, date, color_tag)
+    SELECT 'Bench subject ' || g, :user_id, now(), now(), '#3B82F6'
+    FROM generate_series(1, :subjects) g
+    """,
+    """
+    INSERT INTO tasks (title, estimated_time, deadline, status, subject_id, user_id, created_at, task_type)
+    SELECT 'Bench task ' || g, 20 + g % 90, now() + (g % 30) * interval '1 day',
+           CASE WHEN g % 5 = 0 THEN 'pending' ELSE 'complete' END,
+           (SELECT array_agg(id) FROM subjects WHERE user_id = :user_id)[1 + g % :subjects],
+           :user_id, now(), 'general'
+    FROM generate_series(1, :tasks) g
+    """,
+    """
+    INSERT INTO study_sessions (task_id, user_id, actual_duration, user_difficulty_rating, completed_at)
+    SELECT (SELECT array_agg(id) FROM tasks WHERE user_id = :user_id)[1 + g % :tasks],
+           :user_id, 15 + g % 100, 1 + g % 5, now() - random() * :days * interval '1 day'
+    FROM generate_series(1, :sessions) g
+    """,
+    """
+    INSERT INTO pomodoro_sessions (start_time, end_time, duration, user_id)
+    SELECT t, t + interval '25 minutes', 25, :user_id
+    FROM (SELECT now() - random() * :days * interval '1 day' AS t FROM generate_series(1, :pomodoros)) p
+    """,
+]
+
+
+async def seed_user(db: AsyncSession, args) -> int:
+    suffix = int(time.time() * 1000)
+    user_id = (await db.execute(text(
+        "INSERT INTO users (username, email, password_hash, created_at, timezone) "
+        "VALUES (:username, :email, 'x', now(), 'UTC') RETURNING id"
+    ), {"username": f"bench_{suffix}", "email": f"bench_{suffix}@example.com"})).scalar_one()
+    params = {"user_id": user_id, "subjects": args.subjects, "tasks": args.tasks, "sessions": args.sessions,
+              "pomodoros": args.pomodoros, "days": args.days}
+    for statement in SEED_STATEMENTS:
+        await db.execute(text(statement), {name: params[name] for name in params if f":{name}" in statement})
+    connection = await db.connection()
+    await connection.run_sync(lambda sync_conn: backfill_daily_stats(sync_conn, user_id))
+    await db.execute(text("ANALYZE subjects, tasks, study_sessions, pomodoro_sessions, user_daily_stats, user_daily_subject_stats"))
+    return user_id
+
+
+async def bench(label: str, fn, db: AsyncSession, user_id: int, iterations: int):
+    for _ in range(3):  # warm up plans and caches
+        await fn(db, user_id)
+    latencies = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await fn(db, user_id)
+        latencies.append(time.perf_counter() - started)
+    return summarize(label, latencies)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--subjects", type=int, default=12)
+    parser.add_argument("--tasks", type=int, default=3000)
+    parser.add_argument("--sessions", type=int, default=5000)
+    parser.add_argument("--pomodoros", type=int, default=10000)
+    parser.add_argument("--days", type=int, default=730)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    async with async_engine.connect() as conn:
+        transaction = await conn.begin()
+        try:
+            db = AsyncSession(bind=conn)
+            started = time.perf_counter()
+            user_id = await seed_user(db, args)
+            print(f"Seeded {args.sessions} study sessions / {args.pomodoros} pomodoros over {args.days} days "
+                  f"in {time.perf_counter() - started:.1f}s\n")
+
+            legacy = await bench("legacy (8 queries, raw history)", legacy_summary_queries, db, user_id, args.iterations)
+            single = await bench("single CTE query (rollups)", single_summary_query, db, user_id, args.iterations)
+            print(f"\np50 speed-up: x{legacy['p50_ms'] / single['p50_ms']:.1f}, "
+                  f"p99 speed-up: x{legacy['p99_ms'] / single['p99_ms']:.1f}")
+        finally:
+            await transaction.rollback()
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
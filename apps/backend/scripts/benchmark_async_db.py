@@ -0,0 +1,103 @@
+"""
+Throughput of the CRUD/analytics routers under many concurrent clients.
+
+Each client is a thread that loops over a mix of read endpoints for a fixed
+duration. Pass one --url per server to compare them under the same load,
+e.g. the previous sync-session build on :8001 and the AsyncSession build
+on :8000:
+
+    git worktree add /tmp/sync-build <commit before the async port>
+    (cd /tmp/sync-build/apps/backend && uvicorn app:app --port 8001) &
+    uvicorn app:app --port 8000 &
+    python scripts/benchmark_async_db.py --url http://localhost:8001 --url http://localhost:8000 --clients 500
+"""
+import argparse
+import itertools
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add parent directory to path to allow sibling imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from scripts.bench_utils import login, request, summarize
+
+ENDPOINTS = [
+    "/tasks/",
+    "/subjects/",
+    "/sessions/?limit=20",
+    "/notifications/",
+    "/analytics/summary",
+    "/history/summary",
+    "/pomodoro/recent-count",
+]
+
+
+def client(base_url: str, token: str, offset: int, deadline: float, start: threading.Event, results: list):
+    latencies, errors = [], 0
+    paths = itertools.cycle(ENDPOINTS[offset % len(ENDPOINTS):] + ENDPOINTS[:offset % len(ENDPOINTS)])
+    start.wait()
+    while time.perf_counter() < deadline:
+        status, seconds, _ = request("GET", f"{base_url}{next(paths)}", token, timeout=60)
+        if status == 200:
+            latencies.append(seconds)
+        else:
+            errors += 1
+    results.append((latencies, errors))
+
+
+def run(base_url: str, token: str, clients: int, duration: float):
+    start = threading.Event()
+    results = []
+    deadline = time.perf_counter() + duration + 5  # thread start-up is not measured
+    threads = [
+        threading.Thread(target=client, args=(base_url, token, i, deadline, start, results), daemon=True)
+        for i in range(clients)
+    ]
+    for thread in threads:
+        thread.start()
+
+    # Give every client its full window once they are all waiting
+    time.sleep(5)
+    started = time.perf_counter()
+    start.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies = [latency for client_latencies, _ in results for latency in client_latencies]
+    errors = sum(client_errors for _, client_errors in results)
+    summary = summarize(f"{base_url} ({clients} clients)", latencies, elapsed)
+    summary["errors"] = errors
+    print(f"{'':<32} errors={errors}")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", action="append", help="Server to benchmark (repeat to compare)")
+    parser.add_argument("--username", default="user1")
+    parser.add_argument("--password", default="password123")
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--duration", type=float, default=30)
+    args = parser.parse_args()
+
+    urls = args.url or ["http://localhost:8000"]
+    summaries = {}
+    for base_url in urls:
+        token = login(base_url, args.username, args.password)
+        request("GET", f"{base_url}/tasks/", token)  # warm up connections and caches
+        summaries[base_url] = run(base_url, token, args.clients, args.duration)
+
+    if len(urls) > 1:
+        baseline = summaries[urls[0]]
+        print("\n=== Relative to", urls[0], "===")
+        for base_url in urls[1:]:
+            summary = summaries[base_url]
+            print(f"{base_url}: throughput x{summary['throughput_rps'] / baseline['throughput_rps']:.2f}, "
+                  f"p99 x{summary['p99_ms'] / baseline['p99_ms']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
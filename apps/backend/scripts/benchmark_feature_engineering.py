@@ -0,0 +1,174 @@
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import LabelEncoder
+
+# Add parent directory to path to allow sibling imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from ml.feature_engineering import FeatureEngineer
+
+NUM_SUBJECTS = 500
+NUM_USERS = 100
+TRAINING_ROWS = 1_000_000
+TASK_COUNTS = [1, 100, 10_000]
+
+
+# --- Previous (row-by-row) implementation, kept here as the baseline ---
+
+def legacy_training_pipeline(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+    df['completed_at'] = pd.to_datetime(df['completed_at'])
+    df['due_date'] = pd.to_datetime(df['due_date'])
+    df['hour_of_day'] = df['completed_at'].dt.hour
+    df['day_of_week'] = df['completed_at'].dt.dayofweek
+    df['is_weekend'] = (df['day_of_week'] >= 5).astype(int)
+    df['month'] = df['completed_at'].dt.month
+
+    def categorize_time_of_day(hour):
+        if 6 <= hour < 12:
+            return 'morning'
+        elif 12 <= hour < 17:
+            return 'afternoon'
+        elif 17 <= hour < 21:
+            return 'evening'
+        else:
+            return 'night'
+
+    df['time_of_day_category'] = df['hour_of_day'].apply(categorize_time_of_day)
+    df['days_until_due'] = (df['due_date'] - df['completed_at']).dt.days
+
+    df = df.copy()
+    subject_difficulty = df.groupby('subject_id')['user_difficulty_rating'].mean()
+    df['subject_avg_difficulty'] = df['subject_id'].map(subject_difficulty)
+    df['time_ratio'] = df['actual_duration'] / df['estimated_time']
+    subject_time_ratio = df.groupby('subject_id')['time_ratio'].mean()
+    df['subject_avg_time_ratio'] = df['subject_id'].map(subject_time_ratio)
+
+    df = df.copy()
+    user_stats = df.groupby('user_id').agg({
+        'actual_duration': 'mean',
+        'user_difficulty_rating': 'mean',
+        'time_ratio': 'mean'
+    }).rename(columns={
+        'actual_duration': 'user_avg_duration',
+        'user_difficulty_rating': 'user_avg_difficulty',
+        'time_ratio': 'user_avg_time_ratio'
+    })
+    return df.merge(user_stats, left_on='user_id', right_index=True, how='left')
+
+
+def legacy_prediction_features(tasks_data, subject_stats, user_stats, encoder) -> pd.DataFrame:
+    df = pd.DataFrame(tasks_data)
+    now = datetime.now()
+    df['hour_of_day'] = now.hour
+    df['day_of_week'] = now.weekday()
+    df['is_weekend'] = int(now.weekday() >= 5)
+    df['due_date'] = pd.to_datetime(df['due_date'])
+    df['days_until_due'] = (df['due_date'] - now).dt.days
+    df['subject_avg_difficulty'] = 3.0
+    df['subject_avg_time_ratio'] = 1.0
+    df['user_avg_time_ratio'] = 1.0
+
+    for idx, row in df.iterrows():
+        if row['subject_id'] in subject_stats:
+            df.at[idx, 'subject_avg_difficulty'] = subject_stats[row['subject_id']]['subject_avg_difficulty']
+            df.at[idx, 'subject_avg_time_ratio'] = subject_stats[row['subject_id']]['subject_avg_time_ratio']
+        if row['user_id'] in user_stats:
+            df.at[idx, 'user_avg_time_ratio'] = user_stats[row['user_id']]['user_avg_time_ratio']
+
+    df['subject_id_encoded'] = -1
+    known_subjects = set(encoder.classes_)
+    for idx, row in df.iterrows():
+        if row['subject_id'] in known_subjects:
+            df.at[idx, 'subject_id_encoded'] = encoder.transform([row['subject_id']])[0]
+
+    return df[FeatureEngineer.PREDICTION_FEATURE_COLUMNS].copy()
+
+
+# --- Synthetic data ---
+
+def make_training_frame(rows: int, rng: np.random.Generator) -> pd.DataFrame:
+    completed_at = pd.Timestamp("2025-01-01") + pd.to_timedelta(rng.integers(0, 180 * 24 * 60, rows), unit="m")
+    estimated = rng.choice([30, 60, 90], rows)
+    return pd.DataFrame({
+        'task_id': np.arange(rows),
+        'actual_duration': (estimated * rng.uniform(0.7, 1.4, rows)).astype(int),
+        'user_difficulty_rating': rng.integers(1, 6, rows),
+        'completed_at': completed_at,
+        'estimated_time': estimated,
+        'due_date': completed_at + pd.to_timedelta(rng.integers(0, 30, rows), unit="D"),
+        'subject_id': rng.integers(1, NUM_SUBJECTS + 1, rows),
+        'user_id': rng.integers(1, NUM_USERS + 1, rows),
+    })
+
+
+def make_tasks(count: int, rng: np.random.Generator):
+    now = datetime.now()
+    return [
+        {
+            'task_id': i,
+            'estimated_time': int(rng.choice([30, 60, 90])),
+            # Some subjects are outside the encoder's classes on purpose
+            'subject_id': int(rng.integers(1, NUM_SUBJECTS + 50)),
+            'due_date': now + timedelta(days=int(rng.integers(0, 30))),
+            'user_id': int(rng.integers(1, NUM_USERS + 1)),
+        }
+        for i in range(count)
+    ]
+
+
+def timed(fn, *args, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    rng = np.random.default_rng(42)
+    engineer = FeatureEngineer(database_url="")
+
+    encoder = LabelEncoder().fit(np.arange(1, NUM_SUBJECTS + 1))
+    engineer.label_encoders['subject_id'] = encoder
+
+    subject_stats = {
+        s: {'subject_avg_difficulty': float(rng.uniform(1, 5)), 'subject_avg_time_ratio': float(rng.uniform(0.7, 1.4))}
+        for s in range(1, NUM_SUBJECTS + 1)
+    }
+    user_stats = {u: {'user_avg_time_ratio': float(rng.uniform(0.7, 1.4))} for u in range(1, NUM_USERS + 1)}
+
+    print("=== PREDICTION FEATURES ===")
+    for count in TASK_COUNTS:
+        tasks = make_tasks(count, rng)
+        legacy = legacy_prediction_features(tasks, subject_stats, user_stats, encoder)
+        vectorized = engineer.build_prediction_features(tasks, subject_stats, user_stats)
+        np.testing.assert_allclose(legacy.to_numpy(dtype=float), vectorized.to_numpy(dtype=float))
+
+        legacy_s = timed(legacy_prediction_features, tasks, subject_stats, user_stats, encoder)
+        vectorized_s = timed(engineer.build_prediction_features, tasks, subject_stats, user_stats)
+        print(f"{count:>6} tasks: legacy {legacy_s * 1000:9.2f} ms | "
+              f"vectorized {vectorized_s * 1000:8.2f} ms | speedup {legacy_s / vectorized_s:6.1f}x")
+
+    print(f"\n=== TRAINING PIPELINE ({TRAINING_ROWS:,} rows) ===")
+    training_df = make_training_frame(TRAINING_ROWS, rng)
+
+    def vectorized_pipeline(df):
+        df = df.copy()  # keep the shared input intact between runs
+        df = engineer.extract_time_features(df)
+        df = engineer.create_subject_features(df)
+        return engineer.create_user_features(df)
+
+    legacy_s = timed(legacy_training_pipeline, training_df, repeat=1)
+    vectorized_s = timed(vectorized_pipeline, training_df, repeat=1)
+    print(f"legacy {legacy_s:6.2f} s | vectorized {vectorized_s:6.2f} s | speedup {legacy_s / vectorized_s:4.1f}x")
+
+
+if __name__ == "__main__":
+    main()
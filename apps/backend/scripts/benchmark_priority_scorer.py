@@ -0,0 +1,190 @@
+"""
+Benchmark: schedule scoring, per-task loop vs vectorized kernel.
+
+Builds a synthetic backlog (default: 5000 pending tasks over 12 subjects) and
+times PriorityScorer.score_tasks both ways:
+
+  legacy     → the previous per-task calculate_priority_score loop over dicts
+               (kept below as the baseline)
+  vectorized → PriorityScorer.score_tasks over PendingTasks / SubjectStats
+               arrays, top k by argpartition
+
+Both runs seed NumPy's global generator identically, so the tie-break draws
+match and the two schedules must be the same tasks with the same scores; the
+script fails otherwise. No database is needed.
+
+    python scripts/benchmark_priority_scorer.py --tasks 5000 --subjects 12 --max-tasks 7
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+# Add parent directory to path to allow sibling imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from ml.priority_scorer import TASK_TYPE_WEIGHTS, PendingTasks, PriorityScorer, SubjectStats
+from scripts.bench_utils import summarize
+
+
+# --- Previous (one dict and one call per task) implementation, kept here as the baseline ---
+
+def legacy_priority_score(task: Dict, user_stats: Dict) -> float:
+    score = 0.0
+    days_until_due = task.get('days_until_due', 30)
+    if days_until_due <= 1:
+        urgency_score = 1.0
+    elif days_until_due <= 3:
+        urgency_score = 0.9
+    elif days_until_due <= 7:
+        urgency_score = 0.7
+    elif days_until_due <= 14:
+        urgency_score = 0.5
+    else:
+        urgency_score = 0.3
+    score += urgency_score * 0.4
+
+    task_type_weights = {
+        'exam': 1.0, 'assignment': 0.9, 'project': 0.85, 'practice': 0.6,
+        'reading': 0.5, 'review': 0.4, 'general': 0.3
+    }
+    score += task_type_weights.get(task.get('task_type', 'general'), 0.3) * 0.2
+
+    subject_id = task.get('subject_id')
+    if subject_id and subject_id in user_stats:
+        stats = user_stats[subject_id]
+        avg_difficulty = stats.get('avg_difficulty', 3)
+        if avg_difficulty >= 4:
+            performance_score = 0.9
+        elif avg_difficulty >= 3:
+            performance_score = 0.7
+        else:
+            performance_score = 0.5
+        study_days = stats.get('study_days', 0)
+        if study_days == 0:
+            performance_score = 1.0
+        elif study_days < 3:
+            performance_score = min(1.0, performance_score + 0.2)
+    else:
+        performance_score = 0.7
+    score += performance_score * 0.2
+
+    estimated_time = task.get('estimated_time', 60)
+    if estimated_time <= 30:
+        time_score = 0.8
+    elif estimated_time <= 60:
+        time_score = 0.6
+    elif estimated_time <= 120:
+        time_score = 0.4
+    else:
+        time_score = 0.3
+    score += time_score * 0.1
+
+    score += np.random.uniform(0, 0.3) * 0.1
+    return min(1.0, score)
+
+
+def legacy_score_tasks(scorer: PriorityScorer, pending_tasks: List[Dict], user_stats: Dict, max_tasks: int):
+    scored_tasks = []
+    for task in pending_tasks:
+        score = legacy_priority_score(task, user_stats)
+        reason = scorer.generate_recommendation_reason(task, score)
+        estimated_time = task.get('estimated_time', 60)
+        subject_id = task.get('subject_id')
+        if task.get('predicted_time'):
+            predicted_time = task['predicted_time']
+        elif subject_id and subject_id in user_stats:
+            avg_actual = user_stats[subject_id].get('avg_actual_duration', estimated_time)
+            predicted_time = int(0.7 * estimated_time + 0.3 * avg_actual)
+        else:
+            predicted_time = estimated_time
+        scored_tasks.append({
+            'task_id': task['task_id'],
+            'task_name': task['task_name'],
+            'subject_name': task['subject_name'],
+            'estimated_time': estimated_time,
+            'predicted_time': predicted_time,
+            'priority_score': round(score, 3),
+            'recommendation_reason': reason
+        })
+    scored_tasks.sort(key=lambda x: x['priority_score'], reverse=True)
+    return scored_tasks[:max_tasks]
+
+
+# --- Synthetic data, in both shapes ---
+
+def synthetic_backlog(tasks: int, subjects: int, seed: int):
+    rng = np.random.default_rng(seed)
+    task_types = np.array(list(TASK_TYPE_WEIGHTS) + ['lab'])
+    # The last subject has no stats, like one created after the stats were read
+    pending = PendingTasks(
+        task_id=np.arange(1, tasks + 1, dtype=np.int64),
+        subject_id=rng.integers(1, subjects + 1, size=tasks),
+        estimated_time=rng.integers(5, 240, size=tasks),
+        days_until_due=np.sort(rng.integers(0, 60, size=tasks)),
+        task_type=task_types[rng.integers(0, len(task_types), size=tasks)],
+        predicted_time=np.where(rng.random(tasks) < 0.3, rng.integers(5, 240, size=tasks), 0),
+        task_name=[f"Task {i}" for i in range(1, tasks + 1)],
+        subject_name=[f"Subject {i}" for i in range(1, tasks + 1)],
+    )
+    stats = SubjectStats(
+        subject_id=np.arange(1, subjects, dtype=np.int64),
+        avg_actual_duration=rng.uniform(20, 120, size=subjects - 1),
+        avg_difficulty=rng.choice([1.0, 2.5, 3.0, 3.5, 4.0, 4.5], size=subjects - 1),
+        study_days=rng.integers(0, 6, size=subjects - 1),
+    )
+    legacy_tasks = pending.records(range(len(pending)))
+    legacy_stats = {
+        int(subject_id): {
+            'avg_actual_duration': float(avg_actual),
+            'avg_difficulty': float(avg_difficulty),
+            'study_days': int(study_days),
+        }
+        for subject_id, avg_actual, avg_difficulty, study_days in zip(
+            stats.subject_id, stats.avg_actual_duration, stats.avg_difficulty, stats.study_days)
+    }
+    return pending, stats, legacy_tasks, legacy_stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=5000, help="Pending tasks in the backlog")
+    parser.add_argument("--subjects", type=int, default=12, help="Subjects the tasks are spread over")
+    parser.add_argument("--max-tasks", type=int, default=7, help="Schedule length (k)")
+    parser.add_argument("--runs", type=int, default=20, help="Timed runs per implementation")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    scorer = PriorityScorer(database_url="")
+    pending, stats, legacy_tasks, legacy_stats = synthetic_backlog(args.tasks, args.subjects, args.seed)
+
+    timings = {"legacy": [], "vectorized": []}
+    for run in range(args.runs):
+        np.random.seed(args.seed + run)
+        started = time.perf_counter()
+        legacy = legacy_score_tasks(scorer, legacy_tasks, legacy_stats, args.max_tasks)
+        timings["legacy"].append(time.perf_counter() - started)
+
+        np.random.seed(args.seed + run)
+        started = time.perf_counter()
+        vectorized = scorer.score_tasks(pending, stats, args.max_tasks)
+        timings["vectorized"].append(time.perf_counter() - started)
+
+        if vectorized != legacy:
+            print(f"❌ Schedules differ (run {run})")
+            for old, new in zip(legacy, vectorized):
+                print(f"   legacy     {old}\n   vectorized {new}")
+            sys.exit(1)
+
+    print(f"=== score_tasks, {args.tasks} tasks, {args.subjects} subjects, top {args.max_tasks} ===")
+    legacy_summary = summarize("legacy", timings["legacy"])
+    vectorized_summary = summarize("vectorized", timings["vectorized"])
+    print(f"\n✅ Same schedule in all {args.runs} runs; "
+          f"p50 speedup {legacy_summary['p50_ms'] / vectorized_summary['p50_ms']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Admission check: refused requests must not cost a database connection.
+
+Runs the ASGI app in-process with tight limits (admission.py) and checks that
+every 429 from a rate limiter and every 503 from a concurrency limiter, on
+the ML and auth routes, is answered before the request checks a connection
+out of the SQLAlchemy pool or runs a statement. Admitted requests are
+counted too, to show the counter works.
+
+Exits non-zero on the first failed check.
+
+    python scripts/check_admission.py
+"""
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path to allow sibling imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+# Must be set before the app is imported: a small burst that never refills
+os.environ["ML_RATE_PER_SECOND"] = "0.001"
+os.environ["ML_RATE_BURST"] = "2"
+os.environ["AUTH_RATE_PER_SECOND"] = "0.001"
+os.environ["AUTH_RATE_BURST"] = "4"
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+import admission
+import app as app_module
+from database import async_engine, pool_wait_stats
+
+failures = []
+statements = []
+
+
+@event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+def count_statement(conn, cursor, statement, parameters, context, executemany):
+    statements.append(statement)
+
+
+def expect(condition: bool, message: str):
+    print(f"{'✅' if condition else '❌'} {message}")
+    if not condition:
+        failures.append(message)
+
+
+def send(client: TestClient, method: str, path: str, **kwargs):
+    """Status, pool checkouts and statements of one request"""
+    statements.clear()
+    checkouts_before = pool_wait_stats.checkouts
+    status = client.request(method, path, **kwargs).status_code
+    return status, pool_wait_stats.checkouts - checkouts_before, len(statements)
+
+
+def expect_refused(client: TestClient, method: str, path: str, expected_status: int, **kwargs):
+    status, checkouts, executed = send(client, method, path, **kwargs)
+    expect(status == expected_status, f"{method} {path} → {status} (expected {expected_status})")
+    expect(checkouts == 0 and executed == 0,
+           f"{method} {path} {status}: {checkouts} pool checkout(s), {executed} statement(s)")
+
+
+def main():
+    username = f"admission_check_{int(time.time() * 1000)}"
+    credentials = {"username": username, "password": "pw"}
+    with TestClient(app_module.app, raise_server_exceptions=False) as client:
+        # The ML warm-up sweep uses the pool in the background; let it finish
+        while not app_module.app.state.ml_warm_up.done():
+            time.sleep(0.1)
+        client.post("/auth/register", json={**credentials, "email": f"{username}@example.com"})
+        token = client.post("/auth/login", json=credentials).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        print("--- ML routes ---")
+        status, checkouts, _ = send(client, "POST", "/ml/predict-time", headers=headers, json={"task_ids": []})
+        # No such tasks (404), but admitted: it queried
+        expect(status not in (429, 503) and checkouts > 0, f"admitted predict-time → {status}, {checkouts} pool checkout(s)")
+        client.get("/ml/schedule/generate", headers=headers)  # the last token in the bucket
+        expect_refused(client, "GET", "/ml/schedule/generate", 429, headers=headers)
+        expect_refused(client, "POST", "/ml/predict-time", 429, headers=headers, json={"task_ids": []})
+
+        # Every slot taken: the next caller (own, full bucket) gets 503
+        admission.ml_rate.rate = 0
+        admission.ml_concurrency.in_flight += admission.ml_concurrency.limit
+        try:
+            expect_refused(client, "GET", "/ml/schedule/generate", 503, headers=headers)
+            expect_refused(client, "POST", "/ml/predict-time", 503, headers=headers, json={"task_ids": []})
+        finally:
+            admission.ml_concurrency.in_flight -= admission.ml_concurrency.limit
+
+        print("\n--- Auth routes ---")
+        # register and login above took two tokens; two are left
+        for _ in range(2):
+            client.post("/auth/login", json=credentials)
+        expect_refused(client, "POST", "/auth/login", 429, json=credentials)
+        expect_refused(client, "POST", "/auth/register", 429,
+                       json={**credentials, "username": f"{username}_2", "email": f"{username}_2@example.com"})
+
+        admission.auth_rate.rate = 0
+        admission.auth_concurrency.in_flight += admission.auth_concurrency.limit
+        try:
+            expect_refused(client, "POST", "/auth/login", 503, json=credentials)
+        finally:
+            admission.auth_concurrency.in_flight -= admission.auth_concurrency.limit
+
+    if failures:
+        print(f"\n❌ {len(failures)} check(s) failed")
+        sys.exit(1)
+    print("\n✅ Refused requests never touch the database pool")
+
+
+if __name__ == "__main__":
+    main()
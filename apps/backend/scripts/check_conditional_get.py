@@ -0,0 +1,127 @@
+"""
+Header-level checks for conditional GETs (ETag / If-None-Match).
+
+Runs the whole ASGI stack in-process (middleware, auth, dependencies) for a
+throwaway user and checks, for /tasks/, /subjects/, /notifications/ and
+/sessions/:
+
+  - 200 responses carry a weak ETag, Cache-Control: private, no-cache and
+    Vary: Authorization
+  - a matching If-None-Match (weak or strong form, in a list, or *) gets an
+    empty 304 with the same ETag without touching the database (no statement,
+    no pool checkout)
+  - a stale or foreign ETag gets a full 200
+  - a write changes the ETag of the collections it touches and only those
+
+Exits non-zero on the first failed check.
+
+    python scripts/check_conditional_get.py
+"""
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path to allow sibling imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+import app as app_module
+from database import async_engine, pool_wait_stats
+
+COLLECTIONS = ["/tasks/", "/subjects/", "/notifications/", "/sessions/"]
+
+failures = []
+statements = []
+
+
+@event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+def count_statement(conn, cursor, statement, parameters, context, executemany):
+    statements.append(statement)
+
+
+def expect(condition: bool, message: str):
+    print(f"{'✅' if condition else '❌'} {message}")
+    if not condition:
+        failures.append(message)
+
+
+def register(client: TestClient, username: str):
+    client.post("/auth/register", json={"username": username, "email": f"{username}@example.com", "password": "pw"})
+    token = client.post("/auth/login", json={"username": username, "password": "pw"}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def etags(client: TestClient, headers):
+    return {path: client.get(path, headers=headers).headers.get("etag") for path in COLLECTIONS}
+
+
+def main():
+    suffix = int(time.time() * 1000)
+    with TestClient(app_module.app) as client:
+        # The ML warm-up ends with a background sweep that bumps "predictions";
+        # let it finish so it cannot change versions mid-check
+        while not app_module.app.state.ml_warm_up.done():
+            time.sleep(0.1)
+        headers = register(client, f"etag_check_{suffix}")
+        other_headers = register(client, f"etag_other_{suffix}")
+        subject_id = client.post("/subjects/", headers=headers, json={"name": "Chemistry", "date": "2026-01-01T00:00:00"}).json()["id"]
+        task_id = client.post(f"/tasks/{subject_id}", headers=headers,
+                              json={"title": "Moles", "estimated_time": 30, "deadline": "2030-01-01T00:00:00"}).json()["id"]
+
+        print("--- Headers and 304 ---")
+        for path in COLLECTIONS:
+            response = client.get(path, headers=headers)
+            etag = response.headers.get("etag", "")
+            expect(response.status_code == 200 and etag.startswith('W/"'), f"{path} 200 with weak ETag {etag}")
+            expect(response.headers.get("cache-control") == "private, no-cache", f"{path} Cache-Control: private, no-cache")
+            expect("Authorization" in response.headers.get("vary", ""), f"{path} Vary includes Authorization")
+
+            statements.clear()
+            checkouts_before = pool_wait_stats.checkouts
+            not_modified = client.get(path, headers={**headers, "If-None-Match": etag})
+            checkouts = pool_wait_stats.checkouts - checkouts_before
+            expect(not_modified.status_code == 304 and not_modified.content == b"", f"{path} If-None-Match → empty 304")
+            expect(not_modified.headers.get("etag") == etag, f"{path} 304 repeats the ETag")
+            expect(len(statements) == 0, f"{path} 304 ran {len(statements)} statement(s)")
+            expect(checkouts == 0, f"{path} 304 checked out {checkouts} pooled connection(s)")
+
+            for variant in (etag.removeprefix("W/"), f'"nope", {etag}', "*"):
+                status = client.get(path, headers={**headers, "If-None-Match": variant}).status_code
+                expect(status == 304, f"{path} If-None-Match: {variant} → {status}")
+
+            other_etag = client.get(path, headers=other_headers).headers.get("etag")
+            expect(other_etag != etag, f"{path} ETag differs per user")
+            status = client.get(path, headers={**headers, "If-None-Match": other_etag}).status_code
+            expect(status == 200, f"{path} another user's ETag → {status}")
+
+        print("\n--- Writes change only the ETags they touch ---")
+        writes = [
+            ("pomodoro log", lambda: client.post("/pomodoro/log", headers=headers, json={
+                "start_time": "2026-01-01T00:00:00", "end_time": "2026-01-01T00:25:00", "duration": 25}), set()),
+            ("subject create", lambda: client.post("/subjects/", headers=headers, json={
+                "name": "Biology", "date": "2026-01-01T00:00:00"}), set(COLLECTIONS)),
+            ("task status", lambda: client.patch(f"/tasks/{task_id}/status", headers=headers, json={
+                "status": "in_progress"}), {"/tasks/", "/notifications/", "/sessions/"}),
+            ("session complete", lambda: client.post(f"/sessions/{task_id}/complete", headers=headers, json={
+                "actual_duration": 40, "user_difficulty_rating": 2}), {"/tasks/", "/notifications/", "/sessions/"}),
+        ]
+        for name, write, changed_paths in writes:
+            before = etags(client, headers)
+            write()
+            after = etags(client, headers)
+            changed = {path for path in COLLECTIONS if before[path] != after[path]}
+            expect(changed == changed_paths, f"{name}: ETag changed for {sorted(changed) or 'nothing'}")
+            for path in changed:
+                status = client.get(path, headers={**headers, "If-None-Match": before[path]}).status_code
+                expect(status == 200, f"{name}: stale ETag on {path} → {status}")
+
+    if failures:
+        print(f"\n❌ {len(failures)} check(s) failed")
+        sys.exit(1)
+    print("\n✅ Conditional GET behaves as expected")
+
+
+if __name__ == "__main__":
+    main()
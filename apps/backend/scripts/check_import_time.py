@@ -0,0 +1,86 @@
+"""
+Import-time budget for the API entry point.
+
+Runs `python -X importtime -c "import app"` in fresh interpreters, reports the
+slowest modules and exits non-zero when the best run exceeds the budget or
+when a heavy ML dependency is imported eagerly (those belong to the
+background warm-up in routes/ml_endpoint.py). Meant to run in CI:
+
+    python scripts/check_import_time.py --budget-ms 1500
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).parent.parent
+
+# Must not be imported by `import app`
+DEFERRED_MODULES = ["tensorflow", "sklearn", "scipy", "pandas", "numpy"]
+
+LINE_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$")
+
+
+def measure(statement: str):
+    """Return {module: cumulative_us} and the top-level ordering for one cold import"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=BACKEND_DIR,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        print(result.stderr[-2000:])
+        raise SystemExit(f"'{statement}' failed with exit code {result.returncode}")
+
+    cumulative = {}
+    top_level_us = 0
+    for line in result.stderr.splitlines():
+        match = LINE_RE.match(line)
+        if not match:
+            continue
+        _, cumulative_us, indent, module = match.groups()
+        cumulative[module] = max(cumulative.get(module, 0), int(cumulative_us))
+        if len(indent) == 1:
+            top_level_us += int(cumulative_us)
+    return cumulative, top_level_us
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app")
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("IMPORT_TIME_BUDGET_MS", "1500")))
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    statement = f"import {args.module}"
+    runs = [measure(statement) for _ in range(args.runs)]
+    cumulative, best_us = min(runs, key=lambda run: run[1])
+    best_ms = best_us / 1000
+
+    print(f"=== {statement}: best of {args.runs} runs ===")
+    for module, us in sorted(cumulative.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"  {us / 1000:8.1f} ms  {module}")
+    print(f"\nTotal: {best_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+
+    failures = []
+    if best_ms > args.budget_ms:
+        failures.append(f"import time {best_ms:.1f} ms exceeds the {args.budget_ms:.0f} ms budget")
+
+    eager = [name for name in DEFERRED_MODULES if name in cumulative]
+    if eager:
+        failures.append(f"heavy modules imported eagerly: {', '.join(eager)}")
+
+    for failure in failures:
+        print(f"❌ {failure}")
+    if failures:
+        sys.exit(1)
+    print("✅ Import time within budget")
+
+
+if __name__ == "__main__":
+    main()
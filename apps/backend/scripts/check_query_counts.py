@@ -0,0 +1,114 @@
+"""
+N+1 check: an endpoint's query count must not grow with its result size.
+
+Runs the ASGI app in-process with the request-scoped query counter enabled
+(query_counter.py, X-Query-Count header) and the response cache disabled.
+For a throwaway user it reads every list / dashboard endpoint once with a
+single subject, task and session, then again after adding many more, and
+fails if any endpoint's statement count changed, or if a read errors (a
+relationship missing its eager loader raises instead of lazy loading).
+
+    python scripts/check_query_counts.py [--subjects 3] [--tasks 24] [--sessions 12]
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add parent directory to path to allow sibling imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+# Must be set before the app is imported
+os.environ["QUERY_COUNT_HEADER"] = "true"
+os.environ["RESPONSE_CACHE_SIZE"] = "0"
+os.environ["CONDITIONAL_GET"] = "false"
+
+from fastapi.testclient import TestClient
+
+import app as app_module
+
+
+def endpoints(subject_id: int):
+    return [
+        "/tasks/", f"/tasks/{subject_id}", "/tasks/rescheduled", "/subjects/", "/sessions/",
+        "/notifications/", "/history/summary", "/analytics/summary", "/analytics/recommendations",
+        f"/subjects/{subject_id}/summary",
+    ]
+
+
+def query_counts(client: TestClient, headers, subject_id: int):
+    counts = {}
+    for path in endpoints(subject_id):
+        response = client.get(path, headers=headers)
+        if response.status_code != 200:
+            raise SystemExit(f"❌ GET {path} → {response.status_code}: {response.text[:200]}")
+        body = response.json()
+        counts[path] = (int(response.headers["x-query-count"]), len(body) if isinstance(body, list) else "-")
+    return counts
+
+
+def post(client: TestClient, path: str, headers, body):
+    response = client.post(path, headers=headers, json=body)
+    if response.status_code >= 400:
+        raise SystemExit(f"❌ POST {path} → {response.status_code}: {response.text[:200]}")
+    return response.json()
+
+
+def add_data(client: TestClient, headers, subject_ids, tasks: int, sessions: int):
+    tomorrow = (datetime.utcnow() + timedelta(days=1)).replace(hour=12, minute=0, second=0, microsecond=0)
+    task_ids = []
+    for i in range(tasks):
+        deadline = tomorrow if i % 2 else tomorrow + timedelta(days=7)
+        task = post(client, f"/tasks/{subject_ids[i % len(subject_ids)]}", headers, {
+            "title": f"Task {i}", "estimated_time": 30 + i, "deadline": deadline.isoformat()})
+        task_ids.append(task["id"])
+    for i, task_id in enumerate(task_ids[:sessions]):
+        post(client, f"/sessions/{task_id}/complete", headers,
+             {"actual_duration": 25 + i, "user_difficulty_rating": 1 + i % 5})
+        if i % 3 == 0:
+            post(client, f"/tasks/{task_id}/reschedule", headers, {"delay_days": 2})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--subjects", type=int, default=3, help="Subjects to add for the large run")
+    parser.add_argument("--tasks", type=int, default=24, help="Tasks to add for the large run")
+    parser.add_argument("--sessions", type=int, default=12, help="Sessions to log for the large run")
+    args = parser.parse_args()
+
+    username = f"query_count_{int(time.time() * 1000)}"
+    with TestClient(app_module.app, raise_server_exceptions=False) as client:
+        client.post("/auth/register", json={"username": username, "email": f"{username}@example.com", "password": "pw"})
+        token = client.post("/auth/login", json={"username": username, "password": "pw"}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        subject_id = post(client, "/subjects/", headers, {"name": "Physics", "date": "2026-01-01T00:00:00"})["id"]
+        add_data(client, headers, [subject_id], tasks=1, sessions=1)
+        small = query_counts(client, headers, subject_id)
+
+        subject_ids = [subject_id] + [
+            post(client, "/subjects/", headers, {"name": f"Subject {i}", "date": "2026-01-01T00:00:00"})["id"]
+            for i in range(args.subjects - 1)
+        ]
+        add_data(client, headers, subject_ids, tasks=args.tasks, sessions=args.sessions)
+        large = query_counts(client, headers, subject_id)
+
+    failures = []
+    print(f"{'endpoint':<36} {'queries':>12} {'items':>12}")
+    for path, (queries, items) in small.items():
+        large_queries, large_items = large[path]
+        grew = large_queries != queries
+        if grew:
+            failures.append(path)
+        print(f"{'❌' if grew else '✅'} {path:<34} {queries:>5} → {large_queries:<5} {items:>5} → {large_items:<5}")
+
+    if failures:
+        print(f"\n❌ Query count depends on result size: {', '.join(failures)}")
+        sys.exit(1)
+    print("\n✅ Query counts are independent of result size")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Staleness check for the per-user response cache (response_cache.py).
+
+Registers a throwaway user against the configured database and drives every
+write path through the API in-process. Around each write it checks that:
+
+  1. repeated reads of the cached dashboard endpoints are served from the
+     cache, without checking a connection out of the pool
+  2. the first read after the write equals a freshly computed response (cache
+     cleared), i.e. no stale data is served.
+
+Exits non-zero on the first stale response.
+
+    python scripts/check_response_cache.py
+"""
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path to allow sibling imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from fastapi.testclient import TestClient
+
+import app as app_module
+from database import pool_wait_stats
+from response_cache import response_cache
+
+failures = []
+
+
+def read_dashboards(client: TestClient, headers, subject_id: int):
+    paths = ["/analytics/summary", "/analytics/recommendations", "/history/summary", f"/subjects/{subject_id}/summary"]
+    return {path: client.get(path, headers=headers).json() for path in paths}
+
+
+def check(step: str, client: TestClient, headers, subject_id: int):
+    hits_before = response_cache.cache.hits
+    cached = read_dashboards(client, headers, subject_id)
+    checkouts_before = pool_wait_stats.checkouts
+    read_dashboards(client, headers, subject_id)
+    hits = response_cache.cache.hits - hits_before
+    checkouts = pool_wait_stats.checkouts - checkouts_before
+
+    response_cache.clear()
+    fresh = read_dashboards(client, headers, subject_id)
+
+    stale = [path for path in cached if cached[path] != fresh[path]]
+    if stale or checkouts:
+        failures.append(step)
+    print(f"{'❌' if stale or checkouts else '✅'} {step:<32} cache hits on re-read: {hits}/4, pool checkouts: {checkouts}"
+          + (f"  STALE: {', '.join(stale)}" if stale else ""))
+    return cached
+
+
+def main():
+    username = f"cache_check_{int(time.time() * 1000)}"
+    with TestClient(app_module.app) as client:
+        # The ML warm-up ends with a background sweep that bumps "predictions";
+        # let it finish so it cannot change versions mid-check
+        while not app_module.app.state.ml_warm_up.done():
+            time.sleep(0.1)
+        client.post("/auth/register", json={"username": username, "email": f"{username}@example.com", "password": "pw"})
+        token = client.post("/auth/login", json={"username": username, "password": "pw"}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        subject_id = client.post("/subjects/", headers=headers, json={"name": "Physics", "date": "2026-01-01T00:00:00"}).json()["id"]
+        before = check("subject create", client, headers, subject_id)
+
+        task_id = client.post(f"/tasks/{subject_id}", headers=headers,
+                              json={"title": "Kinematics", "estimated_time": 30, "deadline": "2030-01-01T00:00:00"}).json()["id"]
+        after = check("task create", client, headers, subject_id)
+        if before[f"/subjects/{subject_id}/summary"] == after[f"/subjects/{subject_id}/summary"]:
+            failures.append("task create did not change the subject summary")
+
+        client.patch(f"/tasks/{task_id}/status", headers=headers, json={"status": "in_progress"})
+        check("task status", client, headers, subject_id)
+
+        client.post(f"/sessions/{task_id}/complete", headers=headers,
+                    json={"actual_duration": 75, "user_difficulty_rating": 4})
+        after = check("session complete", client, headers, subject_id)
+        if after["/history/summary"]["stats"]["total_sessions"] != 1:
+            failures.append("session complete not reflected in /history/summary")
+
+        client.post(f"/tasks/{task_id}/reschedule", headers=headers, json={"delay_days": 2})
+        check("task reschedule", client, headers, subject_id)
+
+        client.post("/pomodoro/log", headers=headers, json={
+            "start_time": f"{time.strftime('%Y-%m-%d', time.gmtime())}T00:00:00",
+            "end_time": f"{time.strftime('%Y-%m-%d', time.gmtime())}T00:25:00",
+            "duration": 25,
+        })
+        after = check("pomodoro log", client, headers, subject_id)
+        if after["/analytics/summary"]["performance"]["focus_sessions"] != 1:
+            failures.append("pomodoro log not reflected in /analytics/summary")
+
+        print("\nCache stats:", client.get("/health/cache").json())
+
+    if failures:
+        print(f"\n❌ Stale data or pool checkouts on cache hits after: {', '.join(failures)}")
+        sys.exit(1)
+    print("\n✅ No stale responses after any write")
+
+
+if __name__ == "__main__":
+    main()
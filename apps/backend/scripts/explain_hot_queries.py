@@ -0,0 +1,174 @@
+"""
+EXPLAIN check for the per-user hot queries.
+
+Runs EXPLAIN (FORMAT JSON) for each query the API runs on every dashboard /
+scheduler load and fails when the plan does not use the index added for it in
+Alembic revisions 7b2e4c9d1a38 / 5e8f0b3a7c21 (`alembic upgrade head` first). Small dev
+databases make a sequential scan the cheapest plan for everything (and every
+(user_id, ...) index an equally cheap bitmap scan), so by default the check
+runs with enable_seqscan and enable_bitmapscan off: it proves the index *can*
+serve the query. Against production-sized data pass --planner-default to check
+what the planner actually picks.
+
+    python scripts/explain_hot_queries.py --user-id 1
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Add parent directory to path to allow sibling imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+from database import engine
+
+# (name, SQL mirroring the endpoint's query, index that must appear in the plan)
+HOT_QUERIES = [
+    (
+        "PriorityScorer.get_pending_tasks",
+        """
+        SELECT t.id, t.title, s.name, t.estimated_time, t.deadline, p.predicted_time
+        FROM tasks t
+        JOIN subjects s ON t.subject_id = s.id
+        LEFT JOIN task_predictions p ON p.task_id = t.id
+        WHERE t.user_id = :user_id
+          AND t.status = 'pending'
+          AND (t.deadline IS NULL OR t.deadline >= CURRENT_DATE)
+        ORDER BY t.deadline ASC NULLS LAST
+        """,
+        "ix_tasks_user_pending_deadline",
+    ),
+    (
+        "notifications (due tomorrow)",
+        """
+        SELECT t.id, t.title, t.deadline
+        FROM tasks t
+        WHERE t.user_id = :user_id
+          AND t.status = 'pending'
+          AND t.deadline >= CURRENT_DATE + 1
+          AND t.deadline < CURRENT_DATE + 2
+        """,
+        "ix_tasks_user_pending_deadline",
+    ),
+    (
+        "analytics.summary (tasks pending)",
+        "SELECT count(*) FROM tasks WHERE user_id = :user_id AND status = 'pending'",
+        "ix_tasks_user_pending_deadline",
+    ),
+    (
+        "analytics.summary (weekly streak)",
+        """
+        SELECT CAST(completed_at AS DATE) AS study_day, sum(actual_duration)
+        FROM study_sessions
+        WHERE user_id = :user_id AND completed_at >= CURRENT_DATE - 6
+        GROUP BY study_day
+        """,
+        "ix_study_sessions_user_completed_at_id",
+    ),
+    (
+        "analytics.summary (focus time today)",
+        """
+        SELECT sum(duration) FROM pomodoro_sessions
+        WHERE user_id = :user_id AND start_time >= CURRENT_DATE AND start_time < CURRENT_DATE + 1
+        """,
+        "ix_pomodoro_sessions_user_start_time",
+    ),
+    (
+        "history.summary (timeline)",
+        """
+        SELECT * FROM study_sessions
+        WHERE user_id = :user_id AND completed_at >= now() - interval '7 days'
+        ORDER BY completed_at ASC
+        """,
+        "ix_study_sessions_user_completed_at_id",
+    ),
+    (
+        "history.summary (recent sessions)",
+        "SELECT * FROM study_sessions WHERE user_id = :user_id ORDER BY completed_at DESC LIMIT 5",
+        "ix_study_sessions_user_completed_at_id",
+    ),
+    (
+        "pomodoro.recent-count",
+        """
+        SELECT count(id) FROM pomodoro_sessions
+        WHERE user_id = :user_id AND end_time >= now() - interval '1 hour'
+        """,
+        "ix_pomodoro_sessions_user_end_time",
+    ),
+    (
+        "tasks (keyset page)",
+        """
+        SELECT * FROM tasks
+        WHERE user_id = :user_id AND (created_at, id) > (now() - interval '30 days', 0)
+        ORDER BY created_at, id
+        LIMIT 201
+        """,
+        "ix_tasks_user_created_at_id",
+    ),
+    (
+        "tasks by subject (keyset page)",
+        """
+        SELECT * FROM tasks
+        WHERE subject_id = 1 AND (created_at, id) > (now() - interval '30 days', 0)
+        ORDER BY created_at, id
+        LIMIT 201
+        """,
+        "ix_tasks_subject_created_at_id",
+    ),
+    (
+        "sessions (keyset page)",
+        """
+        SELECT * FROM study_sessions
+        WHERE user_id = :user_id AND (completed_at, id) < (now(), 2147483647)
+        ORDER BY completed_at DESC, id DESC
+        LIMIT 101
+        """,
+        "ix_study_sessions_user_completed_at_id",
+    ),
+    (
+        "subjects (list)",
+        "SELECT * FROM subjects WHERE user_id = :user_id",
+        "ix_subjects_user_id",
+    ),
+]
+
+
+def index_names(plan: dict):
+    """Every index referenced anywhere in a JSON plan tree"""
+    if "Index Name" in plan:
+        yield plan["Index Name"]
+    for child in plan.get("Plans", []):
+        yield from index_names(child)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--user-id", type=int, default=1)
+    parser.add_argument("--planner-default", action="store_true",
+                        help="Keep the planner settings as they are (use against realistic data volumes)")
+    args = parser.parse_args()
+
+    failures = []
+    with engine.connect() as conn:
+        with conn.begin():
+            if not args.planner_default:
+                conn.execute(text("SET LOCAL enable_seqscan = off"))
+                conn.execute(text("SET LOCAL enable_bitmapscan = off"))
+            for name, sql, expected in HOT_QUERIES:
+                raw = conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"), {"user_id": args.user_id}).scalar()
+                plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+                used = sorted(set(index_names(plan)))
+                ok = expected in used
+                print(f"{'✅' if ok else '❌'} {name:<40} expects {expected:<38} uses {', '.join(used) or 'no index'}")
+                if not ok:
+                    failures.append(name)
+
+    if failures:
+        print(f"\n{len(failures)} hot quer{'y' if len(failures) == 1 else 'ies'} not using their index")
+        sys.exit(1)
+    print(f"\nAll {len(HOT_QUERIES)} hot queries use their indexes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Load test: login throughput, and latency of other endpoints during a login storm.
+
+Measures GET / and GET /subjects/ twice, first on an idle server and then
+while client threads log in back to back. Reports completed logins per
+second, fast 503 rejections from the bounded password hashing queue, and the
+probes' p99 loaded / idle ratio. Run it against a server hashing in-process
+and against one using the process pool to compare. All clients share one
+address, so switch off the per-client login rate limit (admission.py) or it
+answers most of the storm with 429 before any hashing:
+
+    AUTH_RATE_PER_SECOND=0 PASSWORD_HASH_WORKERS=0 ./run.sh  # in another shell
+    python scripts/load_test_login_storm.py --username user1 --password password123
+    AUTH_RATE_PER_SECOND=0 PASSWORD_HASH_WORKERS=2 ./run.sh
+    python scripts/load_test_login_storm.py --username user1 --password password123
+"""
+import argparse
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+# Add parent directory to path to allow sibling imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from scripts.bench_utils import login, request, summarize
+
+PROBE_PATHS = ["/", "/subjects/"]
+
+
+def probe(base_url: str, token: str, duration: float, interval: float):
+    latencies = {path: [] for path in PROBE_PATHS}
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        for path in PROBE_PATHS:
+            status, seconds, _ = request("GET", f"{base_url}{path}", token)
+            if status == 200:
+                latencies[path].append(seconds)
+        time.sleep(interval)
+    return latencies
+
+
+def login_worker(base_url: str, credentials: dict, stop: threading.Event, statuses: Counter, latencies: list):
+    while not stop.is_set():
+        status, seconds, _ = request("POST", f"{base_url}/auth/login", body=credentials)
+        statuses[status] += 1
+        if status == 200:
+            latencies.append(seconds)
+        elif status == 503:
+            time.sleep(0.05)  # a real client would honour Retry-After; keep the pressure on
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--duration", type=float, default=15, help="seconds per phase")
+    parser.add_argument("--login-clients", type=int, default=32, help="concurrent login clients in the storm")
+    parser.add_argument("--interval", type=float, default=0.02, help="pause between probe requests")
+    args = parser.parse_args()
+
+    token = login(args.base_url, args.username, args.password)
+
+    print(f"=== Phase 1: idle ({args.duration:.0f}s) ===")
+    idle = probe(args.base_url, token, args.duration, args.interval)
+    idle_summary = {path: summarize(path, values) for path, values in idle.items()}
+
+    print(f"\n=== Phase 2: {args.login_clients} login clients ({args.duration:.0f}s) ===")
+    stop, statuses, login_latencies = threading.Event(), Counter(), []
+    credentials = {"username": args.username, "password": args.password}
+    workers = [
+        threading.Thread(target=login_worker, args=(args.base_url, credentials, stop, statuses, login_latencies),
+                         daemon=True)
+        for _ in range(args.login_clients)
+    ]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    loaded = probe(args.base_url, token, args.duration, args.interval)
+    stop.set()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+    loaded_summary = {path: summarize(path, values) for path, values in loaded.items()}
+    summarize("POST /auth/login (200s)", login_latencies, elapsed)
+    print(f"Login statuses: {dict(sorted(statuses.items()))}")
+
+    print("\n=== p99 ratio (loaded / idle) ===")
+    for path in PROBE_PATHS:
+        idle_p99 = idle_summary[path]["p99_ms"] or 1e-9
+        print(f"{path:<32} {loaded_summary[path]['p99_ms'] / idle_p99:6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
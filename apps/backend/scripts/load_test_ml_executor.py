@@ -0,0 +1,94 @@
+"""
+Load test: latency of unrelated endpoints while ML work is running.
+
+Measures GET / and GET /tasks/rescheduled twice, first on an idle server and
+then while worker threads keep /ml/predict-time and /ml/schedule/generate
+busy. With ML work on the dedicated executor the p99 of the unrelated
+endpoints should stay flat between the two phases.
+
+All ML clients share one user, so with the default admission limits
+(admission.py) most of their calls are answered 429/503. Disable them to load
+the executor itself, keep them to see the spike turned away:
+
+    ML_RATE_PER_SECOND=0 ML_MAX_CONCURRENT=0 ./run.sh  # in another shell
+    python scripts/load_test_ml_executor.py --username user1 --password password123
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+# Add parent directory to path to allow sibling imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from scripts.bench_utils import login, request, summarize
+
+PROBE_PATHS = ["/", "/tasks/rescheduled"]
+
+
+def probe(base_url: str, token: str, duration: float, interval: float):
+    latencies = {path: [] for path in PROBE_PATHS}
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        for path in PROBE_PATHS:
+            status, seconds, _ = request("GET", f"{base_url}{path}", token)
+            if status == 200:
+                latencies[path].append(seconds)
+        time.sleep(interval)
+    return latencies
+
+
+def ml_worker(base_url: str, token: str, task_ids, stop: threading.Event, statuses: Counter):
+    while not stop.is_set():
+        status, _, _ = request("POST", f"{base_url}/ml/predict-time", token, body={"task_ids": task_ids})
+        statuses[status] += 1
+        status, _, _ = request("GET", f"{base_url}/ml/schedule/generate?max_tasks=20", token)
+        statuses[status] += 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--duration", type=float, default=15, help="seconds per phase")
+    parser.add_argument("--ml-clients", type=int, default=16, help="concurrent ML clients in the loaded phase")
+    parser.add_argument("--interval", type=float, default=0.02, help="pause between probe requests")
+    args = parser.parse_args()
+
+    token = login(args.base_url, args.username, args.password)
+    _, _, payload = request("GET", f"{args.base_url}/tasks/", token)
+    task_ids = [task["id"] for task in json.loads(payload)][:50]
+    if not task_ids:
+        raise SystemExit("The user has no tasks to predict")
+
+    print(f"=== Phase 1: idle ({args.duration:.0f}s) ===")
+    idle = probe(args.base_url, token, args.duration, args.interval)
+    idle_summary = {path: summarize(path, values) for path, values in idle.items()}
+
+    print(f"\n=== Phase 2: {args.ml_clients} ML clients ({args.duration:.0f}s) ===")
+    stop, statuses = threading.Event(), Counter()
+    workers = [
+        threading.Thread(target=ml_worker, args=(args.base_url, token, task_ids, stop, statuses), daemon=True)
+        for _ in range(args.ml_clients)
+    ]
+    for worker in workers:
+        worker.start()
+    loaded = probe(args.base_url, token, args.duration, args.interval)
+    stop.set()
+    for worker in workers:
+        worker.join()
+    loaded_summary = {path: summarize(path, values) for path, values in loaded.items()}
+    print(f"ML request statuses: {dict(sorted(statuses.items()))}")
+
+    print("\n=== p99 ratio (loaded / idle) ===")
+    for path in PROBE_PATHS:
+        idle_p99 = idle_summary[path]["p99_ms"] or 1e-9
+        print(f"{path:<32} {loaded_summary[path]['p99_ms'] / idle_p99:6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,26 @@
 # backend/security.py
-from passlib.context import CryptContext
 from jose import JWTError,jwt
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from dotenv import load_dotenv
+from typing import Any, Dict, Optional, Tuple
+import hashlib
 import os
+import secrets
+import time
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import event, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 import models
 import database
+from caching import LRUCache
+from password_hasher import pwd_context
 # passlib → For password hashing and verification.
 # jose → For encoding/decoding JWT tokens.
 # datetime → To set expiry times on tokens.
 # FastAPI security → Handles OAuth2 & dependency injection.
-# SQLAlchemy Session → Used to query users from DB.
+# SQLAlchemy AsyncSession → Used to query users from DB.
 # models & database → Your app’s user model & DB connection
 load_dotenv()
 
@@ -21,12 +28,13 @@ load_dotenv()
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "30"))
 
-# Setup for password hashing
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
-# pwd_context uses bcrypt to hash passwords.
+# Setup for password hashing (the context lives in password_hasher.py)
+# pwd_context uses pbkdf2_sha256 to hash passwords.
 # verify_password → compares plain password with hashed password in DB.
 # get_password_hash → hashes a new password before saving to DB.
+# Both block for a while; request handlers await the password_hasher pool instead.
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
 
@@ -44,31 +52,184 @@ def create_access_token(data: dict):
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
+# --- Refresh tokens ---
+# Opaque random strings, not JWTs: POST /auth/refresh trades one for a new
+# access token (and a new refresh token) without a password check. Only the
+# SHA-256 is stored; the token carries 256 random bits, so unlike passwords it
+# needs no slow hash. Each token works once (rotation), and presenting an
+# already-used one revokes all of that user's refresh tokens, since one of
+# the two copies must have been stolen.
+def _refresh_token_hash(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+def issue_refresh_token(db: AsyncSession, user_id: int) -> str:
+    """Add a new refresh token for the user to the session; the caller commits"""
+    token = secrets.token_urlsafe(32)
+    db.add(models.RefreshToken(
+        user_id=user_id,
+        token_hash=_refresh_token_hash(token),
+        expires_at=datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
+    ))
+    return token
+
+async def revoke_user_refresh_tokens(db: AsyncSession, user_id: int):
+    await db.execute(
+        update(models.RefreshToken)
+        .where(models.RefreshToken.user_id == user_id, models.RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=datetime.utcnow())
+    )
+
+async def use_refresh_token(db: AsyncSession, token: str) -> Optional[Tuple[int, str]]:
+    """
+    Revoke `token` if it is live and return its (user_id, username), in one
+    UPDATE on the token_hash index. None if it is unknown, expired or used.
+    The caller commits.
+    """
+    now = datetime.utcnow()
+    token_hash = _refresh_token_hash(token)
+    owner = (await db.execute(
+        update(models.RefreshToken)
+        .where(
+            models.RefreshToken.token_hash == token_hash,
+            models.RefreshToken.revoked_at.is_(None),
+            models.RefreshToken.expires_at > now,
+            models.RefreshToken.user_id == models.User.id,
+        )
+        .values(revoked_at=now)
+        .returning(models.User.id, models.User.username)
+        .execution_options(synchronize_session=False)
+    )).first()
+    if owner is not None:
+        return owner.id, owner.username
+
+    # Reuse of a rotated token: treat the whole login as compromised
+    reused_by = (await db.execute(
+        select(models.RefreshToken.user_id).where(
+            models.RefreshToken.token_hash == token_hash,
+            models.RefreshToken.revoked_at.is_not(None),
+        )
+    )).scalar()
+    if reused_by is not None:
+        await revoke_user_refresh_tokens(db, reused_by)
+    return None
+
+async def revoke_refresh_token(db: AsyncSession, token: str):
+    """Log out one session; the caller commits"""
+    await db.execute(
+        update(models.RefreshToken)
+        .where(
+            models.RefreshToken.token_hash == _refresh_token_hash(token),
+            models.RefreshToken.revoked_at.is_(None),
+        )
+        .values(revoked_at=datetime.utcnow())
+    )
+
 # Tells FastAPI:
 # Clients will send tokens in the Authorization: Bearer <token> header.
 # The login route (/auth/login) will issue these tokens.
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
+# --- Auth fast path ---
+# Verified tokens → claims. Decoding (HMAC check + JSON parsing) runs once per
+# token; repeat requests with the same token are a dict lookup. Keyed on the
+# whole token, not just its signature, so a token with a swapped payload can
+# never hit another token's entry. Entries expire with the token's own exp.
+# Only valid tokens are cached.
+token_cache = LRUCache(maxsize=int(os.getenv("TOKEN_CACHE_SIZE", "4096")))
+
+def decode_token(token: str) -> Dict[str, Any]:
+    """Verified claims of `token`; raises JWTError if it is invalid or expired"""
+    claims = token_cache.get(token)
+    if claims is not None and claims["exp"] > time.time():
+        return claims
+
+    claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    expires_in = claims.get("exp", 0) - time.time()
+    if expires_in > 0:
+        token_cache.set(token, claims, ttl=expires_in)
+    return claims
+
+# Who is calling, straight from the verified claims: routes that only need
+# the id never touch the users table. The token is trusted until it expires
+# (ACCESS_TOKEN_EXPIRE_MINUTES), like any stateless JWT.
+@dataclass(frozen=True)
+class Principal:
+    id: int
+    username: str
+
+# Routes that need more than the id (email, timezone) read the user through
+# a small TTL cache. Any ORM update/delete of a user drops its entry (bulk
+# UPDATE statements bypass mapper events and rely on the TTL).
+@dataclass(frozen=True)
+class UserRecord:
+    id: int
+    username: str
+    email: str
+    timezone: Optional[str]
+    created_at: Optional[datetime]
+
+user_cache = LRUCache(
+    maxsize=int(os.getenv("USER_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("USER_CACHE_TTL_SECONDS", "60")),
+)
+
+def invalidate_user(user_id: int):
+    user_cache.invalidate(user_id)
+
+@event.listens_for(models.User, "after_update")
+@event.listens_for(models.User, "after_delete")
+def _user_changed(mapper, connection, target):
+    invalidate_user(target.id)
+
 # Reads the token from request header.
-# Decodes JWT using your SECRET_KEY.
-# Extracts the sub field (subject = usually username).
-# Queries the DB for that user.
-# If no user or invalid token → raises 401 Unauthorized.
-# If valid → returns the User object.
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(database.get_db)):
+# Verifies it (through the token cache) using your SECRET_KEY.
+# Builds the Principal from the sub and user_id claims, no DB query.
+# If the token is invalid or expired → raises 401 Unauthorized.
+# No session dependency either: a pooled connection is only checked out for
+# legacy tokens, so cached 304s and refused (429/503) requests never wait on the pool.
+async def get_current_user(token: str = Depends(oauth2_scheme)) -> Principal:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_token(token)
         username: str = payload.get("sub")
         if username is None:
             raise credentials_exception
     except JWTError:
         raise credentials_exception
-    
-    user = db.query(models.User).filter(models.User.username == username).first()
+
+    user_id = payload.get("user_id")
+    if user_id is None:
+        # Tokens issued before the user_id claim existed
+        async with database.AsyncSessionLocal() as db:
+            user_id = (await db.execute(
+                select(models.User.id).where(models.User.username == username)
+            )).scalar()
+        if user_id is None:
+            raise credentials_exception
+    return Principal(id=user_id, username=username)
+
+# The full user row, for routes that need more than the id
+async def get_current_user_record(
+    principal: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(database.get_async_db)
+) -> UserRecord:
+    record = user_cache.get(principal.id)
+    if record is not None:
+        return record
+
+    user = (await db.execute(
+        select(models.User).where(models.User.id == principal.id)
+    )).scalars().first()
     if user is None:
-        raise credentials_exception
-    return user
\ No newline at end of file
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    record = UserRecord(id=user.id, username=user.username, email=user.email,
+                        timezone=user.timezone, created_at=user.created_at)
+    user_cache.set(user.id, record)
+    return record
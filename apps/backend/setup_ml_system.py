@@ -14,6 +14,7 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 import models
 from database import engine
+from rollups import backfill_daily_stats
 
 # Hashing utility - pbkdf2_sha256 is pure Python and reliable
 pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
@@ -116,6 +117,10 @@ class SyntheticDataGenerator:
             subject_ids_map = await self.generate_subjects(conn, user_ids)
             tasks = await self.generate_tasks(conn, subject_ids_map)
             await self.generate_study_sessions(conn, tasks)
+
+            # The sessions were copied in directly, so build their rollups here
+            with engine.begin() as sync_conn:
+                backfill_daily_stats(sync_conn)
             
             print("\n✅ Synthetic data generation complete!")
         except Exception as e:
@@ -6,7 +6,7 @@ const apiClient = axios.create({
 });
 
 // List of endpoints that don't require authentication
-const publicEndpoints = ['/auth/register', '/auth/login'];
+const publicEndpoints = ['/auth/register', '/auth/login', '/auth/refresh', '/auth/logout'];
 
 // The interceptor automatically adds the token to requests that need it
 apiClient.interceptors.request.use(
@@ -51,13 +51,42 @@ apiClient.interceptors.request.use(
   }
 );
 
+// Access tokens expire after 30 minutes. On a 401 the refresh token is
+// traded for a new pair and the request retried once. A refresh token works
+// only once, so concurrent 401s share a single refresh.
+let refreshing: Promise<string | null> | null = null;
+
+async function refreshAccessToken(): Promise<string | null> {
+  const { refreshToken, setToken, setRefreshToken } = useAuthStore.getState();
+  if (!refreshToken) return null;
+  try {
+    const response = await apiClient.post('/auth/refresh', { refresh_token: refreshToken });
+    setToken(response.data.access_token);
+    setRefreshToken(response.data.refresh_token);
+    return response.data.access_token;
+  } catch {
+    return null;
+  }
+}
+
 // Response interceptor for debugging
 apiClient.interceptors.response.use(
   (response) => {
     console.log('✅ Response success:', response.config.url, response.status);
     return response;
   },
-  (error) => {
+  async (error) => {
+    const original = error.config;
+    const isPublicEndpoint = publicEndpoints.some(endpoint => original?.url?.includes(endpoint));
+    if (error.response?.status === 401 && original && !original._retried && !isPublicEndpoint) {
+      original._retried = true;
+      refreshing = refreshing ?? refreshAccessToken().finally(() => { refreshing = null; });
+      if (await refreshing) {
+        console.log('🔄 Access token refreshed, retrying', original.url);
+        return apiClient(original);
+      }
+    }
+
     console.error('❌ Response error:', {
       url: error.config?.url,
       status: error.response?.status,
@@ -74,4 +103,17 @@ apiClient.interceptors.response.use(
   }
 );
 
+// List endpoints return one page at a time; the cursor for the next page comes
+// back in the X-Next-Cursor header. Follows it until every item is loaded.
+export async function getAllPages<T>(url: string, params: Record<string, unknown> = {}): Promise<T[]> {
+  const items: T[] = [];
+  let cursor: string | undefined;
+  do {
+    const response = await apiClient.get<T[]>(url, { params: { ...params, cursor } });
+    items.push(...response.data);
+    cursor = response.headers['x-next-cursor'];
+  } while (cursor);
+  return items;
+}
+
 export default apiClient;
\ No newline at end of file
@@ -12,6 +12,7 @@ export default function LoginPage() {
   const [error, setError] = useState('');
   const router = useRouter();
   const setToken = useAuthStore((state) => state.setToken);
+  const setRefreshToken = useAuthStore((state) => state.setRefreshToken);
 
   const handleSubmit = async (e: React.FormEvent) => {
     e.preventDefault();
@@ -23,6 +24,7 @@ export default function LoginPage() {
       });
       const token = response.data.access_token;
       setToken(token); // Save the token to our Zustand store
+      setRefreshToken(response.data.refresh_token); // Used to renew the token without the password
       router.push('/'); // Redirect to the dashboard/homepage
     } catch (err) {
       setError('Invalid username or password.');
@@ -65,7 +65,12 @@ export default function DashboardPage() {
     setSubjects((prevSubjects) => [...prevSubjects, newSubject])
   }
 
-  const handleLogout = () => {
+  const handleLogout = async () => {
+    const { refreshToken } = useAuthStore.getState()
+    if (refreshToken) {
+      // Revoke the refresh token on the server; log out locally either way
+      await apiClient.post("/auth/logout", { refresh_token: refreshToken }).catch(() => {})
+    }
     logout()
     router.push("/login")
   }
@@ -4,7 +4,7 @@ import { useEffect, useState ,useCallback} from "react"
 import { useParams } from "next/navigation"
 import Link from "next/link"
 import ProtectedRoute from "../../../components/ProtectedRoute"
-import apiClient from "../../../api/axios"
+import apiClient, { getAllPages } from "../../../api/axios"
 import AddTaskForm from "../../../components/Addtaskform"
 import CompletionModal from "../../../components/CompletionModel"
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card"
@@ -65,13 +65,11 @@ export default function SubjectDetailPage() {
         const subjectRes = await apiClient.get(`/subjects/${subjectIdNum}`)
         setSubject(subjectRes.data)
 
-        const tasksRes = await apiClient.get(`/tasks/${subjectIdNum}`)
+        const initialTasks = await getAllPages<Task>(`/tasks/${subjectIdNum}`)
         const summaryRes = await apiClient.get(`/subjects/${subjectIdNum}/summary`)
-        setTasks(tasksRes.data)
+        setTasks(initialTasks)
         setSummary(summaryRes.data);
 
-        const initialTasks: Task[] = tasksRes.data
-
         if (initialTasks.length > 0) {
           setIsPredicting(true)
           const taskIds = initialTasks.map((task) => task.id)
@@ -120,17 +118,17 @@ const fetchAllData = useCallback(async () => {
         if (isNaN(subjectIdNum)) throw new Error("Invalid subject ID");
 
         // Saara data ek saath parallel mein fetch karein
-        const [subjectRes, tasksRes, summaryRes] = await Promise.all([
+        const [subjectRes, subjectTasks, summaryRes] = await Promise.all([
             apiClient.get(`/subjects/${subjectIdNum}`),
-            apiClient.get(`/tasks/${subjectIdNum}`),
+            getAllPages<Task>(`/tasks/${subjectIdNum}`),
             apiClient.get(`/subjects/${subjectIdNum}/summary`)
         ]);
 
         setSubject(subjectRes.data);
-        setTasks(tasksRes.data);
+        setTasks(subjectTasks);
         setSummary(summaryRes.data);
 
-        const pendingTasks = (tasksRes.data as Task[]).filter(task => task.status === 'pending');
+        const pendingTasks = subjectTasks.filter(task => task.status === 'pending');
         if (pendingTasks.length > 0) {
             setIsPredicting(true);
             const taskIds = pendingTasks.map((task) => task.id);
@@ -4,7 +4,7 @@ import { useEffect, useState } from "react"
 import Link from "next/link"
 import ProtectedRoute from "../../../components/ProtectedRoute"
 import CompletionModal from '../../../components/CompletionModel';
-import apiClient from "../../../api/axios"
+import apiClient, { getAllPages } from "../../../api/axios"
 import { DragDropContext, Droppable, Draggable, type DropResult } from "@hello-pangea/dnd"
 import { ArrowLeft, Clock, GripVertical, Plus } from "lucide-react"
 import { Button } from "@/components/ui/button"
@@ -66,8 +66,7 @@ export default function KanbanBoardPage() {
     const fetchTasks = async () => {
       setIsLoading(true)
       try {
-        const response = await apiClient.get("/tasks/")
-        const tasks: Task[] = response.data
+        const tasks = await getAllPages<Task>("/tasks/")
 
         // Distribute the fetched tasks into the correct columns
         const newColumns = { ...initialColumns }
@@ -18,9 +18,11 @@ interface DecodedToken {
 
 interface AuthState {
   token: string | null;
+  refreshToken: string | null; // Opaque, single-use; see api/axios.ts
   user: User | null;
   isLoggedIn: boolean;
   setToken: (token: string | null) => void;
+  setRefreshToken: (refreshToken: string | null) => void;
   activesessions: number; // Added this line
   logout: () => void;
   clearToken: () => void; // Added this method
@@ -31,10 +33,12 @@ const useAuthStore = create<AuthState>()(
   persist(
     (set, get) => ({
       token: null,
+      refreshToken: null,
       user: null,
       isLoggedIn: false,
       activesessions: 0, // Added this line
       setactivesessions: (count: number) => set({ activesessions: count }), // Added this line  
+      setRefreshToken: (refreshToken) => set({ refreshToken }),
       setToken: (token) => {
         if (token) {
           try {
@@ -71,11 +75,11 @@ const useAuthStore = create<AuthState>()(
       },
       logout: () => {
         console.log('🚪 Logging out user');
-        set({ token: null, user: null, isLoggedIn: false });
+        set({ token: null, refreshToken: null, user: null, isLoggedIn: false });
       },
       clearToken: () => {
         console.log('🧹 Clearing token');
-        set({ token: null, user: null, isLoggedIn: false });
+        set({ token: null, refreshToken: null, user: null, isLoggedIn: false });
       },
     }),
     {